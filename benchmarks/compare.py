@@ -0,0 +1,94 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python benchmarks/compare.py baseline.json results.json [--threshold 10]
+
+Exits with status 1 if any metric is worse than the baseline by more than
+the threshold (percent).
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+# Compared metrics: (label, path in a scenario, higher is better)
+METRICS = [
+    ('posts/s', ('posts_per_sec',), True),
+    ('p50 latency ms', ('latency_ms', 'p50'), False),
+    ('p99 latency ms', ('latency_ms', 'p99'), False),
+    ('write seconds', ('sqlite', 'write_seconds'), False),
+    ('ms per buffered row', ('sqlite', 'ms_per_buffered_row'), False),
+    ('commits', ('sqlite', 'commits'), False),
+]
+
+
+def _lookup(scenario: dict, path: Tuple[str, ...]) -> float:
+    """Value at a key path of a scenario."""
+    value = scenario
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _by_scale(results: dict) -> Dict[int, dict]:
+    """Scenarios keyed by subreddit count."""
+    return {scenario['subreddits']: scenario for scenario in results['scenarios']}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """
+    Print a comparison table of the scales both result files contain.
+
+    Args:
+        baseline: Baseline results
+        current: Results to check
+        threshold: Allowed worsening in percent
+
+    Returns:
+        True if no metric regressed beyond the threshold
+    """
+    print(f"Baseline {baseline.get('commit')} vs {current.get('commit')} (threshold {threshold:.0f}%)")
+    ok = True
+    baseline_scales = _by_scale(baseline)
+    for scale, scenario in sorted(_by_scale(current).items()):
+        reference = baseline_scales.get(scale)
+        if reference is None:
+            print(f"\n{scale} subreddits: not in baseline")
+            continue
+
+        print(f"\n{scale} subreddits:")
+        for label, path, higher_is_better in METRICS:
+            before = _lookup(reference, path)
+            after = _lookup(scenario, path)
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = ''
+            if worse > threshold:
+                flag = '  REGRESSION'
+                ok = False
+            print(f"  {label:<22} {before:>12.3f} → {after:>12.3f}  {change:+7.1f}%{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline', help='Baseline results (from run.py)')
+    parser.add_argument('current', help='Results to check')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed worsening in percent (default: 10)')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    if baseline.get('options') != current.get('options'):
+        print("Warning: results were measured with different options", file=sys.stderr)
+
+    sys.exit(0 if compare(baseline, current, args.threshold) else 1)
+
+
+if __name__ == '__main__':
+    main()
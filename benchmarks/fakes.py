@@ -0,0 +1,360 @@
+"""
+Local stand-ins for the services reddit-deliver talks to.
+
+FakeRedditClient and FakeTranslator replace the PRAW client and the
+translation service in-process; WebhookStandIn is a local HTTP server that
+accepts Discord/Slack webhook posts. Each injects configurable latency,
+rate-limit rejections (429) and errors from a seeded random generator, so
+a scenario sees the same sequence of faults on every run.
+"""
+
+import random
+import re
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Tuple
+
+from services.base_translator import BaseTranslator
+from services.translation_cache import TranslationCache
+from lib.rate_limiter import RateLimiter
+
+# Post IDs are recovered from the permalink in webhook payloads
+POST_ID_PATTERN = re.compile(r'/comments/([a-z0-9]+)/')
+
+# Titles in languages that need translation, and in the target language
+FOREIGN_TITLES = [
+    "Wie kann ich die Leistung meiner Datenbank verbessern, wenn viele Beiträge gleichzeitig ankommen",
+    "Comment améliorer les performances de la base de données quand beaucoup de messages arrivent",
+    "Cómo mejorar el rendimiento de la base de datos cuando llegan muchas publicaciones a la vez",
+    "Come migliorare le prestazioni del database quando arrivano molti messaggi nello stesso momento",
+]
+NATIVE_TITLES = [
+    "How can I improve the performance of my database when many posts arrive at the same time",
+    "What is the best way to monitor a busy community without missing any of the new posts",
+]
+
+
+class FaultInjector:
+    """
+    Seeded source of latency, rate-limit and error decisions.
+
+    Thread-safe, so concurrent workers draw from one deterministic sequence.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        Initialize fault injector.
+
+        Args:
+            latency: Base latency per call (seconds)
+            jitter: Extra latency drawn uniformly from [0, jitter] (seconds)
+            rate_limit_rate: Fraction of calls rejected with a 429
+            error_rate: Fraction of calls failing with an error
+            seed: Random seed
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.lock = Lock()
+        self.counts = {'calls': 0, 'rate_limited': 0, 'errors': 0}
+
+    def draw(self) -> Tuple[float, Optional[str]]:
+        """
+        Decide the next call's latency and fault.
+
+        Returns:
+            Tuple of (latency in seconds, fault) where fault is None,
+            'rate_limited' or 'error'
+        """
+        with self.lock:
+            self.counts['calls'] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._random.random()
+            fault = None
+            if roll < self.rate_limit_rate:
+                fault = 'rate_limited'
+            elif roll < self.rate_limit_rate + self.error_rate:
+                fault = 'error'
+            if fault:
+                self.counts['errors' if fault == 'error' else fault] += 1
+            return delay, fault
+
+
+class FakeServiceError(Exception):
+    """Error raised by a fake service call."""
+
+
+class FakeRedditClient:
+    """
+    In-process replacement for RedditClient.
+
+    Every listing call returns ``posts_per_check`` new posts per subreddit,
+    created just before the call. Fetch times are recorded per post, so
+    end-to-end latency can be measured from the moment a post was fetched.
+    """
+
+    def __init__(self, faults: FaultInjector, posts_per_check: int = 3, native_share: float = 0.25, seed: int = 0):
+        """
+        Initialize fake Reddit client.
+
+        Args:
+            faults: Latency and fault source, one draw per listing request
+            posts_per_check: New posts returned per subreddit and call
+            native_share: Fraction of posts already in the target language
+            seed: Random seed for post contents
+        """
+        self.faults = faults
+        self.posts_per_check = posts_per_check
+        self.native_share = native_share
+        self.rate_limiter = RateLimiter(requests_per_minute=1_000_000, name='reddit')
+        self.fetched_at: Dict[str, float] = {}
+        self._random = random.Random(seed)
+        self._next_id = 0
+        self.lock = Lock()
+
+    def get_new_posts(
+        self,
+        subreddit_name: str,
+        limit: int = 25,
+        since: Optional[datetime] = None,
+        before: Optional[str] = None,
+        max_pages: int = 10
+    ) -> List[dict]:
+        """Return new posts of one subreddit (same contract as RedditClient.get_new_posts)."""
+        self._request()
+        return self._make_posts(subreddit_name, min(limit, self.posts_per_check))
+
+    def get_new_posts_batch(
+        self,
+        subreddit_names: List[str],
+        since: Optional[Dict[str, Optional[datetime]]] = None,
+        before: Optional[Dict[str, Optional[str]]] = None,
+        page_sizes: Optional[Dict[str, int]] = None,
+        batch_size: int = 25,
+        max_pages: int = 5
+    ) -> Dict[str, List[dict]]:
+        """
+        Return new posts of many subreddits (same contract as RedditClient.get_new_posts_batch).
+
+        Subreddits with a cutoff share one request per ``batch_size`` names,
+        the rest are fetched individually; failed requests omit their subreddits.
+        """
+        since = since or {}
+        page_sizes = page_sizes or {}
+        results: Dict[str, List[dict]] = {}
+
+        batched = [name for name in subreddit_names if since.get(name)]
+        individual = [name for name in subreddit_names if not since.get(name)]
+
+        for start in range(0, len(batched), batch_size):
+            chunk = batched[start:start + batch_size]
+            try:
+                self._request()
+            except FakeServiceError:
+                individual.extend(chunk)
+                continue
+            for name in chunk:
+                results[name] = self._make_posts(name, min(page_sizes.get(name, 25), self.posts_per_check))
+
+        for name in individual:
+            try:
+                results[name] = self.get_new_posts(name, limit=page_sizes.get(name, 25), since=since.get(name))
+            except FakeServiceError:
+                continue
+        return results
+
+    def test_connection(self) -> bool:
+        """Always reachable."""
+        return True
+
+    def _request(self):
+        """Simulate one listing request."""
+        delay, fault = self.faults.draw()
+        if delay:
+            time.sleep(delay)
+        if fault == 'rate_limited':
+            raise FakeServiceError("received 429 HTTP response")
+        if fault == 'error':
+            raise FakeServiceError("received 500 HTTP response")
+
+    def _make_posts(self, subreddit_name: str, count: int) -> List[dict]:
+        """Create ``count`` new posts, newest first."""
+        now = datetime.utcnow()
+        fetched = time.monotonic()
+        posts = []
+        with self.lock:
+            for _ in range(count):
+                self._next_id += 1
+                post_id = _base36(self._next_id)
+                native = self._random.random() < self.native_share
+                title = self._random.choice(NATIVE_TITLES if native else FOREIGN_TITLES)
+                self.fetched_at[post_id] = fetched
+                posts.append({
+                    'id': post_id,
+                    # Numbered so every title misses the translation cache
+                    'title': f"{title} ({self._next_id})",
+                    'content': '',
+                    'author': 'benchmark',
+                    'url': f"https://www.reddit.com/r/{subreddit_name}/comments/{post_id}/benchmark/",
+                    'created_utc': now
+                })
+        posts.reverse()
+        return posts
+
+
+class FakeTranslator(BaseTranslator):
+    """
+    In-process translation service.
+
+    Each text is one request to the fake service; 429s and errors are
+    raised as exceptions, like the service SDKs do.
+    """
+
+    service_name = 'fake'
+
+    def __init__(self, faults: FaultInjector, cache: Optional[TranslationCache] = None):
+        """
+        Initialize fake translator.
+
+        Args:
+            faults: Latency and fault source, one draw per request
+            cache: Optional translation cache
+        """
+        self.faults = faults
+        self.cache = cache
+
+    def _translate(self, text: str, target_lang: str, source_lang: Optional[str] = None) -> Tuple[str, str]:
+        with self._request(len(text)):
+            delay, fault = self.faults.draw()
+            if delay:
+                time.sleep(delay)
+            if fault == 'rate_limited':
+                raise FakeServiceError("429 Too Many Requests")
+            if fault == 'error':
+                raise FakeServiceError("503 Service Unavailable")
+        return f"[{target_lang}] {text}", source_lang or 'de'
+
+    def translate_post(
+        self,
+        title: str,
+        content: Optional[str],
+        target_lang: str,
+        source_lang: Optional[str] = None
+    ) -> Tuple[str, Optional[str], str]:
+        translated_title, source_lang = self.translate(title, target_lang, source_lang)
+        translated_content = None
+        if content and content.strip():
+            translated_content, _ = self.translate(content, target_lang, source_lang)
+        return translated_title, translated_content, source_lang
+
+    def check_supported_language(self, lang_code: str) -> bool:
+        return True
+
+
+class WebhookStandIn:
+    """
+    Local HTTP server standing in for Discord and Slack webhooks.
+
+    Accepts POSTs on any path. Rate-limited requests get a 429 with a
+    Retry-After header, failed ones a 500. The receive time of every
+    accepted post is recorded by post ID.
+    """
+
+    def __init__(self, faults: FaultInjector, retry_after: float = 0.1):
+        """
+        Initialize webhook stand-in (not yet listening for requests).
+
+        Args:
+            faults: Latency and fault source, one draw per request
+            retry_after: Retry-After value sent with 429 responses (seconds)
+        """
+        self.faults = faults
+        self.retry_after = retry_after
+        self.received_at: Dict[str, float] = {}
+        self.messages = 0
+        self.lock = Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                delay, fault = stand_in.faults.draw()
+                if delay:
+                    time.sleep(delay)
+
+                if fault == 'rate_limited':
+                    self._respond(429, {'Retry-After': str(stand_in.retry_after)}, b'{"message": "rate limited"}')
+                elif fault == 'error':
+                    self._respond(500, {}, b'{"message": "internal error"}')
+                else:
+                    stand_in._accept(body)
+                    self._respond(204, {}, b'')
+
+            def do_HEAD(self):
+                self._respond(200, {}, b'')
+
+            def _respond(self, status: int, headers: Dict[str, str], body: bytes):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[Thread] = None
+
+    def url(self, path: str) -> str:
+        """Webhook URL served at path."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{path.lstrip('/')}"
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = Thread(target=self._server.serve_forever, name="webhook-stand-in", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _accept(self, body: bytes):
+        """Record the receive time of every post in an accepted message."""
+        now = time.monotonic()
+        post_ids = POST_ID_PATTERN.findall(body.decode('utf-8', errors='replace'))
+        with self.lock:
+            self.messages += 1
+            for post_id in post_ids:
+                # A post is delivered once its last destination accepts it
+                self.received_at[post_id] = now
+
+
+def _base36(number: int) -> str:
+    """Encode a positive integer like a Reddit ID."""
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    encoded = ''
+    while number:
+        number, remainder = divmod(number, 36)
+        encoded = digits[remainder] + encoded
+    return encoded or '0'
@@ -0,0 +1,122 @@
+"""
+Run the benchmark matrix and write machine-readable results.
+
+Each scale (number of subreddits) runs in a fresh process via scenario.py;
+the combined results, together with the git commit and environment they
+were measured on, are written as one JSON document for compare.py.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --scales 10,100 --rate-limit-rate 0.05 --error-rate 0.01
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from scenario import build_parser
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SCALES = '10,100,1000'
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree being measured (None outside a git checkout)."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def run_scale(subreddits: int, scenario_args: List[str]) -> dict:
+    """
+    Run one scenario in a child process.
+
+    Args:
+        subreddits: Number of subreddits
+        scenario_args: Command line options passed through to scenario.py
+
+    Returns:
+        Scenario results
+    """
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        output = f.name
+    try:
+        subprocess.run(
+            [sys.executable, os.path.join(BENCHMARK_DIR, 'scenario.py'),
+             '--subreddits', str(subreddits), '--output', output, *scenario_args],
+            check=True
+        )
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        os.unlink(output)
+
+
+def main():
+    parser = build_parser()
+    parser.description = 'Benchmark Monitor.run_once at several scales'
+    parser.add_argument('--scales', default=DEFAULT_SCALES, help=f'Comma-separated subreddit counts (default: {DEFAULT_SCALES})')
+    parser.add_argument('--output', help='File the JSON results are written to (default: stdout)')
+    args = parser.parse_args()
+
+    # Everything except our own options is passed through to each scenario
+    scenario_args = sys.argv[1:]
+    for option in ('--scales', '--output'):
+        if option in scenario_args:
+            index = scenario_args.index(option)
+            del scenario_args[index:index + 2]
+    scenario_args = [arg for arg in scenario_args if not arg.startswith(('--scales=', '--output='))]
+
+    options = {key: value for key, value in vars(args).items() if key not in ('scales', 'output', 'verbose')}
+    results = {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'options': options,
+        'scenarios': []
+    }
+
+    for scale in [int(value) for value in args.scales.split(',') if value.strip()]:
+        print(f"Running {scale} subreddits...", file=sys.stderr)
+        scenario = run_scale(scale, scenario_args)
+        print(
+            f"  {scenario['posts_delivered']} posts in {scenario['seconds']:.1f}s "
+            f"({scenario['posts_per_sec']:.1f} posts/s), "
+            f"p50 {scenario['latency_ms']['p50']:.0f}ms, p99 {scenario['latency_ms']['p99']:.0f}ms, "
+            f"{scenario['sqlite']['ms_per_buffered_row']:.3f}ms per buffered row",
+            file=sys.stderr
+        )
+        results['scenarios'].append(scenario)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
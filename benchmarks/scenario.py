@@ -0,0 +1,233 @@
+"""
+Run one benchmark scenario and write its results as JSON.
+
+Creates a fresh database, registers the requested number of subreddits and
+webhooks, and runs Monitor.run_once against the local stand-ins. Each
+scenario runs in its own process (see run.py), so the database, metrics
+registry and thread pools start clean.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# The monitor refuses to start without credentials; the fakes never use them
+os.environ.setdefault('REDDIT_CLIENT_ID', 'benchmark')
+os.environ.setdefault('REDDIT_CLIENT_SECRET', 'benchmark')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Observations (need not be sorted)
+        fraction: Percentile as a fraction (e.g. 0.99)
+
+    Returns:
+        Percentile value, or 0.0 without observations
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(-(-fraction * len(ordered) // 1)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class WriteCost:
+    """Time spent in INSERT/UPDATE/DELETE statements and number of commits."""
+
+    WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+    def __init__(self, engine):
+        """
+        Attach statement listeners to an engine.
+
+        Args:
+            engine: SQLAlchemy engine
+        """
+        from sqlalchemy import event
+
+        self.statements = 0
+        self.seconds = 0.0
+        self.commits = 0
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before(conn, cursor, statement, parameters, context, executemany):
+            conn.info['benchmark_started'] = time.perf_counter()
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(self.WRITE_VERBS):
+                self.statements += 1
+                self.seconds += time.perf_counter() - conn.info.pop('benchmark_started')
+
+        @event.listens_for(engine, 'commit')
+        def commit(conn):
+            self.commits += 1
+
+
+def run_scenario(args: argparse.Namespace, db_path: str) -> dict:
+    """
+    Run the scenario described by the command line arguments.
+
+    Args:
+        args: Parsed arguments
+        db_path: Path of the (new) scenario database
+
+    Returns:
+        Results dictionary
+    """
+    os.environ['REDDIT_DELIVER_DB'] = db_path
+
+    from fakes import FakeRedditClient, FakeTranslator, FaultInjector, WebhookStandIn
+    from models import Subreddit, UserConfig, WebhookConfig
+    from services.monitor import Monitor
+    from storage.database import FLUSH_SECONDS, get_database, get_session
+
+    reddit_faults = FaultInjector(args.reddit_latency, args.jitter, args.rate_limit_rate, args.error_rate, args.seed)
+    translate_faults = FaultInjector(
+        args.translate_latency, args.jitter, args.rate_limit_rate, args.error_rate, args.seed + 1
+    )
+    webhook_faults = FaultInjector(
+        args.webhook_latency, args.jitter, args.rate_limit_rate, args.error_rate, args.seed + 2
+    )
+
+    stand_in = WebhookStandIn(webhook_faults, retry_after=args.retry_after)
+    stand_in.start()
+
+    session = get_session()
+    try:
+        session.add(UserConfig(language='en', translator_service='deepl'))
+        for i in range(args.subreddits):
+            name = f"bench{i:04d}"
+            session.add(Subreddit(name=name, url=f"https://reddit.com/r/{name}"))
+        for webhook_type in args.webhooks:
+            session.add(WebhookConfig(type=webhook_type, webhook_url=stand_in.url(webhook_type)))
+        session.commit()
+    finally:
+        session.close()
+
+    monitor = Monitor(
+        max_workers=args.workers,
+        fetch_batch_size=args.fetch_batch_size,
+        batch_deliveries=args.batch_deliveries,
+        batch_linger=args.batch_linger
+    )
+    # After Monitor, which sizes the connection pool (and so the engine)
+    write_cost = WriteCost(get_database().engine)
+    reddit = FakeRedditClient(reddit_faults, args.posts_per_check, seed=args.seed)
+    monitor.reddit_client = reddit
+    monitor._translator = FakeTranslator(translate_faults, cache=monitor.translation_cache)
+    monitor._translator_name = 'deepl'
+
+    cycles = []
+    start = time.perf_counter()
+    try:
+        for _ in range(args.cycles):
+            cycle_start = time.perf_counter()
+            stats = monitor.run_once(use_pipeline=args.pipeline)
+            cycles.append({
+                'seconds': round(time.perf_counter() - cycle_start, 4),
+                'posts': stats['total_posts'],
+                'errors': stats['errors']
+            })
+        elapsed = time.perf_counter() - start
+    finally:
+        monitor.webhook_sender.close()
+        stand_in.stop()
+
+    latencies = [
+        (received - reddit.fetched_at[post_id]) * 1000
+        for post_id, received in stand_in.received_at.items()
+        if post_id in reddit.fetched_at
+    ]
+    delivered = len(latencies)
+    writes = monitor.writes.stats()
+    flush_seconds = FLUSH_SECONDS.total()
+
+    return {
+        'subreddits': args.subreddits,
+        'cycles': cycles,
+        'seconds': round(elapsed, 4),
+        'posts_fetched': len(reddit.fetched_at),
+        'posts_delivered': delivered,
+        'webhook_messages': stand_in.messages,
+        'posts_per_sec': round(delivered / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p90': round(percentile(latencies, 0.90), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'max': round(max(latencies), 2) if latencies else 0.0
+        },
+        'sqlite': {
+            'write_statements': write_cost.statements,
+            'write_seconds': round(write_cost.seconds, 4),
+            'commits': write_cost.commits,
+            'buffer_flushes': writes['flushes'],
+            'buffer_rows': writes['rows_written'],
+            'buffer_flush_seconds': round(flush_seconds, 4),
+            'ms_per_buffered_row': round(flush_seconds * 1000 / writes['rows_written'], 4)
+            if writes['rows_written'] else 0.0,
+            'db_size_bytes': sum(
+                os.path.getsize(path) for path in (db_path, db_path + '-wal') if os.path.exists(path)
+            )
+        },
+        'faults': {
+            'reddit': reddit_faults.counts,
+            'translator': translate_faults.counts,
+            'webhook': webhook_faults.counts
+        }
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options shared by scenario.py and run.py."""
+    parser = argparse.ArgumentParser(description='Benchmark Monitor.run_once against local stand-ins')
+    parser.add_argument('--posts-per-check', type=int, default=3, help='New posts per subreddit and check (default: 3)')
+    parser.add_argument('--cycles', type=int, default=1, help='run_once calls per scenario (default: 1)')
+    parser.add_argument('--webhooks', default='discord', help='Comma-separated webhook types (default: discord)')
+    parser.add_argument('--reddit-latency', type=float, default=0.02, help='Seconds per Reddit listing request (default: 0.02)')
+    parser.add_argument('--translate-latency', type=float, default=0.01, help='Seconds per translation request (default: 0.01)')
+    parser.add_argument('--webhook-latency', type=float, default=0.005, help='Seconds per webhook request (default: 0.005)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency per call, up to this many seconds (default: 0)')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of calls answered with a 429 (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of calls failing with an error (default: 0)')
+    parser.add_argument('--retry-after', type=float, default=0.1, help='Retry-After seconds of webhook 429s (default: 0.1)')
+    parser.add_argument('--workers', type=int, default=1, help='Monitor workers (default: 1)')
+    parser.add_argument('--fetch-batch-size', type=int, default=25, help='Subreddits per combined listing (default: 25)')
+    parser.add_argument('--pipeline', action='store_true', help='Use the staged asyncio pipeline')
+    parser.add_argument('--batch-deliveries', action='store_true', help='Pack bursts of posts into one webhook message')
+    parser.add_argument('--batch-linger', type=float, default=0.2, help='Seconds a burst waits to be batched (default: 0.2)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed of the fault injectors (default: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Show application logs')
+    return parser
+
+
+def main():
+    parser = build_parser()
+    parser.add_argument('--subreddits', type=int, required=True, help='Number of subreddits')
+    parser.add_argument('--output', required=True, help='File the JSON results are written to')
+    args = parser.parse_args()
+    args.webhooks = [webhook.strip() for webhook in args.webhooks.split(',') if webhook.strip()]
+
+    from lib.logger import setup_logger
+    setup_logger(level=logging.INFO if args.verbose else logging.ERROR + 10)
+
+    with tempfile.TemporaryDirectory(prefix='reddit-deliver-bench-') as directory:
+        results = run_scenario(args, os.path.join(directory, 'bench.db'))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
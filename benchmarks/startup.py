@@ -0,0 +1,159 @@
+"""
+Measure CLI startup time.
+
+Each command runs repeatedly in a fresh interpreter against a scratch
+database; the median wall time is reported together with the slow-loading
+third-party modules the command imported (from ``python -X importtime``).
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --output startup.json --max-ms 400
+
+Exits with status 1 if a command's median exceeds --max-ms, or if a
+command that has no use for them imports PRAW, requests or a translator SDK.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from run import git_commit
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Commands measured, with the heavy modules they must not import
+COMMANDS = [
+    (['--help'], ['praw', 'requests', 'sqlalchemy']),
+    (['config', 'get', 'language'], ['praw', 'requests', 'deepl', 'google.genai']),
+    (['storage', 'stats'], ['praw', 'requests', 'deepl', 'google.genai']),
+    (['webhook', 'set', 'discord', 'https://discord.com/api/webhooks/1/startup'], ['praw', 'requests']),
+]
+
+# Modules reported when a command imports them
+HEAVY_MODULES = ('praw', 'prawcore', 'requests', 'urllib3', 'sqlalchemy', 'deepl', 'google.genai')
+
+
+def _environment(db_path: str) -> Dict[str, str]:
+    """Environment for the CLI processes."""
+    env = dict(os.environ)
+    env.update({
+        'REDDIT_DELIVER_DB': db_path,
+        'REDDIT_CLIENT_ID': env.get('REDDIT_CLIENT_ID', 'startup-benchmark'),
+        'REDDIT_CLIENT_SECRET': env.get('REDDIT_CLIENT_SECRET', 'startup-benchmark'),
+        'PYTHONPATH': SRC_DIR,
+    })
+    return env
+
+
+def _run(args: List[str], env: Dict[str, str], importtime: bool = False) -> subprocess.CompletedProcess:
+    """Run the CLI once."""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    return subprocess.run(
+        command + ['-m', 'cli.main', *args],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True
+    )
+
+
+def heavy_imports(args: List[str], env: Dict[str, str]) -> List[str]:
+    """
+    Heavy modules imported by a command.
+
+    Args:
+        args: CLI arguments
+        env: Process environment
+
+    Returns:
+        Sorted list of HEAVY_MODULES entries that were imported
+    """
+    result = _run(args, env, importtime=True)
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        module = line.rsplit('|', 1)[1].strip()
+        for heavy in HEAVY_MODULES:
+            if module == heavy or module.startswith(heavy + '.'):
+                imported.add(heavy)
+    return sorted(imported)
+
+
+def measure(args: List[str], env: Dict[str, str], runs: int) -> dict:
+    """
+    Time a command over several runs.
+
+    Args:
+        args: CLI arguments
+        env: Process environment
+        runs: Number of timed runs (after one warm-up run)
+
+    Returns:
+        Dictionary with median/min/max milliseconds and heavy imports
+    """
+    _run(args, env)  # Warm the OS file cache and the bytecode cache
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = _run(args, env)
+        times.append((time.perf_counter() - start) * 1000)
+        if result.returncode:
+            raise RuntimeError(f"{' '.join(args)} failed:\n{result.stdout}{result.stderr}")
+    return {
+        'command': ' '.join(args),
+        'median_ms': round(statistics.median(times), 1),
+        'min_ms': round(min(times), 1),
+        'max_ms': round(max(times), 1),
+        'heavy_imports': heavy_imports(args, env),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure CLI startup time')
+    parser.add_argument('--runs', type=int, default=10, help='Timed runs per command (default: 10)')
+    parser.add_argument('--max-ms', type=float, help='Fail if a median exceeds this many milliseconds')
+    parser.add_argument('--output', help='File the JSON results are written to (default: stdout)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = _environment(os.path.join(directory, 'startup.db'))
+        # Create the schema first, so the runs measure a warm start
+        _run(['config', 'init'], env)
+
+        results = {'commit': git_commit(), 'python': sys.version.split()[0], 'runs': args.runs, 'commands': []}
+        ok = True
+        for command, forbidden in COMMANDS:
+            measured = measure(command, env, args.runs)
+            unexpected = [module for module in measured['heavy_imports'] if module in forbidden]
+            flags = []
+            if unexpected:
+                flags.append(f"imports {', '.join(unexpected)}")
+            if args.max_ms is not None and measured['median_ms'] > args.max_ms:
+                flags.append(f"over {args.max_ms:.0f}ms")
+            ok = ok and not flags
+            print(
+                f"{measured['command']:<40} median {measured['median_ms']:7.1f}ms "
+                f"(min {measured['min_ms']:.1f}, max {measured['max_ms']:.1f})"
+                f"{'  FAIL: ' + '; '.join(flags) if flags else ''}",
+                file=sys.stderr
+            )
+            results['commands'].append(measured)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
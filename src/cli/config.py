@@ -64,6 +64,14 @@ def handle_config_set(args):
                 config.poll_interval_minutes = int(value)
             except ValueError:
                 print_error(f"Invalid poll_interval value: {value} (must be integer)", args.json, exit_code=2)
+        elif key in ('retention_days', 'retention_max_posts'):
+            try:
+                limit = int(value)
+            except ValueError:
+                limit = -1
+            if limit < 0:
+                print_error(f"Invalid {key} value: {value} (must be a non-negative integer, 0 = no limit)", args.json, exit_code=2)
+            setattr(config, key, limit)
         else:
             print_error(f"Unknown configuration key: {key}", args.json, exit_code=1)
 
@@ -89,7 +97,9 @@ def handle_config_get(args):
             data = {
                 'language': config.language,
                 'translator_service': config.translator_service,
-                'poll_interval': config.poll_interval_minutes
+                'poll_interval': config.poll_interval_minutes,
+                'retention_days': config.retention_days,
+                'retention_max_posts': config.retention_max_posts
             }
             if args.json:
                 import json
@@ -98,6 +108,8 @@ def handle_config_get(args):
                 print(f"language: {config.language}")
                 print(f"translator_service: {config.translator_service}")
                 print(f"poll_interval: {config.poll_interval_minutes}")
+                print(f"retention_days: {config.retention_days}")
+                print(f"retention_max_posts: {config.retention_max_posts}")
         elif key == 'language':
             if args.json:
                 import json
@@ -116,6 +128,12 @@ def handle_config_get(args):
                 print(json.dumps({'poll_interval': config.poll_interval_minutes}))
             else:
                 print(config.poll_interval_minutes)
+        elif key in ('retention_days', 'retention_max_posts'):
+            if args.json:
+                import json
+                print(json.dumps({key: getattr(config, key)}))
+            else:
+                print(getattr(config, key))
         else:
             print_error(f"Unknown configuration key: {key}", args.json, exit_code=1)
 
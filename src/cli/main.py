@@ -19,6 +19,8 @@ def main():
     parser.add_argument('--version', '-v', action='version', version='reddit-deliver 0.1.0')
     parser.add_argument('--json', action='store_true', help='Output in JSON format')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--log-format', choices=['text', 'json'], help='Log output format (default: REDDIT_DELIVER_LOG_FORMAT or text)')
+    parser.add_argument('--log-sample-debug', type=int, default=1, metavar='N', help='Keep one in N debug log records per call site (default: 1 = all)')
     parser.add_argument('--config', help='Path to config file (default: config/config.yaml)')
     parser.add_argument('--db', help='Path to database file (default: data/reddit-deliver.db)')
 
@@ -49,33 +51,57 @@ def main():
     webhook_set_parser.add_argument('type', choices=['discord', 'slack'], help='Webhook type')
     webhook_set_parser.add_argument('url', help='Webhook URL')
 
+    # Storage commands
+    storage_parser = subparsers.add_parser('storage', help='Inspect and compact the database')
+    storage_subparsers = storage_parser.add_subparsers(dest='storage_command')
+    storage_subparsers.add_parser('stats', help='Show database size, row counts and retention settings')
+    storage_compact_parser = storage_subparsers.add_parser('compact', help='Apply the retention policy now')
+    storage_compact_parser.add_argument('--days', type=int, help='Compact posts older than this many days (default: retention_days from config)')
+    storage_compact_parser.add_argument('--max-posts', type=int, help='Full posts kept per subreddit (default: retention_max_posts from config)')
+
     # Monitor commands
     monitor_parser = subparsers.add_parser('monitor', help='Control monitoring')
     monitor_subparsers = monitor_parser.add_subparsers(dest='monitor_command')
     monitor_start_parser = monitor_subparsers.add_parser('start', help='Start monitoring')
     monitor_start_parser.add_argument('--once', action='store_true', help='Run once and exit')
     monitor_start_parser.add_argument('--daemon', action='store_true', help='Run in daemon mode (continuous monitoring)')
-    monitor_start_parser.add_argument('--interval', type=int, default=300, help='Check interval in seconds (default: 300)')
+    monitor_start_parser.add_argument('--interval', type=int, help='Check interval in seconds (default: poll_interval from config)')
+    monitor_start_parser.add_argument('--adaptive', action='store_true', help='Schedule each subreddit by its observed post rate (daemon mode)')
+    monitor_start_parser.add_argument('--min-interval', type=int, default=60, help='Shortest per-subreddit interval in adaptive mode (default: 60)')
+    monitor_start_parser.add_argument('--max-interval', type=int, default=3600, help='Longest per-subreddit interval in adaptive mode (default: 3600)')
+    monitor_start_parser.add_argument('--workers', type=int, default=1, help='Number of subreddits checked concurrently (default: 1)')
+    monitor_start_parser.add_argument('--fetch-batch-size', type=int, default=25, help='Subreddits per combined Reddit listing request (default: 25, 1 disables batching)')
+    monitor_start_parser.add_argument('--pipeline', action='store_true', help='Use the staged asyncio pipeline (fetch → translate → deliver)')
+    monitor_start_parser.add_argument('--batch-deliveries', action='store_true', help='Pack bursts of posts for the same webhook into one message')
+    monitor_start_parser.add_argument('--batch-linger', type=float, default=2.0, help='Seconds a burst of posts waits to be batched (default: 2.0)')
+    monitor_start_parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics at http://<metrics-host>:<port>/metrics')
+    monitor_start_parser.add_argument('--metrics-host', default='127.0.0.1', help='Interface for the metrics endpoint (default: 127.0.0.1)')
+    monitor_start_parser.add_argument('--profile', metavar='DIR', help='Profile monitoring cycles and write pstats/collapsed-stack files to DIR')
+    monitor_start_parser.add_argument('--profile-mode', choices=['cprofile', 'sample'], default='cprofile', help='cprofile: trace the cycle thread and sample all threads; sample: sampling only, lower overhead (default: cprofile)')
+    monitor_start_parser.add_argument('--profile-rate', type=float, default=100.0, help='Stack samples per second (default: 100)')
+    monitor_start_parser.add_argument('--profile-every', type=int, default=1, help='Profile every Nth cycle (default: 1 = all)')
+    monitor_start_parser.add_argument('--profile-min-seconds', type=float, default=0.0, help='Only keep profiles of cycles at least this slow (default: 0)')
+    monitor_start_parser.add_argument('--profile-top', type=int, default=20, help='Hot functions shown per profiled cycle (default: 20)')
 
     args = parser.parse_args()
 
     # Setup logging
-    logger = setup_logger(verbose=args.verbose)
+    logger = setup_logger(
+        verbose=args.verbose,
+        log_format=args.log_format,
+        debug_sample_rate=args.log_sample_debug
+    )
 
     # Handle no command
     if not args.command:
         parser.print_help()
         sys.exit(0)
 
-    # Import command handlers
-    from cli.config import handle_config_init, handle_config_set, handle_config_get
-    from cli.subreddit import handle_subreddit_add
-    from cli.webhook import handle_webhook_set, handle_webhook_test
-    from cli.monitor_cmd import handle_monitor_start
-
-    # Route to appropriate handler
+    # Route to appropriate handler. Handlers are imported only for the
+    # command being run, so e.g. `config get` doesn't load PRAW or requests.
     try:
         if args.command == 'config':
+            from cli.config import handle_config_init, handle_config_set, handle_config_get
             if args.config_command == 'init':
                 handle_config_init(args)
             elif args.config_command == 'set':
@@ -87,11 +113,13 @@ def main():
 
         elif args.command == 'subreddit':
             if args.subreddit_command == 'add':
+                from cli.subreddit import handle_subreddit_add
                 handle_subreddit_add(args)
             else:
                 subreddit_parser.print_help()
 
         elif args.command == 'webhook':
+            from cli.webhook import handle_webhook_set, handle_webhook_test
             if args.webhook_command == 'set':
                 handle_webhook_set(args)
             elif args.webhook_command == 'test':
@@ -99,8 +127,18 @@ def main():
             else:
                 webhook_parser.print_help()
 
+        elif args.command == 'storage':
+            from cli.storage import handle_storage_stats, handle_storage_compact
+            if args.storage_command == 'stats':
+                handle_storage_stats(args)
+            elif args.storage_command == 'compact':
+                handle_storage_compact(args)
+            else:
+                storage_parser.print_help()
+
         elif args.command == 'monitor':
             if args.monitor_command == 'start':
+                from cli.monitor_cmd import handle_monitor_start
                 handle_monitor_start(args)
             else:
                 monitor_parser.print_help()
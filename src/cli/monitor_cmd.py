@@ -7,44 +7,94 @@ Handles monitor start operation in both single-run and daemon modes.
 from services.monitor import Monitor
 from cli import print_success, print_error, print_info
 from lib.logger import get_logger
+from lib.metrics import MetricsServer
+from lib.profiler import CycleProfiler
 
 logger = get_logger("cli.monitor")
 
 
 def handle_monitor_start(args):
     """Start monitoring."""
+    metrics_server = None
     try:
-        monitor = Monitor()
+        metrics_port = getattr(args, 'metrics_port', None)
+        if metrics_port is not None:
+            metrics_server = MetricsServer(metrics_port, getattr(args, 'metrics_host', '127.0.0.1'))
+            metrics_server.start()
+            host, port = metrics_server.address
+            print_info(f"Metrics: http://{host}:{port}/metrics")
+
+        profiler = None
+        profile_dir = getattr(args, 'profile', None)
+        if profile_dir:
+            profiler = CycleProfiler(
+                profile_dir,
+                mode=getattr(args, 'profile_mode', 'cprofile'),
+                rate=getattr(args, 'profile_rate', 100.0),
+                every=getattr(args, 'profile_every', 1),
+                min_seconds=getattr(args, 'profile_min_seconds', 0.0),
+                top=getattr(args, 'profile_top', 20)
+            )
+            print_info(f"Profiling cycles ({profiler.mode}) to {profile_dir}")
+
+        monitor = Monitor(
+            max_workers=getattr(args, 'workers', 1),
+            fetch_batch_size=getattr(args, 'fetch_batch_size', 25),
+            batch_deliveries=getattr(args, 'batch_deliveries', False),
+            batch_linger=getattr(args, 'batch_linger', 2.0),
+            profiler=profiler
+        )
+        use_pipeline = getattr(args, 'pipeline', False)
 
         if args.once:
             # Run single monitoring cycle
             print_info("Starting single monitoring cycle...")
-            stats = monitor.run_once()
+            stats = monitor.run_once(use_pipeline=use_pipeline)
 
             print_success("Monitoring cycle complete", args.json, data=stats)
             print_info(f"Subreddits checked: {stats['total_checked']}")
             print_info(f"New posts processed: {stats['total_posts']}")
             if stats['errors'] > 0:
                 print_info(f"Errors: {stats['errors']}")
+            if profiler is not None:
+                print_info(f"Profiles written: {profiler.stats()['profiles_written']} (in {profile_dir})")
 
         elif getattr(args, 'daemon', False):
             # Run in daemon mode (explicit flag)
-            interval = getattr(args, 'interval', 300)
-            print_info(f"Starting daemon mode (interval: {interval}s)...")
-            print_info("Press Ctrl+C to stop")
-
-            monitor.run_daemon(interval=interval)
+            _start_daemon(monitor, args, use_pipeline)
 
         else:
             # Default behavior: run in daemon mode
-            interval = getattr(args, 'interval', 300)
-            print_info(f"Starting daemon mode (interval: {interval}s)...")
-            print_info("Press Ctrl+C to stop")
-
-            monitor.run_daemon(interval=interval)
+            _start_daemon(monitor, args, use_pipeline)
 
     except KeyboardInterrupt:
         print_info("\nMonitoring stopped by user")
     except Exception as e:
         logger.error(f"Monitoring failed: {e}")
         print_error(f"Monitoring failed: {e}", args.json, exit_code=3)
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+
+
+def _start_daemon(monitor, args, use_pipeline: bool):
+    """Run the monitor in daemon mode with the CLI scheduling options."""
+    interval = getattr(args, 'interval', None)
+    adaptive = getattr(args, 'adaptive', False)
+
+    if adaptive:
+        print_info(
+            f"Starting daemon mode (adaptive: {args.min_interval}-{args.max_interval}s per subreddit)..."
+        )
+    else:
+        label = f"{interval}s" if interval else "from config"
+        print_info(f"Starting daemon mode (interval: {label})...")
+    print_info("Press Ctrl+C to stop")
+
+    monitor.run_daemon(
+        interval=interval,
+        use_pipeline=use_pipeline,
+        adaptive=adaptive,
+        min_interval=getattr(args, 'min_interval', 60),
+        max_interval=getattr(args, 'max_interval', 3600)
+    )
@@ -0,0 +1,53 @@
+"""
+Storage CLI commands.
+
+Handles database statistics and retention compaction.
+"""
+
+from services.config_cache import ConfigCache
+from services.retention import Compactor, storage_stats
+from cli import print_success, print_error, print_info
+from lib.logger import get_logger
+
+logger = get_logger("cli.storage")
+
+
+def _format_bytes(count: int) -> str:
+    """Format a byte count as MiB."""
+    return f"{count / 1024 / 1024:.1f} MiB"
+
+
+def handle_storage_stats(args):
+    """Show database size, row counts and retention settings."""
+    stats = storage_stats()
+    user = ConfigCache().current().user
+    stats['retention_days'] = user.retention_days if user else 0
+    stats['retention_max_posts'] = user.retention_max_posts if user else 0
+
+    print_success("Storage statistics", args.json, data=stats)
+    print_info(f"Database size: {_format_bytes(stats['size_bytes'])} ({_format_bytes(stats['free_bytes'])} free)")
+    print_info(f"Auto-vacuum: {stats['auto_vacuum']}")
+    print_info(f"Posts: {stats['posts']} (oldest: {stats['oldest_post'] or '-'})")
+    print_info(f"Translations: {stats['translations']}")
+    print_info(f"Compacted posts: {stats['seen_posts']}")
+    print_info(f"Outbox entries: {stats['outbox_entries']}")
+    print_info(f"Retention: {stats['retention_days'] or 'no'} day limit, "
+               f"{stats['retention_max_posts'] or 'no'} post limit per subreddit")
+
+
+def handle_storage_compact(args):
+    """Apply the retention policy now."""
+    days = getattr(args, 'days', None)
+    max_posts = getattr(args, 'max_posts', None)
+    if (days is not None and days < 0) or (max_posts is not None and max_posts < 0):
+        print_error("--days and --max-posts must be non-negative", args.json, exit_code=2)
+
+    compactor = Compactor(ConfigCache())
+    try:
+        result = compactor.run(retention_days=days, max_posts=max_posts)
+    except Exception as e:
+        logger.error(f"Compaction failed: {e}")
+        print_error(f"Compaction failed: {e}", args.json, exit_code=3)
+
+    print_success(f"Compacted {result['compacted']} posts", args.json, data=result)
+    print_info(f"Reclaimed: {_format_bytes(result['reclaimed_bytes'])}")
@@ -7,7 +7,6 @@ Handles webhook set, test, enable/disable operations.
 import re
 from models import WebhookConfig
 from storage.database import get_session
-from services.webhook_sender import WebhookSender
 from cli import print_success, print_error, print_info
 from lib.logger import get_logger
 
@@ -69,7 +68,8 @@ def handle_webhook_test(args):
 
         print_info(f"Testing {webhook_type} webhook...")
 
-        # Send test message
+        # Send test message (requests is only loaded when a test is sent)
+        from services.webhook_sender import WebhookSender
         sender = WebhookSender()
         success = sender.test_webhook(webhook.webhook_url, webhook_type)
 
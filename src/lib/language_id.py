@@ -0,0 +1,217 @@
+"""
+Offline language identification.
+
+Identifies the language of short texts without network calls: non-Latin
+scripts are recognised by Unicode block, Latin-script languages by a naive
+Bayes character trigram model built from the seed text in language_profiles.
+Returns None when unsure, so callers can fall back to remote detection.
+"""
+
+import math
+import re
+from collections import Counter
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from lib.language_profiles import SEED_TEXT
+
+# Unicode ranges for scripts that identify a language on their own
+_SCRIPT_RANGES = [
+    ('ko', [(0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F)]),  # Hangul
+    ('ja', [(0x3040, 0x309F), (0x30A0, 0x30FF)]),  # Hiragana, Katakana
+    ('zh', [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)]),  # CJK ideographs
+    ('ru', [(0x0400, 0x04FF)]),  # Cyrillic
+    ('ar', [(0x0600, 0x06FF), (0x0750, 0x077F)]),  # Arabic
+    ('he', [(0x0590, 0x05FF)]),  # Hebrew
+    ('el', [(0x0370, 0x03FF)]),  # Greek
+    ('th', [(0x0E00, 0x0E7F)]),  # Thai
+    ('hi', [(0x0900, 0x097F)]),  # Devanagari
+]
+
+# Letters that distinguish Ukrainian from Russian in Cyrillic text
+_UKRAINIAN_LETTERS = set('іїєґІЇЄҐ')
+
+_NON_LETTERS = re.compile(r"[^\w']+|[\d_]+")
+_URLS = re.compile(r'https?://\S+|www\.\S+|/?[ru]/\w+')
+
+# Minimum letters required before guessing a Latin-script language
+MIN_LETTERS = 12
+
+# Minimum average log-likelihood margin per trigram between the best and
+# second-best language for a confident Latin-script guess
+MIN_MARGIN = 0.2
+
+# Fraction of letters that must belong to a script to identify it
+SCRIPT_SHARE = 0.3
+
+
+class LanguageIdentifier:
+    """
+    Character trigram language identifier.
+
+    The trigram model is built lazily from the bundled seed text on first use.
+    """
+
+    def __init__(self, seed_text: Optional[Dict[str, str]] = None):
+        """
+        Initialize identifier.
+
+        Args:
+            seed_text: Language code -> sample text (default: bundled samples)
+        """
+        self._seed_text = seed_text or SEED_TEXT
+        self._log_probs: Optional[Dict[str, Dict[str, float]]] = None
+        self._floors: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def detect(self, text: str) -> Optional[str]:
+        """
+        Detect the language of a text.
+
+        Args:
+            text: Text to identify
+
+        Returns:
+            ISO 639-1 language code, or None if the language can't be
+            determined confidently
+        """
+        lang, _ = self.detect_with_confidence(text)
+        return lang
+
+    def detect_with_confidence(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Detect the language of a text and report the confidence.
+
+        Args:
+            text: Text to identify
+
+        Returns:
+            Tuple of (language code or None, confidence between 0 and 1)
+        """
+        if not text:
+            return None, 0.0
+
+        text = _URLS.sub(' ', text)
+        letters = [ch for ch in text if ch.isalpha()]
+        if not letters:
+            return None, 0.0
+
+        script_lang, share = self._detect_script(text, letters)
+        if script_lang:
+            return script_lang, share
+
+        latin = sum(1 for ch in letters if ch < 'ɐ')
+        if latin / len(letters) < 0.5 or latin < MIN_LETTERS:
+            return None, 0.0
+
+        return self._detect_latin(text)
+
+    def _detect_script(self, text: str, letters) -> Tuple[Optional[str], float]:
+        """Identify languages written in a distinctive script."""
+        counts = Counter()
+        for ch in letters:
+            code = ord(ch)
+            for lang, ranges in _SCRIPT_RANGES:
+                if any(low <= code <= high for low, high in ranges):
+                    counts[lang] += 1
+                    break
+
+        if not counts:
+            return None, 0.0
+
+        # Japanese mixes kana with kanji; any real amount of kana means Japanese
+        if counts['ja'] and counts['ja'] >= 0.1 * (counts['ja'] + counts['zh']):
+            counts['ja'] += counts.pop('zh', 0)
+
+        lang, count = counts.most_common(1)[0]
+        share = count / len(letters)
+        if share < SCRIPT_SHARE:
+            return None, 0.0
+
+        if lang == 'ru' and any(ch in _UKRAINIAN_LETTERS for ch in text):
+            lang = 'uk'
+        return lang, min(1.0, share)
+
+    def _detect_latin(self, text: str) -> Tuple[Optional[str], float]:
+        """Score Latin-script text against the trigram model."""
+        log_probs = self._model()
+        trigrams = _trigrams(text)
+        total = sum(trigrams.values())
+        if not total:
+            return None, 0.0
+
+        scores = []
+        for lang, table in log_probs.items():
+            floor = self._floors[lang]
+            score = sum(count * table.get(gram, floor) for gram, count in trigrams.items())
+            scores.append((score / total, lang))
+
+        scores.sort(reverse=True)
+        (best, lang), (second, _) = scores[0], scores[1]
+        margin = best - second
+        if margin < MIN_MARGIN:
+            return None, 0.0
+        return lang, min(1.0, margin)
+
+    def _model(self) -> Dict[str, Dict[str, float]]:
+        """Build (once) per-language trigram log-probabilities with add-one smoothing."""
+        if self._log_probs is None:
+            with self._lock:
+                if self._log_probs is None:
+                    counts = {lang: _trigrams(sample) for lang, sample in self._seed_text.items()}
+                    vocabulary = set()
+                    for grams in counts.values():
+                        vocabulary.update(grams)
+
+                    log_probs = {}
+                    for lang, grams in counts.items():
+                        denominator = sum(grams.values()) + len(vocabulary)
+                        log_probs[lang] = {
+                            gram: math.log((count + 1) / denominator) for gram, count in grams.items()
+                        }
+                        self._floors[lang] = math.log(1 / denominator)
+                    self._log_probs = log_probs
+        return self._log_probs
+
+
+def _trigrams(text: str) -> Counter:
+    """Count character trigrams of lowercased words, padded with spaces."""
+    grams = Counter()
+    for word in _NON_LETTERS.split(text.lower()):
+        word = word.strip("'")
+        if not word:
+            continue
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams[padded[i:i + 3]] += 1
+    return grams
+
+
+def same_language(lang_a: Optional[str], lang_b: Optional[str]) -> bool:
+    """
+    Check whether two language codes refer to the same language.
+
+    Compares primary subtags, so 'en' matches 'EN-US' and 'pt' matches 'pt-br'.
+    """
+    if not lang_a or not lang_b:
+        return False
+    return lang_a.split('-')[0].lower() == lang_b.split('-')[0].lower()
+
+
+_default_identifier: Optional[LanguageIdentifier] = None
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Detect the language of a text with the shared identifier.
+
+    Args:
+        text: Text to identify
+
+    Returns:
+        ISO 639-1 language code, or None if uncertain
+    """
+    global _default_identifier
+    if _default_identifier is None:
+        _default_identifier = LanguageIdentifier()
+    return _default_identifier.detect(text)
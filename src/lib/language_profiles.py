@@ -0,0 +1,111 @@
+"""
+Seed text for the offline language identifier.
+
+Each sample is ordinary prose in the style of forum posts. The identifier
+derives its character trigram model from these samples when first used, so
+the model ships with the package without a data file or extra dependency.
+"""
+
+SEED_TEXT = {
+    'en': (
+        "I have been working on this project for a few weeks now and I think it is finally "
+        "ready to share with everyone. The main idea was to make something that would help "
+        "people keep track of their daily tasks without having to open another app. What do "
+        "you think about the design? Any feedback would be really appreciated. I also wanted "
+        "to ask if anyone here has experience with this kind of setup, because the documentation "
+        "is not very clear and I could not find the answer anywhere. Thanks in advance for your "
+        "help, and let me know if there is something that should be changed before the next "
+        "release. Does anyone know why the new update broke everything? It was working fine "
+        "yesterday and now the whole thing crashes when I try to start it. This is the first "
+        "time I have seen something like that happen, and I would like to understand what went "
+        "wrong. They said that the company will announce more details later this week, which "
+        "should be interesting for anyone who follows the news about these products."
+    ),
+    'es': (
+        "He estado trabajando en este proyecto durante algunas semanas y creo que por fin está "
+        "listo para compartirlo con todos. La idea principal era hacer algo que ayudara a las "
+        "personas a organizar sus tareas diarias sin tener que abrir otra aplicación. ¿Qué "
+        "opinan del diseño? Cualquier comentario será muy apreciado. También quería preguntar "
+        "si alguien aquí tiene experiencia con este tipo de configuración, porque la "
+        "documentación no es muy clara y no pude encontrar la respuesta en ningún lado. Gracias "
+        "de antemano por su ayuda, y díganme si hay algo que debería cambiar antes de la "
+        "próxima versión. ¿Alguien sabe por qué la nueva actualización rompió todo? Ayer "
+        "funcionaba bien y ahora todo se cierra cuando intento iniciarlo. Es la primera vez que "
+        "veo que pasa algo así, y me gustaría entender qué salió mal. Dijeron que la empresa "
+        "anunciará más detalles esta semana, lo cual será interesante para quienes siguen las "
+        "noticias sobre estos productos."
+    ),
+    'fr': (
+        "Je travaille sur ce projet depuis quelques semaines et je pense qu'il est enfin prêt "
+        "à être partagé avec tout le monde. L'idée principale était de créer quelque chose qui "
+        "aiderait les gens à suivre leurs tâches quotidiennes sans devoir ouvrir une autre "
+        "application. Qu'est-ce que vous pensez du design ? Tous les commentaires sont les "
+        "bienvenus. Je voulais aussi demander si quelqu'un ici a de l'expérience avec ce genre "
+        "de configuration, parce que la documentation n'est pas très claire et je n'ai trouvé "
+        "la réponse nulle part. Merci d'avance pour votre aide, et dites-moi s'il y a quelque "
+        "chose à changer avant la prochaine version. Est-ce que quelqu'un sait pourquoi la "
+        "nouvelle mise à jour a tout cassé ? Hier ça marchait très bien et maintenant tout "
+        "plante quand j'essaie de le lancer. C'est la première fois que je vois une chose "
+        "pareille, et j'aimerais comprendre ce qui s'est passé. Ils ont dit que l'entreprise "
+        "annoncera plus de détails cette semaine, ce qui sera intéressant pour ceux qui suivent "
+        "les nouvelles sur ces produits."
+    ),
+    'de': (
+        "Ich arbeite seit ein paar Wochen an diesem Projekt und denke, dass es jetzt endlich "
+        "bereit ist, mit allen geteilt zu werden. Die Grundidee war, etwas zu bauen, das den "
+        "Leuten hilft, ihre täglichen Aufgaben im Blick zu behalten, ohne eine weitere App "
+        "öffnen zu müssen. Was haltet ihr von dem Design? Über jede Rückmeldung würde ich mich "
+        "sehr freuen. Außerdem wollte ich fragen, ob hier jemand Erfahrung mit so einer "
+        "Einrichtung hat, weil die Dokumentation nicht besonders klar ist und ich die Antwort "
+        "nirgendwo finden konnte. Vielen Dank im Voraus für eure Hilfe, und sagt mir Bescheid, "
+        "wenn vor der nächsten Version noch etwas geändert werden sollte. Weiß jemand, warum "
+        "das neue Update alles kaputt gemacht hat? Gestern hat es noch funktioniert und jetzt "
+        "stürzt das ganze Ding ab, wenn ich es starten will. Das ist das erste Mal, dass ich so "
+        "etwas sehe, und ich würde gerne verstehen, was schiefgelaufen ist. Sie haben gesagt, "
+        "dass die Firma diese Woche weitere Einzelheiten bekannt geben wird, was für alle "
+        "interessant sein dürfte, die die Nachrichten über diese Produkte verfolgen."
+    ),
+    'it': (
+        "Sto lavorando a questo progetto da qualche settimana e penso che finalmente sia pronto "
+        "per essere condiviso con tutti. L'idea principale era creare qualcosa che aiutasse le "
+        "persone a tenere traccia delle proprie attività quotidiane senza dover aprire un'altra "
+        "applicazione. Cosa ne pensate del design? Qualsiasi commento sarebbe molto "
+        "apprezzato. Volevo anche chiedere se qualcuno qui ha esperienza con questo tipo di "
+        "configurazione, perché la documentazione non è molto chiara e non sono riuscito a "
+        "trovare la risposta da nessuna parte. Grazie in anticipo per il vostro aiuto, e "
+        "fatemi sapere se c'è qualcosa da cambiare prima della prossima versione. Qualcuno sa "
+        "perché il nuovo aggiornamento ha rotto tutto? Ieri funzionava bene e adesso si blocca "
+        "tutto quando provo ad avviarlo. È la prima volta che vedo succedere una cosa del "
+        "genere, e vorrei capire che cosa è andato storto. Hanno detto che l'azienda "
+        "annuncerà altri dettagli questa settimana, il che sarà interessante per chi segue le "
+        "notizie su questi prodotti."
+    ),
+    'pt': (
+        "Estou trabalhando neste projeto há algumas semanas e acho que finalmente está pronto "
+        "para ser compartilhado com todos. A ideia principal era fazer algo que ajudasse as "
+        "pessoas a acompanhar suas tarefas diárias sem precisar abrir outro aplicativo. O que "
+        "vocês acham do design? Qualquer opinião será muito bem-vinda. Também queria perguntar "
+        "se alguém aqui tem experiência com esse tipo de configuração, porque a documentação "
+        "não é muito clara e eu não consegui encontrar a resposta em lugar nenhum. Obrigado "
+        "desde já pela ajuda, e me avisem se tem alguma coisa que deveria mudar antes da "
+        "próxima versão. Alguém sabe por que a nova atualização quebrou tudo? Ontem estava "
+        "funcionando bem e agora tudo trava quando eu tento iniciar. É a primeira vez que vejo "
+        "uma coisa assim acontecer, e gostaria de entender o que deu errado. Eles disseram que "
+        "a empresa vai anunciar mais detalhes nesta semana, o que deve ser interessante para "
+        "quem acompanha as notícias sobre esses produtos."
+    ),
+    'nl': (
+        "Ik werk nu een paar weken aan dit project en ik denk dat het eindelijk klaar is om met "
+        "iedereen te delen. Het belangrijkste idee was om iets te maken dat mensen helpt hun "
+        "dagelijkse taken bij te houden zonder nog een app te hoeven openen. Wat vinden jullie "
+        "van het ontwerp? Alle feedback wordt erg gewaardeerd. Ik wilde ook vragen of iemand "
+        "hier ervaring heeft met zo'n opstelling, want de documentatie is niet erg duidelijk en "
+        "ik kon het antwoord nergens vinden. Alvast bedankt voor jullie hulp, en laat het me "
+        "weten als er iets veranderd moet worden voor de volgende versie. Weet iemand waarom "
+        "de nieuwe update alles kapot heeft gemaakt? Gisteren werkte het nog prima en nu "
+        "crasht het hele ding als ik het probeer te starten. Dit is de eerste keer dat ik zoiets "
+        "zie gebeuren, en ik zou graag begrijpen wat er mis is gegaan. Ze zeiden dat het bedrijf "
+        "deze week meer details zal bekendmaken, wat interessant is voor iedereen die het "
+        "nieuws over deze producten volgt."
+    ),
+}
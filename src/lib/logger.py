@@ -3,17 +3,136 @@ Structured logging configuration for reddit-deliver.
 
 Provides consistent logging across all modules with support for
 both human-readable console output and structured logging.
+
+Records are handed to a queue and formatted and written by a listener
+thread, so logging never blocks a worker on console I/O. In JSON mode each
+record is one JSON object carrying the correlation fields (subreddit,
+post_id, stage, duration) set with log_context() or passed as ``extra``.
 """
 
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, Optional
+
+# Correlation fields copied into JSON records when set
+CONTEXT_FIELDS = ('subreddit', 'post_id', 'stage', 'duration')
+
+LOG_FORMATS = ('text', 'json')
+
+_context: ContextVar[Dict[str, object]] = ContextVar('log_context', default={})
+
+# Listener threads of configured loggers, by logger name
+_listeners: Dict[str, QueueListener] = {}
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """
+    Attach correlation fields to every record logged in the with-block.
+
+    Fields are bound to the current thread (or asyncio task); explicit
+    ``extra`` values of a log call take precedence.
+
+    Args:
+        **fields: Field values (e.g. subreddit='python', post_id='abc123')
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the log_context() fields onto records (in the logging thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, value in _context.get().items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    Passes one in ``rate`` DEBUG records per call site.
+
+    The first record of every call site is always kept; kept records are
+    marked with the sample rate so counts can be scaled back up.
+    """
+
+    def __init__(self, rate: int):
+        """
+        Initialize debug sampler.
+
+        Args:
+            rate: Keep one of this many DEBUG records per call site
+        """
+        super().__init__()
+        self.rate = max(1, rate)
+        self._counts: Dict[tuple, int] = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            seen = self._counts.get(key, 0)
+            self._counts[key] = seen + 1
+        if seen % self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        for name in CONTEXT_FIELDS + ('sample_rate',):
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves message formatting to the listener thread.
+
+    The standard QueueHandler formats each record before queueing it (so it
+    can be pickled); within one process the record can be queued as is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def setup_logger(
     name: str = "reddit-deliver",
     level: int = logging.INFO,
-    verbose: bool = False
+    verbose: bool = False,
+    log_format: Optional[str] = None,
+    debug_sample_rate: int = 1
 ) -> logging.Logger:
     """
     Configure and return a logger with structured output.
@@ -22,6 +141,8 @@ def setup_logger(
         name: Logger name
         level: Logging level (default: INFO)
         verbose: Enable verbose/debug output
+        log_format: 'text' or 'json' (default: REDDIT_DELIVER_LOG_FORMAT, else 'text')
+        debug_sample_rate: Keep one of this many DEBUG records per call site (default: 1 = all)
 
     Returns:
         Configured logger instance
@@ -37,23 +158,55 @@ def setup_logger(
     # Prevent duplicate handlers
     if logger.hasHandlers():
         logger.handlers.clear()
+    previous = _listeners.pop(name, None)
+    if previous is not None:
+        previous.stop()
+
+    if log_format is None:
+        log_format = os.environ.get('REDDIT_DELIVER_LOG_FORMAT', 'text').lower()
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {log_format} (expected one of {', '.join(LOG_FORMATS)})")
 
     # Create console handler with formatting
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG if verbose else level)
 
-    # Format: [LEVEL] Module: Message
-    formatter = logging.Formatter(
-        fmt='[%(levelname)s] %(name)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if log_format == 'json':
+        formatter = JsonFormatter()
+    else:
+        # Format: [LEVEL] Module: Message
+        formatter = logging.Formatter(
+            fmt='[%(levelname)s] %(name)s: %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
     console_handler.setFormatter(formatter)
 
-    logger.addHandler(console_handler)
+    # Callers only enqueue records; the listener thread formats and writes them
+    records = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+    if debug_sample_rate > 1:
+        queue_handler.addFilter(DebugSampler(debug_sample_rate))
+
+    listener = QueueListener(records, console_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+
+    logger.addHandler(queue_handler)
 
     return logger
 
 
+def flush_logs():
+    """Write all queued records and stop the listener threads (called at exit)."""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+
+atexit.register(flush_logs)
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get a logger instance with the standard configuration.
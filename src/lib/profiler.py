@@ -0,0 +1,271 @@
+"""
+Per-cycle profiling for the monitor.
+
+Selected monitoring cycles are profiled and written to a directory: a
+pstats file from cProfile (the thread running the cycle) and a
+collapsed-stack file from a wall-clock stack sampler (all threads), which
+flamegraph.pl or speedscope can render. The hottest functions of each
+profiled cycle are logged.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lib.logger import get_logger
+
+logger = get_logger("profiler")
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+# Leaf functions of threads that are idle rather than working; they are
+# kept in the collapsed stacks but left out of the hot function summary
+IDLE_FUNCTIONS = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('thread.py', '_worker'),
+    ('socketserver.py', 'serve_forever'),
+}
+
+# Source root, used to shorten file names in stack frames
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _short_path(filename: str) -> str:
+    """File name relative to the source tree or site-packages, else its base name."""
+    if filename.startswith(_SRC_ROOT + os.sep):
+        return os.path.relpath(filename, _SRC_ROOT)
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler covering all threads.
+
+    A background thread records the stack of every other thread at a fixed
+    rate; stacks are counted in collapsed form (outermost frame first).
+    """
+
+    def __init__(self, rate: float = 100.0):
+        """
+        Initialize stack sampler.
+
+        Args:
+            rate: Samples per second
+        """
+        self.interval = 1.0 / rate
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self.stacks.clear()
+        self.samples = 0
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, path: str):
+        """
+        Write the samples in collapsed-stack format ("frame;frame;frame count").
+
+        Args:
+            path: Output file
+        """
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def hot_functions(self, limit: int) -> List[Tuple[str, int, int]]:
+        """
+        Functions with the most samples, ignoring idle threads.
+
+        Args:
+            limit: Number of functions to return
+
+        Returns:
+            List of (function, self samples, total samples), by self samples
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack[-1].startswith('[idle]'):
+                continue
+            own[stack[-1]] += count
+            for frame in set(stack[1:]):
+                total[frame] += count
+        return [(frame, count, total[frame]) for frame, count in own.most_common(limit)]
+
+    def _run(self):
+        """Sampling loop."""
+        own_id = threading.get_ident()
+        while not self._stopping.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if stack is None:
+                    stack = (f"[idle] {names.get(thread_id, thread_id)}",)
+                self.stacks[(names.get(thread_id, str(thread_id)),) + stack] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _stack(frame) -> Optional[Tuple[str, ...]]:
+        """Frames of a stack, outermost first (None if the thread is idle)."""
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_FUNCTIONS:
+            return None
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+
+class CycleProfiler:
+    """
+    Profiles selected monitoring cycles and writes one set of files per cycle.
+
+    In 'cprofile' mode the thread running the cycle is traced with cProfile
+    (pstats file) while the stack sampler covers all threads (collapsed-stack
+    file). 'sample' mode only runs the sampler, which has much lower overhead.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        mode: str = 'cprofile',
+        rate: float = 100.0,
+        every: int = 1,
+        min_seconds: float = 0.0,
+        top: int = 20
+    ):
+        """
+        Initialize cycle profiler.
+
+        Args:
+            output_dir: Directory the profile files are written to
+            mode: 'cprofile' or 'sample'
+            rate: Stack samples per second
+            every: Profile every Nth cycle (1 = all cycles)
+            min_seconds: Only keep profiles of cycles that took at least this long
+            top: Number of hot functions logged per profiled cycle
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(PROFILE_MODES)})")
+        if rate <= 0:
+            raise ValueError("Sampling rate must be positive")
+
+        self.output_dir = output_dir
+        self.mode = mode
+        self.rate = rate
+        self.every = max(1, every)
+        self.min_seconds = min_seconds
+        self.top = top
+        self.cycles = 0
+        self.written = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """Profile the with-block if this cycle is selected."""
+        self.cycles += 1
+        if (self.cycles - 1) % self.every:
+            yield
+            return
+
+        profile = cProfile.Profile() if self.mode == 'cprofile' else None
+        sampler = StackSampler(self.rate)
+        started_at = datetime.now()
+        start = time.perf_counter()
+
+        sampler.start()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            sampler.stop()
+            elapsed = time.perf_counter() - start
+
+            if elapsed >= self.min_seconds:
+                try:
+                    self._write(started_at, elapsed, profile, sampler)
+                except Exception as e:
+                    logger.error(f"Could not write profile of cycle {self.cycles}: {e}")
+
+    def _write(self, started_at: datetime, elapsed: float, profile: Optional[cProfile.Profile], sampler: StackSampler):
+        """Write the profile files of a cycle and log its hot functions."""
+        base = os.path.join(self.output_dir, f"cycle-{self.cycles:04d}-{started_at:%Y%m%d-%H%M%S}")
+        files = [f"{base}.collapsed"]
+        sampler.write_collapsed(files[0])
+        if profile is not None:
+            profile.dump_stats(f"{base}.pstats")
+            files.insert(0, f"{base}.pstats")
+        self.written += 1
+
+        logger.info(f"Cycle {self.cycles} took {elapsed:.2f}s, profile written to {', '.join(files)}")
+        if profile is not None:
+            logger.info(f"Hot functions (cProfile, cycle thread):\n{self._format_pstats(profile)}")
+        logger.info(
+            f"Hot functions ({sampler.samples} samples at {self.rate:.0f}/s, all threads):\n"
+            f"{self._format_samples(sampler)}"
+        )
+
+    def _format_pstats(self, profile: cProfile.Profile) -> str:
+        """Top functions by own time, in the pstats table format."""
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.strip_dirs().sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        # Skip the header lines before the table
+        lines = output.getvalue().splitlines()
+        start = next((i for i, line in enumerate(lines) if line.lstrip().startswith('ncalls')), 0)
+        return '\n'.join(line for line in lines[start:] if line.strip())
+
+    def _format_samples(self, sampler: StackSampler) -> str:
+        """Top sampled functions with their share of busy samples."""
+        hot = sampler.hot_functions(self.top)
+        if not hot:
+            return "  (no busy samples)"
+        busy = sum(count for stack, count in sampler.stacks.items() if not stack[-1].startswith('[idle]'))
+        lines = ["   self%  total%  function"]
+        for frame, own, total in hot:
+            lines.append(f"  {own / busy:6.1%} {total / busy:7.1%}  {frame}")
+        return '\n'.join(lines)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get profiling counters.
+
+        Returns:
+            Dictionary with cycles seen and profiles written
+        """
+        return {'cycles': self.cycles, 'profiles_written': self.written}
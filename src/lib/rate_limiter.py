@@ -1,7 +1,10 @@
 """
 Rate limiter utility for API throttling.
 
-Implements token bucket algorithm for rate limiting API requests.
+Implements token bucket algorithm for rate limiting API requests. The
+bucket can be synced from the rate limit headers of an API's responses, in
+which case the remaining budget is spread evenly over the rest of the
+server's window.
 """
 
 import time
@@ -9,35 +12,108 @@ from threading import Lock
 from typing import Optional
 
 from lib.logger import get_logger
+from lib.metrics import gauge, histogram
 
 logger = get_logger("rate_limiter")
 
+WAIT_SECONDS = histogram(
+    'rate_limiter_wait_seconds', 'Time spent waiting for a rate limiter token', ('limiter',),
+    buckets=(0.001, 0.01, 0.1, 0.5, 1, 2, 5, 10, 30, 60)
+)
+TOKENS = gauge('rate_limiter_tokens', 'Rate limiter tokens currently available', ('limiter',))
+RATE = gauge('rate_limiter_requests_per_minute', 'Current rate limiter refill rate', ('limiter',))
+BUDGET = gauge('rate_limiter_budget_remaining', 'Requests left in the server rate limit window (last reported)', ('limiter',))
+WINDOW_RESET = gauge('rate_limiter_window_reset_seconds', 'Seconds until the server rate limit window resets', ('limiter',))
+
 
 class RateLimiter:
     """
     Token bucket rate limiter for API requests.
 
-    Limits the rate of requests to prevent exceeding API quotas.
+    Limits the rate of requests to prevent exceeding API quotas. Until
+    sync() reports the server's budget, tokens refill at the configured
+    requests_per_minute; afterwards the refill rate follows the budget
+    until the reported window ends.
     """
 
-    def __init__(self, requests_per_minute: int = 60):
+    def __init__(self, requests_per_minute: int = 60, name: str = 'default'):
         """
         Initialize rate limiter.
 
         Args:
             requests_per_minute: Maximum requests per minute
+            name: Limiter name used as the metrics label
         """
+        self.name = name
+        self.default_requests_per_minute = requests_per_minute
         self.requests_per_minute = requests_per_minute
         self.tokens = requests_per_minute
         self.max_tokens = requests_per_minute
         self.last_refill = time.time()
+        self.window_end: Optional[float] = None
+        self.remaining: Optional[float] = None
         self.lock = Lock()
+        TOKENS.set_function(lambda: self.tokens, limiter=name)
+        RATE.set_function(lambda: self.requests_per_minute, limiter=name)
+        WINDOW_RESET.set_function(
+            lambda: max(0.0, self.window_end - time.time()) if self.window_end else 0.0, limiter=name
+        )
 
         logger.debug(f"Rate limiter initialized: {requests_per_minute} req/min")
 
+    def sync(self, remaining: float, reset_seconds: float):
+        """
+        Sync the bucket with the budget reported by the server.
+
+        At most one token is kept on hand and the rest of the remaining budget
+        is refilled evenly until the window resets, so requests are paced
+        across the window instead of bursting, and budget left unused by an
+        idle period raises the rate at the next sync. Call after every
+        response that carries rate limit headers.
+
+        Args:
+            remaining: Requests left in the current window
+            reset_seconds: Seconds until the window resets
+        """
+        with self.lock:
+            self._refill_tokens()
+            now = time.time()
+            reset_seconds = max(reset_seconds, 1.0)
+            remaining = max(remaining, 0.0)
+
+            self.tokens = min(self.tokens, remaining, 1.0)
+            self.max_tokens = max(remaining, 1.0)
+            self.requests_per_minute = (remaining - self.tokens) / reset_seconds * 60.0
+            self.window_end = now + reset_seconds
+            self.last_refill = now
+            previous, self.remaining = self.remaining, remaining
+        BUDGET.set(remaining, limiter=self.name)
+
+        if remaining < 1:
+            # Warn once per exhausted window, not for every in-flight response
+            if previous is None or previous >= 1:
+                logger.warning(f"Rate limit budget of {self.name} exhausted, next window in {reset_seconds:.0f}s")
+        else:
+            logger.debug(
+                "Rate limit synced: %.0f requests left in %.0fs (%.1f req/min)",
+                remaining, reset_seconds, self.requests_per_minute
+            )
+
     def _refill_tokens(self):
         """Refill tokens based on elapsed time."""
         now = time.time()
+        if self.window_end is not None and now >= self.window_end:
+            # The server's window has reset; refill at the configured rate
+            # until the next response reports the new budget
+            self._refill_until(self.window_end)
+            self.window_end = None
+            self.requests_per_minute = self.default_requests_per_minute
+            self.max_tokens = self.default_requests_per_minute
+            self.tokens = max(self.tokens, 1.0)
+        self._refill_until(now)
+
+    def _refill_until(self, now: float):
+        """Add the tokens accrued between the last refill and now."""
         elapsed = now - self.last_refill
 
         # Add tokens based on elapsed time
@@ -65,7 +141,8 @@ class RateLimiter:
 
                 if self.tokens >= 1:
                     self.tokens -= 1
-                    logger.debug(f"Token acquired ({self.tokens:.1f} remaining)")
+                    logger.debug("Token acquired (%.1f remaining)", self.tokens)
+                    WAIT_SECONDS.observe(time.time() - start_time, limiter=self.name)
                     return True
 
             # Check timeout
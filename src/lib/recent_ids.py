@@ -0,0 +1,72 @@
+"""
+Bounded set of recently seen IDs.
+
+Used for duplicate detection so already-seen posts are filtered in memory
+without a database round-trip.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable
+
+from lib.logger import get_logger
+
+logger = get_logger("recent_ids")
+
+
+class RecentIdSet:
+    """
+    Thread-safe set of IDs that forgets the oldest entries beyond a capacity.
+
+    Membership checks refresh an entry, so IDs that keep showing up in
+    listings stay cached while old ones age out.
+    """
+
+    def __init__(self, capacity: int = 50000):
+        """
+        Initialize recent ID set.
+
+        Args:
+            capacity: Maximum number of IDs kept in memory
+        """
+        self.capacity = capacity
+        self._ids = OrderedDict()
+        self.lock = Lock()
+
+    def __contains__(self, item_id: str) -> bool:
+        with self.lock:
+            if item_id in self._ids:
+                self._ids.move_to_end(item_id)
+                return True
+            return False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, item_id: str):
+        """
+        Add an ID, evicting the least recently seen one if full.
+
+        Args:
+            item_id: ID to remember
+        """
+        with self.lock:
+            self._add(item_id)
+
+    def update(self, item_ids: Iterable[str]):
+        """
+        Add many IDs at once.
+
+        Args:
+            item_ids: IDs to remember
+        """
+        with self.lock:
+            for item_id in item_ids:
+                self._add(item_id)
+
+    def _add(self, item_id: str):
+        """Add an ID (caller holds the lock)."""
+        self._ids[item_id] = None
+        self._ids.move_to_end(item_id)
+        while len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
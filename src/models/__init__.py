@@ -7,6 +7,9 @@ This module provides SQLAlchemy models for:
 - WebhookConfig: Webhook destinations (Discord/Slack)
 - Post: Reddit posts with processing status
 - Translation: Cached translations
+- TranslationCacheEntry: Content-addressed translation cache
+- OutboxEntry: Durable webhook delivery queue
+- SeenPost: Compact dedup record of compacted posts
 """
 
 from sqlalchemy import create_engine
@@ -22,6 +25,9 @@ from .subreddit import Subreddit
 from .webhook_config import WebhookConfig
 from .post import Post
 from .translation import Translation
+from .translation_cache import TranslationCacheEntry
+from .delivery_outbox import OutboxEntry
+from .seen_post import SeenPost
 
 __all__ = [
     'Base',
@@ -30,4 +36,7 @@ __all__ = [
     'WebhookConfig',
     'Post',
     'Translation',
+    'TranslationCacheEntry',
+    'OutboxEntry',
+    'SeenPost',
 ]
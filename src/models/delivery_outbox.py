@@ -0,0 +1,53 @@
+"""
+OutboxEntry model for durable webhook delivery.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from . import Base
+
+
+class OutboxEntry(Base):
+    """
+    A pending or finished delivery of one post to one webhook destination.
+
+    Entries are written in the same transaction as the post's translation and
+    drained by the delivery worker, so deliveries survive crashes and restarts.
+
+    Attributes:
+        id: Primary key
+        post_id: Foreign key to Post
+        webhook_id: Foreign key to WebhookConfig
+        status: Delivery status ('pending', 'sending', 'delivered', 'failed')
+        attempts: Number of failed delivery attempts
+        next_attempt_at: Earliest time of the next attempt
+        last_error: Error details of the last failed attempt
+        created_at: When the entry was created
+        delivered_at: When the webhook accepted the message
+        post: Relationship to Post model
+        webhook: Relationship to WebhookConfig model
+    """
+    __tablename__ = 'delivery_outbox'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    post_id = Column(String(20), ForeignKey('posts.id'), nullable=False, index=True)
+    webhook_id = Column(Integer, ForeignKey('webhook_config.id'), nullable=False)
+    status = Column(String(10), nullable=False, default='pending')
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String(1000), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    delivered_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    post = relationship('Post')
+    webhook = relationship('WebhookConfig')
+
+    # The worker polls for due pending entries
+    __table_args__ = (
+        Index('ix_delivery_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEntry(post_id='{self.post_id}', webhook_id={self.webhook_id}, status='{self.status}')>"
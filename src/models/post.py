@@ -2,7 +2,7 @@
 Post model for tracking Reddit posts and their processing status.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from . import Base
@@ -36,7 +36,7 @@ class Post(Base):
     author = Column(String(100), nullable=False)
     url = Column(String(500), nullable=False)
     created_utc = Column(DateTime, nullable=False)
-    processed = Column(Integer, nullable=False, default=0)  # 0=pending, 1=success, -1=failed
+    processed = Column(Integer, nullable=False, default=0, index=True)  # 0=pending, 1=success, -1=failed
     processed_at = Column(DateTime, nullable=True)
     retry_count = Column(Integer, nullable=False, default=0)
     error_message = Column(String(1000), nullable=True)
@@ -45,6 +45,11 @@ class Post(Base):
     subreddit = relationship('Subreddit', back_populates='posts')
     translations = relationship('Translation', back_populates='post', cascade='all, delete-orphan')
 
+    # Per-subreddit listings ordered by creation time
+    __table_args__ = (
+        Index('ix_posts_subreddit_created', 'subreddit_id', 'created_utc'),
+    )
+
     def __repr__(self):
         status_str = {0: 'pending', 1: 'success', -1: 'failed'}.get(self.processed, 'unknown')
         return f"<Post(id='{self.id}', title='{self.title[:30]}...', status='{status_str}')>"
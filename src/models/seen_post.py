@@ -0,0 +1,31 @@
+"""
+SeenPost model for duplicate detection of compacted posts.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from . import Base
+
+
+class SeenPost(Base):
+    """
+    Compact record of a post removed by retention compaction.
+
+    Keeps just enough of the post to recognise it when it shows up in a
+    listing again, after its bodies and translations were dropped.
+
+    Attributes:
+        id: Reddit post ID (primary key)
+        subreddit_id: Foreign key to Subreddit
+        created_utc: When post was created on Reddit
+        compacted_at: When the full post record was removed
+    """
+    __tablename__ = 'seen_posts'
+
+    id = Column(String(20), primary_key=True)  # Reddit post ID
+    subreddit_id = Column(Integer, ForeignKey('subreddits.id'), nullable=False)
+    created_utc = Column(DateTime, nullable=False, index=True)
+    compacted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SeenPost(id='{self.id}', subreddit_id={self.subreddit_id})>"
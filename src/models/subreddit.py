@@ -2,7 +2,7 @@
 Subreddit model for tracking monitored subreddits.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Float
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from . import Base
@@ -18,6 +18,9 @@ class Subreddit(Base):
         url: Full Reddit URL
         enabled: Whether actively monitoring (1=yes, 0=no)
         last_checked_at: Timestamp of last successful check
+        last_seen_fullname: Fullname of the newest post seen (e.g. 't3_abc123'), used as fetch cursor
+        last_seen_created_utc: Reddit creation time of the cursor post
+        post_velocity: Smoothed observed post rate (posts per hour)
         created_at: When subreddit was added
         posts: Relationship to Post model
     """
@@ -28,6 +31,9 @@ class Subreddit(Base):
     url = Column(String(500), nullable=False)
     enabled = Column(Integer, nullable=False, default=1)  # SQLite boolean
     last_checked_at = Column(DateTime, nullable=True)
+    last_seen_fullname = Column(String(20), nullable=True)
+    last_seen_created_utc = Column(DateTime, nullable=True)
+    post_velocity = Column(Float, nullable=False, default=0.0)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationships
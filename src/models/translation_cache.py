@@ -0,0 +1,34 @@
+"""
+TranslationCacheEntry model for content-addressed translation caching.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from . import Base
+
+
+class TranslationCacheEntry(Base):
+    """
+    Cached translation of a piece of text, keyed by content hash.
+
+    Attributes:
+        key: SHA-256 of (text, source_lang, target_lang, translator_service)
+        source_lang: Detected source language of the original text
+        translated_text: Translated text
+        size_bytes: Approximate storage size, used for size-based eviction
+        hit_count: Number of cache hits served from this entry
+        created_at: When the entry was stored
+        last_used_at: Last time the entry was stored or served
+    """
+    __tablename__ = 'translation_cache'
+
+    key = Column(String(64), primary_key=True)
+    source_lang = Column(String(10), nullable=False)
+    translated_text = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<TranslationCacheEntry(key='{self.key[:12]}...', hits={self.hit_count})>"
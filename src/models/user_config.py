@@ -11,8 +11,8 @@ class UserConfig(Base):
     """
     Global user configuration settings.
 
-    Stores user preferences for translation language, translator service, and polling interval.
-    Should be a singleton (only one row in the table).
+    Stores user preferences for translation language, translator service, polling interval,
+    and post retention. Should be a singleton (only one row in the table).
     """
     __tablename__ = 'user_config'
 
@@ -20,6 +20,8 @@ class UserConfig(Base):
     language = Column(String(10), nullable=False, default='en')  # ISO 639-1 code
     translator_service = Column(String(20), nullable=False, default='deepl')  # 'deepl' or 'gemini'
     poll_interval_minutes = Column(Integer, nullable=False, default=5)
+    retention_days = Column(Integer, nullable=False, default=0)  # Compact posts older than this (0 = keep)
+    retention_max_posts = Column(Integer, nullable=False, default=0)  # Full posts kept per subreddit (0 = all)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
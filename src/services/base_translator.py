@@ -4,8 +4,17 @@ Base translator interface for all translation services.
 Defines the contract that all translator implementations must follow.
 """
 
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from contextlib import contextmanager
+from typing import FrozenSet, Iterator, List, Optional, Tuple
+
+from services.translation_cache import TranslationCache, make_cache_key
+from lib.metrics import counter, histogram
+
+REQUESTS = counter('translate_requests_total', 'Translation service requests', ('service', 'outcome'))
+REQUEST_SECONDS = histogram('translate_request_seconds', 'Translation service request latency', ('service',))
+CHARACTERS = counter('translate_characters_total', 'Characters sent to the translation service', ('service',))
 
 
 class BaseTranslator(ABC):
@@ -15,7 +24,35 @@ class BaseTranslator(ABC):
     All translator implementations (DeepL, Gemini, etc.) must inherit from this class.
     """
 
-    @abstractmethod
+    # Service name used in translation cache keys
+    service_name = 'base'
+
+    # Optional translation cache, consulted before calling the service
+    cache: Optional[TranslationCache] = None
+
+    # Language codes the service accepts as an explicit source language
+    # (None = any); other languages are left to the service to detect
+    SOURCE_LANGUAGES: Optional[FrozenSet[str]] = None
+
+    @contextmanager
+    def _request(self, characters: int) -> Iterator[None]:
+        """
+        Record latency and outcome of one request to the translation service.
+
+        Args:
+            characters: Characters sent with the request
+        """
+        CHARACTERS.inc(characters, service=self.service_name)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            REQUESTS.inc(service=self.service_name, outcome='error')
+            raise
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - start, service=self.service_name)
+        REQUESTS.inc(service=self.service_name, outcome='ok')
+
     def translate(
         self,
         text: str,
@@ -25,6 +62,45 @@ class BaseTranslator(ABC):
         """
         Translate text to target language.
 
+        Serves the result from the translation cache when possible; otherwise
+        calls the service and caches the result.
+
+        Args:
+            text: Text to translate
+            target_lang: Target language code (e.g., 'ko', 'ja', 'es')
+            source_lang: Source language code (optional, auto-detected if not provided)
+
+        Returns:
+            Tuple of (translated_text, detected_source_lang)
+
+        Raises:
+            Exception: If translation fails
+        """
+        if not text or not text.strip():
+            return "", "unknown"
+
+        if self.cache is None:
+            return self._translate(text, target_lang, source_lang)
+
+        key = make_cache_key(text, source_lang, target_lang, self.service_name)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        translated_text, detected_lang = self._translate(text, target_lang, source_lang)
+        self.cache.put(key, translated_text, detected_lang)
+        return translated_text, detected_lang
+
+    @abstractmethod
+    def _translate(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Translate text by calling the translation service (no caching).
+
         Args:
             text: Text to translate
             target_lang: Target language code (e.g., 'ko', 'ja', 'es')
@@ -38,12 +114,134 @@ class BaseTranslator(ABC):
         """
         pass
 
+    def translate_batch(
+        self,
+        texts: List[str],
+        target_lang: str,
+        source_lang: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Translate many texts, returning results aligned to the inputs.
+
+        Empty texts and cache hits are resolved locally; identical texts are
+        sent once. The remaining texts go to _translate_batch().
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code
+            source_lang: Source language code (optional, auto-detected if not provided)
+
+        Returns:
+            List of (translated_text, detected_source_lang), one per input text
+
+        Raises:
+            Exception: If translation fails
+        """
+        results: List[Optional[Tuple[str, str]]] = [None] * len(texts)
+        keys = {}
+        pending = []
+
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = ("", "unknown")
+                continue
+            if self.cache is not None:
+                key = keys.setdefault(text, make_cache_key(text, source_lang, target_lang, self.service_name))
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+
+        if pending:
+            unique_texts = list(dict.fromkeys(texts[i] for i in pending))
+            translated = dict(zip(unique_texts, self._translate_batch(unique_texts, target_lang, source_lang)))
+
+            if self.cache is not None:
+                self.cache.put_many([
+                    (keys[text], translated_text, detected_lang)
+                    for text, (translated_text, detected_lang) in translated.items()
+                ])
+
+            for i in pending:
+                results[i] = translated[texts[i]]
+
+        return results
+
+    def _translate_batch(
+        self,
+        texts: List[str],
+        target_lang: str,
+        source_lang: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Translate non-empty texts by calling the service (no caching).
+
+        The default implementation makes one call per text; translators whose
+        API accepts multiple texts per request should override it.
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code
+            source_lang: Source language code (optional)
+
+        Returns:
+            List of (translated_text, detected_source_lang), aligned to texts
+        """
+        return [self._translate(text, target_lang, source_lang) for text in texts]
+
+    def translate_posts(
+        self,
+        posts: List[Tuple[str, Optional[str]]],
+        target_lang: str,
+        source_langs: Optional[List[Optional[str]]] = None
+    ) -> List[Tuple[str, Optional[str], str]]:
+        """
+        Translate many posts at once (titles and contents in one batch per source language).
+
+        Args:
+            posts: List of (title, content) tuples
+            target_lang: Target language code
+            source_langs: Known source language per post (None entries are auto-detected)
+
+        Returns:
+            List of (translated_title, translated_content, detected_source_lang),
+            aligned to posts. The source language is the one detected for the title.
+        """
+        source_langs = source_langs or [None] * len(posts)
+
+        # Batches share one source language, so group posts by their hint
+        groups = {}
+        for i, source_lang in enumerate(source_langs):
+            groups.setdefault(source_lang, []).append(i)
+
+        results: List[Optional[Tuple[str, Optional[str], str]]] = [None] * len(posts)
+        for source_lang, indexes in groups.items():
+            texts = []
+            for i in indexes:
+                title, content = posts[i]
+                texts.append(title)
+                if content and content.strip():
+                    texts.append(content)
+
+            translated = iter(self.translate_batch(texts, target_lang, source_lang))
+
+            for i in indexes:
+                title, content = posts[i]
+                translated_title, detected_lang = next(translated)
+                translated_content = None
+                if content and content.strip():
+                    translated_content, _ = next(translated)
+                results[i] = (translated_title, translated_content, detected_lang)
+        return results
+
     @abstractmethod
     def translate_post(
         self,
         title: str,
         content: Optional[str],
-        target_lang: str
+        target_lang: str,
+        source_lang: Optional[str] = None
     ) -> Tuple[str, Optional[str], str]:
         """
         Translate post title and content.
@@ -52,12 +250,28 @@ class BaseTranslator(ABC):
             title: Post title
             content: Post content (may be None or empty)
             target_lang: Target language code
+            source_lang: Source language code (optional, auto-detected if not provided)
 
         Returns:
             Tuple of (translated_title, translated_content, detected_source_lang)
         """
         pass
 
+    def source_lang_hint(self, lang_code: Optional[str]) -> Optional[str]:
+        """
+        Source language to pass to the service for a locally detected language.
+
+        Args:
+            lang_code: Detected language code (None if unknown)
+
+        Returns:
+            The code if the service accepts it as a source language, else None
+            (the service detects the language itself)
+        """
+        if not lang_code or self.SOURCE_LANGUAGES is None:
+            return lang_code
+        return lang_code if lang_code.lower().split('-')[0] in self.SOURCE_LANGUAGES else None
+
     @abstractmethod
     def check_supported_language(self, lang_code: str) -> bool:
         """
@@ -79,3 +293,12 @@ class BaseTranslator(ABC):
             Dictionary with usage info or empty dict if not supported
         """
         return {}
+
+    def get_cache_stats(self) -> dict:
+        """
+        Get translation cache hit/miss counters.
+
+        Returns:
+            Dictionary with cache counters or empty dict if no cache is attached
+        """
+        return self.cache.stats() if self.cache is not None else {}
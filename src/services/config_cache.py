@@ -0,0 +1,139 @@
+"""
+In-process snapshot of user and webhook configuration.
+
+UserConfig and WebhookConfig rarely change, so the monitor reads them from a
+snapshot instead of querying them for every post. The snapshot is reloaded
+when a cheap fingerprint of both tables (row counts and latest updated_at)
+changes, so `config set` and `webhook set` take effect without restarting
+the daemon.
+"""
+
+import time
+from threading import Lock
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from models import UserConfig, WebhookConfig
+from storage.database import get_session
+from lib.logger import get_logger
+
+logger = get_logger("config_cache")
+
+
+class UserSettings(NamedTuple):
+    """Values of the UserConfig row."""
+    language: str
+    translator_service: str
+    poll_interval_minutes: int
+    retention_days: int
+    retention_max_posts: int
+
+
+class WebhookTarget(NamedTuple):
+    """An enabled webhook destination."""
+    id: int
+    type: str
+    webhook_url: str
+
+
+class ConfigSnapshot(NamedTuple):
+    """Configuration as of the last load."""
+    user: Optional[UserSettings]  # None if no UserConfig row exists
+    webhooks: List[WebhookTarget]  # Enabled webhooks, by ID
+
+
+class ConfigCache:
+    """
+    Thread-safe configuration snapshot with fingerprint-based invalidation.
+
+    current() re-checks the fingerprint at most every ``check_interval``
+    seconds; refresh() checks it immediately (called at the start of each
+    monitoring cycle).
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        """
+        Initialize config cache.
+
+        Args:
+            check_interval: Seconds between fingerprint checks in current()
+        """
+        self.check_interval = check_interval
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self.lock = Lock()
+
+    def current(self) -> ConfigSnapshot:
+        """
+        Get the configuration snapshot, reloading it if the tables changed.
+
+        Returns:
+            ConfigSnapshot
+        """
+        with self.lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+        return self.refresh()
+
+    def refresh(self) -> ConfigSnapshot:
+        """
+        Check the fingerprint now and reload the snapshot if it changed.
+
+        Returns:
+            ConfigSnapshot
+        """
+        session = get_session()
+        try:
+            fingerprint = self._read_fingerprint(session)
+            with self.lock:
+                self._checked_at = time.monotonic()
+                if self._snapshot is not None and fingerprint == self._fingerprint:
+                    return self._snapshot
+
+            snapshot = self._load(session)
+            with self.lock:
+                if self._snapshot is not None:
+                    logger.info("Configuration changed, reloaded settings")
+                self._snapshot = snapshot
+                self._fingerprint = fingerprint
+                return snapshot
+        finally:
+            session.close()
+
+    def invalidate(self):
+        """Force a reload on the next access."""
+        with self.lock:
+            self._snapshot = None
+            self._fingerprint = None
+
+    @staticmethod
+    def _read_fingerprint(session) -> Tuple:
+        """Row count and latest update time of both config tables, in one query."""
+        return tuple(session.execute(select(
+            select(func.count(UserConfig.id)).scalar_subquery(),
+            select(func.max(UserConfig.updated_at)).scalar_subquery(),
+            select(func.count(WebhookConfig.id)).scalar_subquery(),
+            select(func.max(WebhookConfig.updated_at)).scalar_subquery()
+        )).one())
+
+    @staticmethod
+    def _load(session) -> ConfigSnapshot:
+        """Read both config tables into a snapshot."""
+        config = session.query(UserConfig).first()
+        user = None
+        if config:
+            user = UserSettings(
+                config.language,
+                config.translator_service,
+                config.poll_interval_minutes,
+                config.retention_days,
+                config.retention_max_posts
+            )
+
+        webhooks = [
+            WebhookTarget(webhook.id, webhook.type, webhook.webhook_url)
+            for webhook in session.query(WebhookConfig).filter_by(enabled=1).order_by(WebhookConfig.id).all()
+        ]
+        return ConfigSnapshot(user, webhooks)
@@ -0,0 +1,536 @@
+"""
+Rate-limit aware webhook delivery scheduler.
+
+Tracks each webhook URL's rate-limit bucket from response headers (Discord's
+X-RateLimit-* headers, Retry-After on 429s) and paces sends to stay within
+it. Messages that can't be sent yet are parked in a delay queue and sent by a
+background thread instead of sleeping in the caller, so other destinations
+and pipeline stages keep moving.
+
+With batching enabled, posts waiting for the same URL are packed into one
+message (several Discord embeds or Slack blocks) when it is sent.
+"""
+
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.webhook_sender import SendResult, WebhookSender
+from lib.logger import get_logger
+from lib.metrics import counter, gauge, histogram
+
+logger = get_logger("delivery_scheduler")
+
+DELIVERIES = counter('deliveries_total', 'Posts delivered or given up, by platform', ('platform', 'outcome'))
+PARKED_SECONDS = histogram(
+    'delivery_parked_seconds', 'Time deliveries are held back by rate limits, retries or batching',
+    ('platform',), buckets=(0.1, 0.5, 1, 2, 5, 10, 30, 60, 300)
+)
+QUEUE_DEPTH = gauge('delivery_queue_depth', 'Deliveries waiting in the scheduler', ('state',))
+
+# Minimum seconds between messages to one Slack webhook (Slack allows about one per second)
+SLACK_MIN_SPACING = 1.0
+
+# Wait in seconds after a 429 without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+
+
+class RateLimitBucket:
+    """
+    Rate-limit state of one webhook URL.
+
+    Discord reports the requests left in the current window and when it
+    resets; Slack reports nothing until a 429, so it is paced by a minimum
+    spacing between messages instead.
+    """
+
+    def __init__(self, platform: str, min_spacing: float = 0.0):
+        """
+        Initialize bucket.
+
+        Args:
+            platform: Platform name ('discord' or 'slack')
+            min_spacing: Minimum seconds between requests
+        """
+        self.platform = platform
+        self.min_spacing = min_spacing
+        self.remaining: Optional[int] = None  # Unknown until the first response
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.next_slot = 0.0
+
+    def ready_at(self, now: float) -> float:
+        """
+        Earliest time the next request may be sent.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Monotonic time (now if a request may be sent immediately)
+        """
+        ready = max(now, self.blocked_until, self.next_slot)
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at > now:
+            ready = max(ready, self.reset_at)
+        return ready
+
+    def reserve(self, now: float):
+        """Account for a request about to be sent."""
+        if self.remaining is not None:
+            if self.reset_at <= now:
+                self.remaining = None  # Window has reset; the next response tells us more
+            else:
+                self.remaining -= 1
+        self.next_slot = now + self.min_spacing
+
+    def update(self, result: SendResult, now: float) -> Optional[float]:
+        """
+        Update bucket state from a response.
+
+        Args:
+            result: Result of the request
+            now: Current monotonic time
+
+        Returns:
+            Seconds to wait before retrying if the request was rate limited, else None
+        """
+        remaining = _header_float(result.headers, 'X-RateLimit-Remaining')
+        reset_after = _header_float(result.headers, 'X-RateLimit-Reset-After')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_after is not None:
+            self.reset_at = now + reset_after
+
+        if not result.rate_limited:
+            return None
+
+        retry_after = _header_float(result.headers, 'Retry-After')
+        if retry_after is None:
+            retry_after = reset_after if reset_after is not None else DEFAULT_RETRY_AFTER
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        return retry_after
+
+
+class DeliveryJob:
+    """A webhook message waiting to be delivered."""
+
+    def __init__(
+        self,
+        webhook_url: str,
+        platform: str,
+        payload: dict,
+        on_complete: Optional[Callable[[bool, Optional[str]], None]] = None,
+        description: str = ''
+    ):
+        """
+        Initialize delivery job.
+
+        Args:
+            webhook_url: Webhook URL
+            platform: 'discord' or 'slack'
+            payload: JSON payload
+            on_complete: Called once with (success, error_message) when the job
+                         is delivered or gives up
+            description: Label for logs (e.g., the post ID)
+        """
+        self.webhook_url = webhook_url
+        self.platform = platform
+        self.payload = payload
+        self.on_complete = on_complete
+        self.description = description
+        self.attempts = 0
+        self.rate_limited = 0
+        self.seq: Optional[int] = None
+
+
+class DeliveryScheduler:
+    """
+    Per-URL paced webhook delivery with a delay queue.
+
+    submit() sends immediately when the URL's bucket allows it and no earlier
+    message for that URL is waiting; otherwise the job is parked. A background
+    thread sends parked jobs as they come due. Failed sends are retried with
+    exponential backoff through the same queue.
+
+    Batching is adaptive: a post for a URL that was idle during the last
+    linger window is sent right away, while posts arriving in a burst wait
+    out the window and go out together with everything else parked for
+    that URL, up to the platform's per-message limits.
+    """
+
+    def __init__(
+        self,
+        sender: WebhookSender,
+        max_attempts: int = 3,
+        max_rate_limited: int = 10,
+        send_workers: int = 4,
+        batching: bool = False,
+        linger: float = 2.0
+    ):
+        """
+        Initialize delivery scheduler.
+
+        Args:
+            sender: Webhook sender used for requests
+            max_attempts: Failed attempts (other than rate limits) before giving up
+            max_rate_limited: Rate-limited attempts before giving up
+            send_workers: Threads sending parked jobs concurrently
+            batching: Pack posts waiting for the same URL into one message
+            linger: Seconds a burst of posts waits to be batched (batching only)
+        """
+        self.sender = sender
+        self.max_attempts = max_attempts
+        self.max_rate_limited = max_rate_limited
+        self.send_workers = send_workers
+        self.batching = batching
+        self.linger = max(0.0, linger)
+
+        self._buckets: Dict[str, RateLimitBucket] = {}
+        self._queue: List[Tuple[float, int, DeliveryJob]] = []
+        self._parked: Dict[str, int] = {}  # webhook_url -> jobs waiting in the queue
+        self._linger_until: Dict[str, float] = {}  # webhook_url -> end of current batch window
+        self._last_sent: Dict[str, float] = {}  # webhook_url -> time of last send
+        self._in_flight = 0
+        self._dispatching = 0
+        self._seq = itertools.count()
+        self._cond = Condition()
+        self._worker: Optional[Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        QUEUE_DEPTH.set_function(lambda: len(self._queue), state='parked')
+        QUEUE_DEPTH.set_function(lambda: self._in_flight, state='in_flight')
+        QUEUE_DEPTH.set_function(lambda: self._dispatching, state='dispatching')
+
+        self.delivered = 0
+        self.failed = 0
+        self.deferred = 0
+        self.messages = 0
+
+    def submit(self, job: DeliveryJob) -> Optional[bool]:
+        """
+        Deliver a job now if its bucket allows it, otherwise park it.
+
+        Args:
+            job: Delivery job
+
+        Returns:
+            True or False if the job was delivered or gave up right away,
+            None if it was parked (on_complete reports the outcome later)
+        """
+        url = job.webhook_url
+        with self._cond:
+            job.seq = next(self._seq)
+            now = time.monotonic()
+            bucket = self._bucket(job)
+            ready_at = bucket.ready_at(now)
+
+            if self.batching and self.linger:
+                if url in self._linger_until:
+                    ready_at = max(ready_at, self._linger_until[url])
+                elif now - self._last_sent.get(url, float('-inf')) < self.linger:
+                    # Burst: hold this post so the ones right behind it share a message
+                    ready_at = max(ready_at, now + self.linger)
+                    self._linger_until[url] = ready_at
+
+            if self._parked.get(url) or ready_at > now:
+                # Queue behind earlier messages for this URL to keep their order
+                self._park(job, ready_at)
+                return None
+            bucket.reserve(now)
+            self._last_sent[url] = now
+            self._in_flight += 1
+
+        return self._attempt([job])
+
+    def submit_all(self, jobs: List[DeliveryJob]):
+        """
+        Deliver jobs concurrently across destinations without blocking the caller.
+
+        Jobs for the same URL are submitted in order on one send thread, so a
+        slow or rate-limited destination doesn't hold up the others. Outcomes
+        are reported through each job's on_complete.
+
+        Args:
+            jobs: Delivery jobs
+        """
+        by_url: Dict[str, List[DeliveryJob]] = {}
+        for job in jobs:
+            by_url.setdefault(job.webhook_url, []).append(job)
+
+        with self._cond:
+            self._dispatching += len(jobs)
+            executor = self._ensure_threads()
+        for url_jobs in by_url.values():
+            executor.submit(self._submit_in_order, url_jobs)
+
+    def _submit_in_order(self, jobs: List[DeliveryJob]):
+        """Submit jobs for one URL one after another (runs on a send thread)."""
+        for job in jobs:
+            try:
+                self.submit(job)
+            except Exception as e:
+                logger.error(f"Delivery {job.description} failed: {e}")
+                self._complete(job, False, str(e))
+            finally:
+                with self._cond:
+                    self._dispatching -= 1
+                    self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all parked and in-flight jobs are finished.
+
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Returns:
+            True if everything was finished, False on timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._in_flight and not self._dispatching,
+                timeout
+            )
+
+    def stats(self) -> dict:
+        """
+        Get delivery counters.
+
+        Returns:
+            Dictionary with delivered and failed (jobs), messages (webhook
+            requests that delivered them), deferred (times a post was parked)
+            and parked (posts currently waiting)
+        """
+        with self._cond:
+            return {
+                'delivered': self.delivered,
+                'failed': self.failed,
+                'messages': self.messages,
+                'deferred': self.deferred,
+                'parked': len(self._queue)
+            }
+
+    def _bucket(self, job: DeliveryJob) -> RateLimitBucket:
+        """Get the bucket for a job's URL (caller holds the lock)."""
+        bucket = self._buckets.get(job.webhook_url)
+        if bucket is None:
+            spacing = SLACK_MIN_SPACING if job.platform == 'slack' else 0.0
+            bucket = RateLimitBucket(job.platform, spacing)
+            self._buckets[job.webhook_url] = bucket
+        return bucket
+
+    def _park(self, job: DeliveryJob, due_at: float):
+        """Put a job in the delay queue (caller holds the lock)."""
+        heapq.heappush(self._queue, (due_at, job.seq, job))
+        self._parked[job.webhook_url] = self._parked.get(job.webhook_url, 0) + 1
+        self.deferred += 1
+        PARKED_SECONDS.observe(max(0.0, due_at - time.monotonic()), platform=job.platform)
+        logger.debug(
+            "Parked %s delivery %s for %.1fs", job.platform, job.description, max(0.0, due_at - time.monotonic())
+        )
+
+        self._ensure_threads()
+        self._cond.notify_all()
+
+    def _ensure_threads(self) -> ThreadPoolExecutor:
+        """Start the send threads and the delay queue thread on first use (caller holds the lock)."""
+        if self._worker is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.send_workers, thread_name_prefix="delivery"
+            )
+            self._worker = Thread(target=self._run, name="delivery-scheduler", daemon=True)
+            self._worker.start()
+        return self._executor
+
+    def _run(self):
+        """Background loop: hand parked jobs to the send threads as they come due."""
+        while True:
+            with self._cond:
+                jobs = self._next_due()
+            try:
+                self._executor.submit(self._attempt, jobs)
+            except RuntimeError:
+                return  # Interpreter shutting down
+
+    def _next_due(self) -> List[DeliveryJob]:
+        """
+        Block until a parked job may be sent and reserve its slot (caller holds the lock).
+
+        With batching, the job is returned together with the other jobs parked
+        for the same URL that fit in one message, oldest first.
+        """
+        while True:
+            if not self._queue:
+                self._cond.wait()
+                continue
+
+            now = time.monotonic()
+            due_at, seq, job = self._queue[0]
+            if due_at > now:
+                self._cond.wait(due_at - now)
+                continue
+
+            heapq.heappop(self._queue)
+            bucket = self._bucket(job)
+            ready_at = bucket.ready_at(now)
+            if ready_at > now:
+                # Bucket filled up since the job was parked; keeps its place via seq
+                heapq.heappush(self._queue, (ready_at, seq, job))
+                continue
+
+            jobs = [job]
+            if self.batching:
+                jobs.extend(self._take_batch(job))
+                self._linger_until.pop(job.webhook_url, None)
+
+            self._parked[job.webhook_url] -= len(jobs)
+            if not self._parked[job.webhook_url]:
+                del self._parked[job.webhook_url]
+            bucket.reserve(now)
+            self._last_sent[job.webhook_url] = now
+            self._in_flight += 1
+            return jobs
+
+    def _take_batch(self, first: DeliveryJob) -> List[DeliveryJob]:
+        """
+        Remove the jobs that can join first's message from the queue (caller holds the lock).
+
+        Jobs for the same URL are taken oldest first, regardless of their due
+        time, for as long as the merged message stays within platform limits.
+        """
+        candidates = sorted(
+            (entry for entry in self._queue if entry[2].webhook_url == first.webhook_url),
+            key=lambda entry: entry[1]
+        )
+
+        taken = []
+        payloads = [first.payload]
+        for _, _, job in candidates:
+            if not self.sender.can_merge(first.platform, payloads + [job.payload]):
+                break
+            payloads.append(job.payload)
+            taken.append(job)
+
+        if taken:
+            taken_ids = {id(job) for job in taken}
+            self._queue = [entry for entry in self._queue if id(entry[2]) not in taken_ids]
+            heapq.heapify(self._queue)
+        return taken
+
+    def _attempt(self, jobs: List[DeliveryJob]) -> Optional[bool]:
+        """
+        Send jobs to one URL as a single message and record, retry or park them.
+
+        Args:
+            jobs: Jobs for the same webhook URL (one unless batching)
+
+        Returns:
+            True or False if the jobs were delivered or gave up, None if they
+            were parked again
+        """
+        first = jobs[0]
+        platform = first.platform.capitalize()
+        settled = set()  # ids of jobs parked again or reported
+        try:
+            payload = self.sender.merge_payloads(first.platform, [job.payload for job in jobs])
+            if len(jobs) > 1:
+                logger.debug("Sending %d posts to one %s webhook in a single message", len(jobs), platform)
+            result = self.sender.send_once(first.webhook_url, payload, platform)
+
+            finished = []
+            with self._cond:
+                now = time.monotonic()
+                bucket = self._bucket(first)
+                retry_after = bucket.update(result, now)
+
+                if result.ok:
+                    self.delivered += len(jobs)
+                    self.messages += 1
+                    finished = jobs
+                elif result.rate_limited:
+                    if _header_bool(result.headers, 'X-RateLimit-Global'):
+                        for other in self._buckets.values():
+                            if other.platform == bucket.platform:
+                                other.blocked_until = max(other.blocked_until, bucket.blocked_until)
+                    logger.warning(
+                        f"{platform} webhook rate limited, {len(jobs)} deliveries parked for {retry_after:.1f}s"
+                    )
+                    for job in jobs:
+                        job.rate_limited += 1
+                        if job.rate_limited >= self.max_rate_limited:
+                            finished.append(job)
+                        else:
+                            self._park(job, bucket.ready_at(now))
+                            settled.add(id(job))
+                else:
+                    for job in jobs:
+                        job.attempts += 1
+                        if job.attempts >= self.max_attempts:
+                            finished.append(job)
+                        else:
+                            backoff = 2 ** (job.attempts - 1)  # 1s, 2s, 4s
+                            self._park(job, max(now + backoff, bucket.ready_at(now)))
+                            settled.add(id(job))
+
+                if not result.ok:
+                    self.failed += len(finished)
+                if finished:
+                    DELIVERIES.inc(len(finished), platform=first.platform, outcome='delivered' if result.ok else 'failed')
+
+            for job in finished:
+                if not result.ok:
+                    logger.error(
+                        f"✗ {platform} delivery {job.description} failed "
+                        f"after {job.attempts + job.rate_limited} attempts"
+                    )
+                self._complete(job, result.ok, None if result.ok else result.describe())
+                settled.add(id(job))
+        except Exception as e:
+            # Jobs neither parked nor reported would otherwise never finish
+            unsettled = [job for job in jobs if id(job) not in settled]
+            logger.error(f"✗ {platform} delivery of {len(unsettled)} posts failed: {e}")
+            with self._cond:
+                self.failed += len(unsettled)
+                if unsettled:
+                    DELIVERIES.inc(len(unsettled), platform=first.platform, outcome='failed')
+            for job in unsettled:
+                self._complete(job, False, str(e))
+            return None if len(unsettled) < len(jobs) else False
+        finally:
+            # Only now is the send finished for flush(): outcomes have been recorded
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+        if len(finished) < len(jobs):
+            return None
+        return result.ok
+
+    @staticmethod
+    def _complete(job: DeliveryJob, success: bool, error: Optional[str]):
+        """Report a job's outcome to its callback."""
+        if job.on_complete is None:
+            return
+        try:
+            job.on_complete(success, error)
+        except Exception as e:
+            logger.error(f"Delivery callback for {job.description} failed: {e}")
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    """Parse a numeric response header, or None if missing or invalid."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_bool(headers, name: str) -> bool:
+    """Parse a boolean response header."""
+    return str(headers.get(name, '')).lower() == 'true'
@@ -4,11 +4,15 @@ Translation service using Google Gemini API.
 Handles translation of post titles and content using Gemini.
 """
 
+import json
 import os
+import re
 from google import genai
-from typing import Optional, Tuple
+from google.genai import types
+from typing import Dict, List, Optional, Tuple
 from lib.logger import get_logger
 from services.base_translator import BaseTranslator
+from services.translation_cache import make_cache_key
 
 logger = get_logger("gemini_translator")
 
@@ -20,6 +24,30 @@ class GeminiTranslator(BaseTranslator):
     Provides translation with language detection using Gemini's language models.
     """
 
+    service_name = 'gemini'
+
+    # Truncate very long text
+    MAX_TEXT_LENGTH = 10000
+
+    # Structured multi-post requests: posts and total characters per request
+    MAX_STRUCTURED_POSTS = 20
+    MAX_STRUCTURED_CHARS = 30000
+
+    # Response schema for structured multi-post translation
+    POSTS_SCHEMA = {
+        'type': 'ARRAY',
+        'items': {
+            'type': 'OBJECT',
+            'properties': {
+                'index': {'type': 'INTEGER'},
+                'source_lang': {'type': 'STRING'},
+                'title': {'type': 'STRING'},
+                'content': {'type': 'STRING'},
+            },
+            'required': ['index', 'source_lang', 'title'],
+        },
+    }
+
     # Language code mapping for common languages
     LANG_NAMES = {
         'ko': 'Korean',
@@ -35,12 +63,14 @@ class GeminiTranslator(BaseTranslator):
         'en': 'English',
     }
 
-    def __init__(self, model_name: str = "gemini-2.5-flash-lite"):
+    def __init__(self, model_name: str = "gemini-2.5-flash-lite", structured_output: bool = True):
         """
         Initialize Gemini translator with API key from environment.
 
         Args:
             model_name: Gemini model to use (default: gemini-2.5-flash-lite)
+            structured_output: Translate batches of posts in a single request
+                               using a JSON response schema (default: True)
         """
         api_key = os.environ.get('GEMINI_API_KEY')
 
@@ -52,7 +82,11 @@ class GeminiTranslator(BaseTranslator):
 
         self.client = genai.Client(api_key=api_key)
         self.model_name = model_name
-        logger.info(f"Gemini translator initialized with model: {model_name}")
+        self.structured_output = structured_output
+        logger.info(
+            f"Gemini translator initialized with model: {model_name} "
+            f"(structured output: {'on' if structured_output else 'off'})"
+        )
 
     def _get_language_name(self, lang_code: str) -> str:
         """
@@ -66,7 +100,7 @@ class GeminiTranslator(BaseTranslator):
         """
         return self.LANG_NAMES.get(lang_code.lower(), lang_code)
 
-    def translate(
+    def _translate(
         self,
         text: str,
         target_lang: str,
@@ -90,11 +124,7 @@ class GeminiTranslator(BaseTranslator):
             return "", "unknown"
 
         try:
-            # Truncate very long text
-            max_length = 10000
-            if len(text) > max_length:
-                logger.warning(f"Text truncated from {len(text)} to {max_length} chars")
-                text = text[:max_length] + "..."
+            text = self._truncate(text)
 
             target_lang_name = self._get_language_name(target_lang)
 
@@ -106,12 +136,13 @@ class GeminiTranslator(BaseTranslator):
                     f"Respond with ONLY the ISO 639-1 language code (e.g., 'en', 'ko', 'ja'). "
                     f"Text: {text[:500]}"
                 )
-                detect_response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=detect_prompt
-                )
+                with self._request(len(detect_prompt)):
+                    detect_response = self.client.models.generate_content(
+                        model=self.model_name,
+                        contents=detect_prompt
+                    )
                 detected_lang = detect_response.text.strip().lower()
-                logger.debug(f"Detected language: {detected_lang}")
+                logger.debug("Detected language: %s", detected_lang)
 
             # Translate
             translate_prompt = (
@@ -120,15 +151,15 @@ class GeminiTranslator(BaseTranslator):
                 f"Text to translate:\n{text}"
             )
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=translate_prompt
-            )
+            with self._request(len(translate_prompt)):
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=translate_prompt
+                )
             translated_text = response.text.strip()
 
             logger.debug(
-                f"Translated {len(text)} chars ({detected_lang} → {target_lang}) "
-                f"using {self.model_name}"
+                "Translated %d chars (%s → %s) using %s", len(text), detected_lang, target_lang, self.model_name
             )
 
             return translated_text, detected_lang
@@ -141,7 +172,8 @@ class GeminiTranslator(BaseTranslator):
         self,
         title: str,
         content: Optional[str],
-        target_lang: str
+        target_lang: str,
+        source_lang: Optional[str] = None
     ) -> Tuple[str, Optional[str], str]:
         """
         Translate post title and content using Gemini.
@@ -150,12 +182,13 @@ class GeminiTranslator(BaseTranslator):
             title: Post title
             content: Post content (may be None or empty)
             target_lang: Target language code
+            source_lang: Source language code (optional, auto-detected if not provided)
 
         Returns:
             Tuple of (translated_title, translated_content, detected_source_lang)
         """
         # Translate title
-        translated_title, source_lang = self.translate(title, target_lang)
+        translated_title, source_lang = self.translate(title, target_lang, source_lang)
 
         # Translate content if present
         translated_content = None
@@ -169,6 +202,253 @@ class GeminiTranslator(BaseTranslator):
 
         return translated_title, translated_content, source_lang
 
+    def translate_posts(
+        self,
+        posts: List[Tuple[str, Optional[str]]],
+        target_lang: str,
+        source_langs: Optional[List[Optional[str]]] = None
+    ) -> List[Tuple[str, Optional[str], str]]:
+        """
+        Translate many posts, detecting language and translating title and
+        content for a whole batch in a single structured-output request.
+
+        Posts fully served by the translation cache are skipped. Items the
+        model drops or garbles are translated individually.
+
+        Args:
+            posts: List of (title, content) tuples
+            target_lang: Target language code
+            source_langs: Known source language per post (None entries are detected)
+
+        Returns:
+            List of (translated_title, translated_content, detected_source_lang),
+            aligned to posts
+        """
+        if not self.structured_output:
+            return super().translate_posts(posts, target_lang, source_langs)
+
+        source_langs = source_langs or [None] * len(posts)
+        results: List[Optional[Tuple[str, Optional[str], str]]] = [None] * len(posts)
+        pending = []
+        for i, (title, content) in enumerate(posts):
+            cached = self._get_cached_post(title, content, target_lang, source_langs[i])
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        for chunk in self._chunk_posts(pending, posts):
+            try:
+                translated = self._translate_posts_structured(
+                    [posts[i] for i in chunk],
+                    target_lang,
+                    [source_langs[i] for i in chunk]
+                )
+            except Exception as e:
+                logger.warning(f"Structured translation of {len(chunk)} posts failed: {e}")
+                translated = {}
+
+            cache_entries = []
+            for position, i in enumerate(chunk):
+                title, content = posts[i]
+                item = translated.get(position)
+                if item is None:
+                    logger.debug("Post %d missing from structured response, translating individually", position)
+                    item = self.translate_post(title, content, target_lang, source_langs[i])
+                else:
+                    cache_entries.extend(self._cache_entries(title, content, target_lang, item, source_langs[i]))
+                results[i] = item
+
+            if self.cache is not None:
+                self.cache.put_many(cache_entries)
+
+        logger.info(
+            f"Translated {len(posts)} posts with Gemini "
+            f"({len(posts) - len(pending)} from cache)"
+        )
+        return results
+
+    def _translate_posts_structured(
+        self,
+        posts: List[Tuple[str, Optional[str]]],
+        target_lang: str,
+        source_langs: Optional[List[Optional[str]]] = None
+    ) -> Dict[int, Tuple[str, Optional[str], str]]:
+        """
+        Translate a chunk of posts in one request with a JSON response schema.
+
+        Args:
+            posts: List of (title, content) tuples
+            target_lang: Target language code
+            source_langs: Known source language per post (sent as a hint)
+
+        Returns:
+            Dictionary mapping position in posts to
+            (translated_title, translated_content, detected_source_lang).
+            Positions the model dropped or garbled are absent.
+        """
+        source_langs = source_langs or [None] * len(posts)
+        items = []
+        for index, (title, content) in enumerate(posts):
+            item = {'index': index, 'title': self._truncate(title)}
+            if source_langs[index]:
+                item['source_lang'] = source_langs[index]
+            if content and content.strip():
+                item['content'] = self._truncate(content)
+            items.append(item)
+
+        prompt = (
+            f"For each item in the JSON array below, identify the language of its title "
+            f"as an ISO 639-1 code (use source_lang if the item already has one) and translate the title and content (if present) to "
+            f"{self._get_language_name(target_lang)}. Return one object per input item with "
+            f"the same index. Omit content if the item has none. Provide ONLY translations, "
+            f"without explanations.\n\n"
+            f"{json.dumps(items, ensure_ascii=False)}"
+        )
+
+        with self._request(len(prompt)):
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type='application/json',
+                    response_schema=self.POSTS_SCHEMA
+                )
+            )
+
+        aligned = self._align_structured_response(json.loads(response.text), posts)
+        for index, (translated_title, translated_content, _) in list(aligned.items()):
+            if source_langs[index]:
+                aligned[index] = (translated_title, translated_content, source_langs[index])
+        return aligned
+
+    def _align_structured_response(
+        self,
+        data,
+        posts: List[Tuple[str, Optional[str]]]
+    ) -> Dict[int, Tuple[str, Optional[str], str]]:
+        """
+        Map structured response items back to input positions.
+
+        Items are matched by their index field; if the model left indexes out
+        but returned exactly one item per post, they are matched by position.
+        Items with an invalid index, empty title, or missing content (when the
+        post has content) are dropped so they fall back to single translation.
+
+        Args:
+            data: Parsed JSON response
+            posts: The (title, content) tuples sent in the request
+
+        Returns:
+            Dictionary mapping position to translated post tuple
+        """
+        if not isinstance(data, list):
+            return {}
+
+        use_position = (
+            len(data) == len(posts)
+            and not any(isinstance(item, dict) and isinstance(item.get('index'), int) for item in data)
+        )
+
+        aligned = {}
+        for position, item in enumerate(data):
+            if not isinstance(item, dict):
+                continue
+            index = position if use_position else item.get('index')
+            if not isinstance(index, int) or not 0 <= index < len(posts) or index in aligned:
+                continue
+
+            translated_title = item.get('title')
+            if not isinstance(translated_title, str) or not translated_title.strip():
+                continue
+
+            translated_content = None
+            _, content = posts[index]
+            if content and content.strip():
+                translated_content = item.get('content')
+                if not isinstance(translated_content, str) or not translated_content.strip():
+                    continue
+                translated_content = translated_content.strip()
+
+            source_lang = str(item.get('source_lang', '')).strip().lower()
+            if not re.match(r'^[a-z]{2,3}(-[a-z]{2,4})?$', source_lang):
+                source_lang = 'unknown'
+
+            aligned[index] = (translated_title.strip(), translated_content, source_lang)
+
+        return aligned
+
+    def _chunk_posts(self, indexes: List[int], posts: List[Tuple[str, Optional[str]]]):
+        """Yield chunks of post indexes within the structured request limits."""
+        chunk = []
+        chunk_chars = 0
+        for i in indexes:
+            title, content = posts[i]
+            size = min(len(title), self.MAX_TEXT_LENGTH) + min(len(content or ''), self.MAX_TEXT_LENGTH)
+            if chunk and (len(chunk) >= self.MAX_STRUCTURED_POSTS or chunk_chars + size > self.MAX_STRUCTURED_CHARS):
+                yield chunk
+                chunk = []
+                chunk_chars = 0
+            chunk.append(i)
+            chunk_chars += size
+        if chunk:
+            yield chunk
+
+    def _get_cached_post(
+        self,
+        title: str,
+        content: Optional[str],
+        target_lang: str,
+        source_lang: Optional[str] = None
+    ) -> Optional[Tuple[str, Optional[str], str]]:
+        """Resolve a whole post from the translation cache, or None."""
+        if self.cache is None:
+            return None
+
+        cached_title = self.cache.get(make_cache_key(title, source_lang, target_lang, self.service_name))
+        if cached_title is None:
+            return None
+
+        translated_title, source_lang = cached_title
+        translated_content = None
+        if content and content.strip():
+            cached_content = self.cache.get(make_cache_key(content, source_lang, target_lang, self.service_name))
+            if cached_content is None:
+                return None
+            translated_content = cached_content[0]
+
+        return translated_title, translated_content, source_lang
+
+    def _cache_entries(
+        self,
+        title: str,
+        content: Optional[str],
+        target_lang: str,
+        translated: Tuple[str, Optional[str], str],
+        source_hint: Optional[str] = None
+    ) -> List[Tuple[str, str, str]]:
+        """Cache entries for a structured translation, under the same keys translate_post uses."""
+        translated_title, translated_content, source_lang = translated
+        entries = [(
+            make_cache_key(title, source_hint, target_lang, self.service_name),
+            translated_title,
+            source_lang
+        )]
+        if translated_content is not None:
+            entries.append((
+                make_cache_key(content, source_lang, target_lang, self.service_name),
+                translated_content,
+                source_lang
+            ))
+        return entries
+
+    def _truncate(self, text: str) -> str:
+        """Truncate text to MAX_TEXT_LENGTH characters."""
+        if len(text) > self.MAX_TEXT_LENGTH:
+            logger.warning(f"Text truncated from {len(text)} to {self.MAX_TEXT_LENGTH} chars")
+            return text[:self.MAX_TEXT_LENGTH] + "..."
+        return text
+
     def check_supported_language(self, lang_code: str) -> bool:
         """
         Check if language is supported by Gemini.
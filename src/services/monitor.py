@@ -4,20 +4,86 @@ Monitoring orchestrator service.
 Coordinates Reddit polling, translation, and webhook delivery.
 """
 
+import math
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import Optional
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Union
 from sqlalchemy.orm import Session
 
-from models import Subreddit, Post, Translation, UserConfig, WebhookConfig
+from models import Subreddit, Post, Translation, OutboxEntry, SeenPost
 from services.reddit_client import RedditClient
 from services.translator_factory import TranslatorFactory
+from services.translation_cache import TranslationCache
 from services.webhook_sender import WebhookSender
-from storage.database import get_session
-from lib.logger import get_logger
+from services.delivery_scheduler import DeliveryScheduler
+from services.outbox import DeliveryOutbox
+from services.config_cache import ConfigCache
+from services.retention import Compactor
+from services.pipeline import DELIVER_CONCURRENCY, TRANSLATE_CONCURRENCY, PipelineEngine
+from services.scheduler import PollScheduler
+from storage.database import WriteBuffer, get_session, reserve_connections
+from lib.language_id import detect_language, same_language
+from lib.logger import get_logger, log_context
+from lib.metrics import counter, gauge, histogram
+from lib.profiler import CycleProfiler
+from lib.recent_ids import RecentIdSet
 
 logger = get_logger("monitor")
 
+CYCLE_SECONDS = histogram(
+    'cycle_seconds', 'Duration of monitoring cycles', ('engine',),
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+)
+STAGE_SECONDS = histogram(
+    'stage_seconds', 'Time spent in each processing stage per subreddit (per post for single translations)', ('stage',),
+    buckets=(0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+POSTS = counter('posts_total', 'New posts stored, by outcome', ('outcome',))
+TRANSLATION_SKIPS = counter('translation_skipped_total', 'Posts already in the target language')
+CHECK_ERRORS = counter('subreddit_errors_total', 'Subreddit checks that failed')
+OUTBOX_ENTRIES = gauge('outbox_entries', 'Delivery outbox entries by status (as of the last cycle)', ('status',))
+
+# Listing page size bounds for adaptive fetching
+MIN_LISTING_SIZE = 5
+MAX_LISTING_SIZE = 100
+DEFAULT_LISTING_SIZE = 25
+
+# Weight of the latest observation in the smoothed post velocity
+VELOCITY_SMOOTHING = 0.3
+
+# In-memory duplicate detection
+SEEN_IDS_CAPACITY = 50000
+DEDUP_QUERY_CHUNK = 500  # Stay well below SQLite's bound parameter limit
+
+# Longest sleep between adaptive scheduler ticks (seconds)
+ADAPTIVE_MAX_SLEEP = 30
+
+# Startup recovery of posts whose translation failed
+RECOVERY_MAX_RETRIES = 5
+RECOVERY_BATCH = 500
+
+# Bounds of the post write buffer: rows queued, and seconds the oldest may wait
+WRITE_BUFFER_ROWS = 500
+WRITE_BUFFER_MAX_AGE = 5.0
+
+# Characters of post content used (with the title) for local language detection
+DETECT_SAMPLE_CHARS = 1000
+
+
+@contextmanager
+def _stage(stage: str) -> Iterator[None]:
+    """Time a processing stage into STAGE_SECONDS and log it with the stage and duration fields."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_SECONDS.observe(duration, stage=stage)
+        logger.debug("Stage %s took %.1fms", stage, duration * 1000, extra={'stage': stage, 'duration': duration})
+
 
 class Monitor:
     """
@@ -26,202 +92,532 @@ class Monitor:
     Polls subreddits, translates content, and delivers via webhooks.
     """
 
-    def __init__(self, translator_service: Optional[str] = None):
+    def __init__(
+        self,
+        translator_service: Optional[str] = None,
+        max_workers: int = 1,
+        fetch_batch_size: int = 25,
+        batch_deliveries: bool = False,
+        batch_linger: float = 2.0,
+        profiler: Optional[CycleProfiler] = None
+    ):
         """
         Initialize monitor with service dependencies.
 
         Args:
             translator_service: Override translator service (e.g., 'deepl', 'gemini').
                               If None, uses value from UserConfig.
+            max_workers: Number of subreddits checked concurrently (default: 1 = serial)
+            fetch_batch_size: Subreddits per combined Reddit listing request
+                              (default: 25, 1 = one request per subreddit)
+            batch_deliveries: Pack bursts of posts for the same webhook into one message
+            batch_linger: Seconds a burst of posts waits to be batched
+            profiler: Profiles selected monitoring cycles (optional)
         """
+        self.max_workers = max(1, max_workers)
+        # Every worker (or pipeline stage worker) may hold a session at once
+        reserve_connections(self.max_workers + TRANSLATE_CONCURRENCY + DELIVER_CONCURRENCY)
+
         self.reddit_client = RedditClient()
+        self.config = ConfigCache()
         self.webhook_sender = WebhookSender()
+        self.delivery = DeliveryScheduler(
+            self.webhook_sender,
+            batching=batch_deliveries,
+            linger=batch_linger
+        )
+        self.outbox = DeliveryOutbox(self.delivery, self.config)
+        # Posts, translations and outbox entries are written in bulk; the
+        # outbox worker picks up the deliveries once they are committed
+        self.writes = WriteBuffer(WRITE_BUFFER_ROWS, WRITE_BUFFER_MAX_AGE, on_flush=self.outbox.wake)
+        self.compactor = Compactor(self.config)
         self._translator_service = translator_service
         self._translator = None
-        logger.info("Monitor initialized")
+        self._translator_name = None
+        self._translator_lock = Lock()
+        self.translation_cache = TranslationCache()
+        self.seen_ids = RecentIdSet(capacity=SEEN_IDS_CAPACITY)
+        self.fetch_batch_size = max(1, fetch_batch_size)
+        self.profiler = profiler
+        logger.info(
+            f"Monitor initialized (workers={self.max_workers}, "
+            f"fetch_batch_size={self.fetch_batch_size}, "
+            f"batch_deliveries={'on' if batch_deliveries else 'off'})"
+        )
 
-    def check_subreddit(self, subreddit: Subreddit, session: Session) -> int:
+    def check_subreddit(
+        self,
+        subreddit: Subreddit,
+        session: Session,
+        prefetched: Optional[List[dict]] = None
+    ) -> int:
         """
         Check a single subreddit for new posts.
 
         Args:
             subreddit: Subreddit model instance
             session: Database session
+            prefetched: Posts already fetched by a batched listing request
+                        (if None, the subreddit is fetched individually)
 
         Returns:
             Number of new posts processed
         """
-        logger.info(f"Checking r/{subreddit.name}...")
+        with log_context(subreddit=subreddit.name):
+            logger.info(f"Checking r/{subreddit.name}...")
+
+            try:
+                posts = self._fetch_new_posts(subreddit, session, prefetched)
+
+                # Translate the subreddit's new posts in one batch
+                translations = self.translate_posts(posts, session)
+
+                processed_count = 0
+
+                for post_data, translated in zip(posts, translations):
+                    # Process new post
+                    if self._process_post(post_data, subreddit.id, translated=translated):
+                        processed_count += 1
+
+                # Advance fetch cursor and last checked timestamp. Queued behind
+                # the posts, so the cursor never moves past unsaved posts.
+                self.writes.update(Subreddit, self._cursor_update(subreddit, posts))
+
+                logger.info(f"✓ r/{subreddit.name}: {processed_count} new posts processed")
+                return processed_count
+
+            except Exception as e:
+                logger.error(f"Error checking r/{subreddit.name}: {e}")
+                session.rollback()
+                return 0
+
+    def _fetch_new_posts(
+        self,
+        subreddit: Subreddit,
+        session: Session,
+        prefetched: Optional[List[dict]] = None
+    ) -> List[dict]:
+        """
+        Fetch posts from Reddit and drop the ones already stored.
+
+        Args:
+            subreddit: Subreddit model instance
+            session: Database session
+            prefetched: Posts already fetched by a batched listing request
+
+        Returns:
+            List of post dictionaries not yet seen
+        """
+        if prefetched is not None:
+            posts = prefetched
+        else:
+            # Fetch posts newer than the cursor
+            with _stage('fetch'):
+                posts = self.reddit_client.get_new_posts(
+                    subreddit.name,
+                    limit=self._listing_size(subreddit),
+                    since=self._fetch_cutoff(subreddit),
+                    before=subreddit.last_seen_fullname
+                )
+
+        with _stage('dedup'):
+            return self._filter_unseen(posts, session)
+
+    def _filter_unseen(self, posts: List[dict], session: Session) -> List[dict]:
+        """
+        Drop posts that were already stored (duplicate detection).
+
+        Posts found in the in-memory recent-ID set are dropped without touching
+        the database; the rest are checked against stored and compacted posts
+        with IN queries per chunk.
+
+        Args:
+            posts: Fetched post dictionaries
+            session: Database session
+
+        Returns:
+            Posts not yet stored, in their original order
+        """
+        candidates = [post_data for post_data in posts if post_data['id'] not in self.seen_ids]
+        if not candidates:
+            return []
+
+        candidate_ids = [post_data['id'] for post_data in candidates]
+        existing = set()
+        for start in range(0, len(candidate_ids), DEDUP_QUERY_CHUNK):
+            chunk = candidate_ids[start:start + DEDUP_QUERY_CHUNK]
+            existing.update(row[0] for row in session.query(Post.id).filter(Post.id.in_(chunk)))
+            existing.update(row[0] for row in session.query(SeenPost.id).filter(SeenPost.id.in_(chunk)))
+
+        if existing:
+            self.seen_ids.update(existing)
+            logger.debug("Skipping %d already processed posts", len(existing))
+
+        return [post_data for post_data in candidates if post_data['id'] not in existing]
+
+    def preload_seen_ids(self) -> int:
+        """
+        Warm the recent-ID set with the most recently created stored or compacted posts.
+
+        Returns:
+            Number of IDs loaded
+        """
+        session = get_session()
+        try:
+            rows = []
+            for model in (Post, SeenPost):
+                rows.extend(
+                    session.query(model.id, model.created_utc)
+                    .order_by(model.created_utc.desc())
+                    .limit(self.seen_ids.capacity)
+                    .all()
+                )
+            rows = sorted(rows, key=lambda row: row[1])[-self.seen_ids.capacity:]
+            self.seen_ids.update(row[0] for row in rows)
+            logger.info(f"Preloaded {len(rows)} recent post IDs for duplicate detection")
+            return len(rows)
+        finally:
+            session.close()
+
+    def prefetch_posts(self, subreddits: List[Subreddit]) -> Dict[int, List[dict]]:
+        """
+        Fetch new posts for many subreddits with combined listing requests.
+
+        Args:
+            subreddits: Subreddit model instances
+
+        Returns:
+            Dictionary mapping subreddit ID to fetched posts. Subreddits that
+            could not be fetched are omitted (and fall back to individual fetches).
+        """
+        if self.fetch_batch_size <= 1 or len(subreddits) <= 1:
+            return {}
 
+        by_name = {subreddit.name: subreddit.id for subreddit in subreddits}
+        start = time.perf_counter()
         try:
-            # Fetch new posts since last check
-            since = subreddit.last_checked_at
-            posts = self.reddit_client.get_new_posts(
-                subreddit.name,
-                limit=25,
-                since=since
+            fetched = self.reddit_client.get_new_posts_batch(
+                list(by_name),
+                since={s.name: self._fetch_cutoff(s) for s in subreddits},
+                before={s.name: s.last_seen_fullname for s in subreddits},
+                page_sizes={s.name: self._listing_size(s) for s in subreddits},
+                batch_size=self.fetch_batch_size
             )
+            # Spread the combined requests' time over the subreddits they covered
+            per_subreddit = (time.perf_counter() - start) / len(subreddits)
+            for _ in subreddits:
+                STAGE_SECONDS.observe(per_subreddit, stage='fetch')
+        except Exception as e:
+            logger.error(f"Batched fetch failed, falling back to per-subreddit fetches: {e}")
+            return {}
 
-            processed_count = 0
+        return {by_name[name]: posts for name, posts in fetched.items()}
 
-            for post_data in posts:
-                # Check if post already exists (duplicate detection)
-                existing = session.query(Post).filter_by(id=post_data['id']).first()
-                if existing:
-                    logger.debug(f"Post {post_data['id']} already processed, skipping")
-                    continue
+    @staticmethod
+    def _fetch_cutoff(subreddit: Subreddit) -> Optional[datetime]:
+        """
+        Get the timestamp that bounds a fetch.
 
-                # Process new post
-                if self._process_post(post_data, subreddit, session):
-                    processed_count += 1
+        Prefers the Reddit creation time of the cursor post; falls back to the
+        last check time for subreddits that don't have a cursor yet.
+        """
+        return subreddit.last_seen_created_utc or subreddit.last_checked_at
 
-            # Update last checked timestamp
-            subreddit.last_checked_at = datetime.utcnow()
-            session.commit()
+    @staticmethod
+    def _listing_size(subreddit: Subreddit) -> int:
+        """
+        Choose a listing page size from the subreddit's observed post velocity.
 
-            logger.info(f"✓ r/{subreddit.name}: {processed_count} new posts processed")
-            return processed_count
+        Quiet subreddits get small pages; busy ones get pages large enough to
+        cover the expected posts since the last check in a single request.
+        """
+        if subreddit.last_checked_at is None or subreddit.last_seen_fullname is None:
+            return DEFAULT_LISTING_SIZE
 
-        except Exception as e:
-            logger.error(f"Error checking r/{subreddit.name}: {e}")
-            session.rollback()
-            return 0
+        hours = (datetime.utcnow() - subreddit.last_checked_at).total_seconds() / 3600
+        expected = (subreddit.post_velocity or 0.0) * max(hours, 0.0)
+        size = math.ceil(expected * 1.5) + MIN_LISTING_SIZE
+        return max(MIN_LISTING_SIZE, min(MAX_LISTING_SIZE, size))
 
-    def _get_translator(self, session: Session):
+    @staticmethod
+    def _cursor_update(subreddit: Subreddit, new_posts: List[dict]) -> dict:
         """
-        Get or create translator instance based on configuration.
+        Compute the column updates recording a completed check: the cursor
+        moves to the newest post and the smoothed post velocity is updated.
 
         Args:
-            session: Database session
+            subreddit: Subreddit model instance
+            new_posts: Unseen posts found by this check
+
+        Returns:
+            Subreddit column values, including its 'id'
+        """
+        now = datetime.utcnow()
+        values = {'id': subreddit.id, 'last_checked_at': now}
+
+        if subreddit.last_checked_at is not None:
+            hours = max((now - subreddit.last_checked_at).total_seconds() / 3600, 1 / 60)
+            rate = len(new_posts) / hours
+            velocity = subreddit.post_velocity or 0.0
+            values['post_velocity'] = VELOCITY_SMOOTHING * rate + (1 - VELOCITY_SMOOTHING) * velocity
+
+        if new_posts:
+            newest = max(new_posts, key=lambda p: p['created_utc'])
+            values['last_seen_fullname'] = f"t3_{newest['id']}"
+            values['last_seen_created_utc'] = newest['created_utc']
+
+        return values
+
+    def _get_translator(self):
+        """
+        Get or create translator instance based on configuration.
+
+        The translator is recreated if the configured service changes.
 
         Returns:
             Translator instance
         """
-        if self._translator is None:
-            # Determine which translator service to use
-            service = self._translator_service
-            if not service:
-                config = session.query(UserConfig).first()
-                if config:
-                    service = config.translator_service
-                else:
-                    service = 'deepl'  # Default fallback
+        # Determine which translator service to use
+        service = self._translator_service
+        if not service:
+            user = self.config.current().user
+            service = user.translator_service if user else 'deepl'  # Default fallback
 
-            logger.info(f"Creating {service} translator")
-            self._translator = TranslatorFactory.create_translator(service)
+        with self._translator_lock:
+            if self._translator is None or self._translator_name != service:
+                logger.info(f"Creating {service} translator")
+                self._translator = TranslatorFactory.create_translator(
+                    service, cache=self.translation_cache
+                )
+                self._translator_name = service
 
-        return self._translator
+            return self._translator
 
-    def _process_post(self, post_data: dict, subreddit: Subreddit, session: Session) -> bool:
+    def translate_posts(self, posts: List[dict], session: Session) -> List[Optional[tuple]]:
         """
-        Process a single post: translate and send webhook.
+        Translate a batch of posts with as few translator calls as possible.
 
         Args:
-            post_data: Post data from Reddit API
-            subreddit: Subreddit model instance
+            posts: Post dictionaries to translate
             session: Database session
 
         Returns:
-            True if processed successfully, False otherwise
+            List aligned to posts of translate_post results. Entries are None
+            (translate individually) if batching is not possible or fails.
         """
+        if len(posts) < 2:
+            return [None] * len(posts)
+
+        user = self.config.current().user
+        if not user:
+            return [None] * len(posts)
+
         try:
-            # Create Post record
-            post = Post(
-                id=post_data['id'],
-                subreddit_id=subreddit.id,
-                title=post_data['title'],
-                content=post_data['content'],
-                author=post_data['author'],
-                url=post_data['url'],
-                created_utc=post_data['created_utc'],
-                processed=0  # Mark as pending
+            translator = self._get_translator()
+            logger.debug("Translating %d posts to %s in one batch", len(posts), user.language)
+            return self._translate_many(translator, posts, user.language)
+        except Exception as e:
+            logger.warning(f"Batch translation failed, translating posts individually: {e}")
+            return [None] * len(posts)
+
+    def _translate_many(self, translator, posts: List[dict], target_lang: str) -> List[tuple]:
+        """
+        Translate posts in one translator batch, skipping posts already in the target language.
+
+        Args:
+            translator: Translator instance
+            posts: Post dictionaries to translate
+            target_lang: Target language code
+
+        Returns:
+            List aligned to posts of (title, content, source_lang) tuples
+
+        Raises:
+            Exception: If the translator batch fails
+        """
+        results: List[Optional[tuple]] = [None] * len(posts)
+        pending = []
+        source_langs = []
+        for i, post_data in enumerate(posts):
+            source_lang = self._detect_source_lang(post_data)
+            if same_language(source_lang, target_lang):
+                results[i] = self._untranslated(post_data, source_lang)
+            else:
+                pending.append(i)
+                source_langs.append(translator.source_lang_hint(source_lang))
+
+        if len(pending) < len(posts):
+            TRANSLATION_SKIPS.inc(len(posts) - len(pending))
+            logger.debug("Skipping translation of %d posts already in %s", len(posts) - len(pending), target_lang)
+
+        if pending:
+            with _stage('translate'):
+                translated = translator.translate_posts(
+                    [(posts[i]['title'], posts[i]['content']) for i in pending],
+                    target_lang,
+                    source_langs
+                )
+            for i, item in zip(pending, translated):
+                results[i] = item
+        return results
+
+    def _translate_one(self, translator, post_data: dict, target_lang: str) -> tuple:
+        """
+        Translate a single post unless it is already in the target language.
+
+        Args:
+            translator: Translator instance
+            post_data: Post dictionary
+            target_lang: Target language code
+
+        Returns:
+            Tuple of (title, content, source_lang)
+        """
+        source_lang = self._detect_source_lang(post_data)
+        if same_language(source_lang, target_lang):
+            TRANSLATION_SKIPS.inc()
+            logger.debug(
+                "Post %s already in %s, skipping translation", post_data['id'], target_lang,
+                extra={'post_id': post_data['id']}
+            )
+            return self._untranslated(post_data, source_lang)
+
+        with _stage('translate'):
+            return translator.translate_post(
+                post_data['title'],
+                post_data['content'],
+                target_lang,
+                translator.source_lang_hint(source_lang)
             )
-            session.add(post)
-            session.flush()  # Get post ID without committing
 
+    @staticmethod
+    def _detect_source_lang(post_data: dict) -> Optional[str]:
+        """
+        Identify a post's language locally (None if unsure).
+
+        The result decides whether a post needs translating at all; it is only
+        passed on to the translator if the service accepts it as a source
+        language (see BaseTranslator.source_lang_hint).
+        """
+        text = post_data['title']
+        if post_data.get('content'):
+            text = f"{text}\n{post_data['content'][:DETECT_SAMPLE_CHARS]}"
+        return detect_language(text)
+
+    @staticmethod
+    def _untranslated(post_data: dict, source_lang: str) -> tuple:
+        """Build a translate_post-style result that keeps the original text."""
+        content = post_data['content']
+        return post_data['title'], content if content and content.strip() else None, source_lang
+
+    def _process_post(
+        self,
+        post_data: dict,
+        subreddit_id: int,
+        translated: Optional[Union[tuple, Exception]] = None
+    ) -> bool:
+        """
+        Process a single post: translate and queue webhook delivery.
+
+        The post, its translation and its outbox entries are queued in the
+        write buffer and committed together by the next flush; the outbox
+        worker then delivers them. The post stays pending until the delivery
+        succeeds.
+
+        Args:
+            post_data: Post data from Reddit API
+            subreddit_id: Subreddit primary key
+            translated: Result of translate_post computed ahead of time (e.g. by
+                        the pipeline's translate stage), or the exception it raised.
+                        If None, the post is translated here.
+
+        Returns:
+            True if translated and queued for delivery, False otherwise
+        """
+        post = {
+            'id': post_data['id'],
+            'subreddit_id': subreddit_id,
+            'title': post_data['title'],
+            'content': post_data['content'],
+            'author': post_data['author'],
+            'url': post_data['url'],
+            'created_utc': post_data['created_utc'],
+            'processed': 0,  # Mark as pending
+            'processed_at': None,
+            'retry_count': 0,
+            'error_message': None
+        }
+
+        try:
             # Get user config for target language
-            config = session.query(UserConfig).first()
-            if not config:
+            snapshot = self.config.current()
+            if not snapshot.user:
                 logger.error("No user config found")
                 return False
 
-            target_lang = config.language
+            target_lang = snapshot.user.language
 
             # Get translator and translate post
-            translator = self._get_translator(session)
-            logger.debug(f"Translating post {post.id} to {target_lang}")
-            translated_title, translated_content, source_lang = translator.translate_post(
-                post.title,
-                post.content,
-                target_lang
-            )
+            if translated is None:
+                translator = self._get_translator()
+                logger.debug("Translating post %s to %s", post['id'], target_lang, extra={'post_id': post['id']})
+                translated = self._translate_one(translator, post_data, target_lang)
+            elif isinstance(translated, Exception):
+                raise translated
+            translated_title, translated_content, source_lang = translated
 
-            # Save translation
-            translation = Translation(
-                post_id=post.id,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                translated_title=translated_title,
-                translated_content=translated_content
-            )
-            session.add(translation)
-
-            # Get webhook config
-            webhook = session.query(WebhookConfig).filter_by(enabled=1).first()
-            if not webhook:
-                logger.warning("No enabled webhook found, skipping delivery")
-                post.processed = 1  # Mark as processed anyway
-                post.processed_at = datetime.utcnow()
-                session.commit()
-                return True
-
-            # Send webhook
-            logger.debug(f"Sending {webhook.type} webhook for post {post.id}")
-            success = False
-
-            if webhook.type == 'discord':
-                success = self.webhook_sender.send_discord(
-                    webhook.webhook_url,
-                    translated_title,
-                    translated_content or '',
-                    post.url,
-                    post.author
-                )
-            elif webhook.type == 'slack':
-                success = self.webhook_sender.send_slack(
-                    webhook.webhook_url,
-                    translated_title,
-                    translated_content or '',
-                    post.url,
-                    post.author
-                )
+        except Exception as e:
+            logger.error(f"Error processing post {post_data['id']}: {e}", extra={'post_id': post_data['id']})
+            post['processed'] = -1
+            post['error_message'] = str(e)
+            post['retry_count'] = 1
+            self._queue_post(post)
+            POSTS.inc(outcome='failed')
+            return False
 
-            # Update post status
-            if success:
-                post.processed = 1
-                post.processed_at = datetime.utcnow()
-                logger.info(f"✓ Post {post.id} processed successfully")
-            else:
-                post.processed = -1
-                post.retry_count += 1
-                post.error_message = "Webhook delivery failed"
-                logger.error(f"✗ Post {post.id} webhook delivery failed")
+        translation = {
+            'post_id': post['id'],
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'translated_title': translated_title,
+            'translated_content': translated_content
+        }
 
-            session.commit()
-            return success
+        # Queue delivery with the translation; the outbox worker sends it
+        # independently of polling once the buffer is flushed
+        webhooks = snapshot.webhooks
+        if not webhooks:
+            logger.warning("No enabled webhook found, skipping delivery")
+            post['processed'] = 1  # Mark as processed anyway
+            post['processed_at'] = datetime.utcnow()
 
-        except Exception as e:
-            logger.error(f"Error processing post {post_data['id']}: {e}")
-            post.processed = -1
-            post.error_message = str(e)
-            post.retry_count += 1
-            session.commit()
-            return False
+        self._queue_post(post, translation, self.outbox.entry_rows(post['id'], webhooks))
+        POSTS.inc(outcome='queued' if webhooks else 'not_delivered')
+        return True
+
+    def _queue_post(self, post: dict, translation: Optional[dict] = None, outbox_rows: Optional[List[dict]] = None):
+        """
+        Queue a new post with its translation and outbox entries in the write buffer.
 
-    def check_all_enabled(self) -> dict:
+        Args:
+            post: Post column values
+            translation: Translation column values
+            outbox_rows: OutboxEntry column values
+        """
+        self.seen_ids.add(post['id'])
+        self.writes.insert(Post, [post], ignore_conflicts=True)
+        if translation:
+            self.writes.insert(Translation, [translation], ignore_conflicts=True)
+        if outbox_rows:
+            self.writes.insert(OutboxEntry, outbox_rows)
+
+    def check_all_enabled(self, subreddit_ids: Optional[List[int]] = None) -> dict:
         """
         Check all enabled subreddits for new posts.
 
+        Args:
+            subreddit_ids: Restrict the check to these subreddits (default: all enabled)
+
         Returns:
             Dictionary with statistics:
                 - total_checked: Number of subreddits checked
@@ -237,7 +633,10 @@ class Monitor:
 
         try:
             # Get all enabled subreddits
-            subreddits = session.query(Subreddit).filter_by(enabled=1).all()
+            query = session.query(Subreddit).filter_by(enabled=1)
+            if subreddit_ids is not None:
+                query = query.filter(Subreddit.id.in_(subreddit_ids))
+            subreddits = query.all()
 
             if not subreddits:
                 logger.warning("No enabled subreddits found")
@@ -245,14 +644,21 @@ class Monitor:
 
             logger.info(f"Checking {len(subreddits)} enabled subreddit(s)...")
 
-            for subreddit in subreddits:
-                stats['total_checked'] += 1
-                try:
-                    posts_processed = self.check_subreddit(subreddit, session)
-                    stats['total_posts'] += posts_processed
-                except Exception as e:
-                    logger.error(f"Error checking r/{subreddit.name}: {e}")
-                    stats['errors'] += 1
+            prefetched = self.prefetch_posts(subreddits)
+
+            if self.max_workers > 1 and len(subreddits) > 1:
+                self._check_concurrently(subreddits, stats, prefetched)
+            else:
+                for subreddit in subreddits:
+                    stats['total_checked'] += 1
+                    try:
+                        posts_processed = self.check_subreddit(
+                            subreddit, session, prefetched.get(subreddit.id)
+                        )
+                        stats['total_posts'] += posts_processed
+                    except Exception as e:
+                        logger.error(f"Error checking r/{subreddit.name}: {e}")
+                        stats['errors'] += 1
 
             logger.info(
                 f"Check complete: {stats['total_posts']} posts processed, "
@@ -264,46 +670,374 @@ class Monitor:
 
         return stats
 
-    def run_once(self) -> dict:
+    def _check_concurrently(
+        self,
+        subreddits: List[Subreddit],
+        stats: dict,
+        prefetched: Dict[int, List[dict]]
+    ):
+        """
+        Check subreddits using a bounded worker pool.
+
+        Each worker opens its own database session; the Reddit rate limiter
+        is shared, so concurrency never exceeds the API quota.
+
+        Args:
+            subreddits: Subreddits to check
+            stats: Statistics dictionary to merge per-subreddit results into
+            prefetched: Posts already fetched per subreddit ID
+        """
+        workers = min(self.max_workers, len(subreddits))
+        logger.info(f"Checking with {workers} concurrent workers")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="monitor") as pool:
+            futures = {
+                pool.submit(
+                    self._check_subreddit_isolated,
+                    subreddit.id,
+                    prefetched.get(subreddit.id)
+                ): subreddit.name
+                for subreddit in subreddits
+            }
+            for future in as_completed(futures):
+                stats['total_checked'] += 1
+                try:
+                    stats['total_posts'] += future.result()
+                except Exception as e:
+                    logger.error(f"Error checking r/{futures[future]}: {e}")
+                    stats['errors'] += 1
+
+    def _check_subreddit_isolated(
+        self,
+        subreddit_id: int,
+        prefetched: Optional[List[dict]] = None
+    ) -> int:
+        """
+        Check a subreddit in its own database session (worker pool entry point).
+
+        Args:
+            subreddit_id: Subreddit primary key
+            prefetched: Posts already fetched by a batched listing request
+
+        Returns:
+            Number of new posts processed
+        """
+        session = get_session()
+        try:
+            subreddit = session.get(Subreddit, subreddit_id)
+            if subreddit is None:
+                return 0
+            return self.check_subreddit(subreddit, session, prefetched)
+        finally:
+            session.close()
+
+    def run_once(self, use_pipeline: bool = False) -> dict:
         """
         Run a single monitoring cycle.
 
         Checks all enabled subreddits once and returns.
 
+        Args:
+            use_pipeline: Use the staged asyncio pipeline instead of the
+                          synchronous per-post path
+
         Returns:
             Statistics dictionary
         """
         logger.info("Starting single monitoring cycle...")
-        stats = self.check_all_enabled()
+        self.recover_deliveries()
+        stats = self._run_cycle(use_pipeline)
+
+        dispatched = self.outbox.drain_due()
+        parked = self.delivery.stats()['parked']
+        if dispatched or parked:
+            logger.info(f"Waiting for {dispatched} queued and {parked} rate-limited deliveries...")
+        self.delivery.flush()
         logger.info("Monitoring cycle complete")
         return stats
 
-    def run_daemon(self, interval: int = 300):
+    def _run_cycle(self, use_pipeline: bool, subreddit_ids: Optional[List[int]] = None) -> dict:
+        """
+        Run one cycle with the selected engine.
+
+        Args:
+            use_pipeline: Use the staged asyncio pipeline
+            subreddit_ids: Restrict the cycle to these subreddits (default: all enabled)
+
+        Returns:
+            Statistics dictionary
+        """
+        # Pick up configuration changes (one cheap fingerprint query)
+        self.config.refresh()
+
+        engine_name = 'pipeline' if use_pipeline else 'sequential'
+        profile = self.profiler.cycle() if self.profiler else nullcontext()
+        with CYCLE_SECONDS.time(engine=engine_name), profile:
+            try:
+                if use_pipeline:
+                    engine = PipelineEngine(self, fetch_concurrency=self.max_workers)
+                    stats = engine.run_once(subreddit_ids)
+                else:
+                    stats = self.check_all_enabled(subreddit_ids)
+            finally:
+                # Commit everything still buffered from this cycle
+                self.translation_cache.flush_usage()
+                self.writes.flush()
+        CHECK_ERRORS.inc(stats['errors'])
+
+        writes = self.writes.stats()
+        logger.info(f"Storage: {writes['rows_written']} rows written in {writes['flushes']} transactions")
+        if writes['rows_dropped']:
+            logger.warning(f"Storage: {writes['rows_dropped']} rows dropped because they could not be written")
+
+        cache_stats = self.translation_cache.stats()
+        logger.info(
+            f"Translation cache: {cache_stats['memory_hits'] + cache_stats['db_hits']} hits "
+            f"({cache_stats['db_hits']} from disk), {cache_stats['misses']} misses, "
+            f"hit rate {cache_stats['hit_rate']:.0%}"
+        )
+
+        outbox = self.outbox.stats()
+        for status in ('pending', 'sending', 'delivered', 'failed'):
+            OUTBOX_ENTRIES.set(outbox.get(status, 0), status=status)
+        if outbox.get('pending') or outbox.get('sending') or outbox.get('failed'):
+            logger.info(
+                f"Delivery outbox: {outbox.get('pending', 0)} pending, {outbox.get('sending', 0)} sending, "
+                f"{outbox.get('failed', 0)} failed"
+            )
+
+        delivery = self.delivery.stats()
+        if delivery['deferred']:
+            logger.info(
+                f"Delivery scheduler: {delivery['delivered']} delivered in {delivery['messages']} messages, "
+                f"{delivery['failed']} failed, "
+                f"{delivery['deferred']} deferred by rate limits or retries, {delivery['parked']} waiting"
+            )
+
+        timing = self.webhook_sender.get_timing_stats()
+        if timing['requests']:
+            logger.info(
+                f"Webhook delivery: {timing['requests']} requests, avg {timing['avg_request_ms']:.0f}ms "
+                f"(max {timing['max_request_ms']:.0f}ms); {timing['connections']} new connections, "
+                f"avg setup {timing['avg_connect_ms']:.0f}ms ({timing['connect_share']:.0%} of request time)"
+            )
+        return stats
+
+    def recover_deliveries(self) -> int:
+        """
+        Resume deliveries left unfinished by an earlier run.
+
+        Requeues interrupted and recently failed outbox entries, and retries
+        the translation of posts whose translation failed (up to
+        RECOVERY_MAX_RETRIES attempts) so they can be delivered.
+
+        Returns:
+            Number of posts recovered
+        """
+        try:
+            recovered = self.outbox.recover()
+        except Exception as e:
+            logger.error(f"Could not recover outbox entries: {e}")
+            return 0
+
+        count = recovered['interrupted'] + recovered['revived'] + recovered['enqueued']
+        snapshot = self.config.refresh()
+        if not snapshot.user or not snapshot.webhooks:
+            return count
+
+        session = get_session()
+        try:
+
+            untranslated = (
+                session.query(Post)
+                .filter(
+                    Post.processed == -1,
+                    Post.retry_count < RECOVERY_MAX_RETRIES,
+                    ~Post.translations.any()
+                )
+                .order_by(Post.created_utc.asc())
+                .limit(RECOVERY_BATCH)
+                .all()
+            )
+            if not untranslated:
+                return count
+
+            logger.info(f"Retrying translation of {len(untranslated)} failed posts")
+            translator = self._get_translator()
+            for post in untranslated:
+                try:
+                    translated_title, translated_content, source_lang = self._translate_one(
+                        translator,
+                        {'id': post.id, 'title': post.title, 'content': post.content},
+                        snapshot.user.language
+                    )
+                except Exception as e:
+                    self.writes.update(Post, {
+                        'id': post.id,
+                        'retry_count': post.retry_count + 1,
+                        'error_message': str(e)
+                    })
+                    continue
+
+                self.writes.insert(Translation, [{
+                    'post_id': post.id,
+                    'source_lang': source_lang,
+                    'target_lang': snapshot.user.language,
+                    'translated_title': translated_title,
+                    'translated_content': translated_content
+                }], ignore_conflicts=True)
+                self.writes.update(Post, {'id': post.id, 'processed': 0, 'error_message': None})
+                self.writes.insert(OutboxEntry, self.outbox.entry_rows(post.id, snapshot.webhooks))
+                count += 1
+            self.writes.flush()
+        except Exception as e:
+            logger.error(f"Could not recover failed posts: {e}")
+        finally:
+            session.close()
+
+        return count
+
+    def warm_up_webhooks(self):
+        """Open connections to all enabled webhook destinations before the first delivery."""
+        try:
+            urls = [webhook.webhook_url for webhook in self.config.current().webhooks]
+        except Exception as e:
+            logger.warning(f"Could not load webhooks for warm-up: {e}")
+            return
+
+        if urls:
+            self.webhook_sender.warm_up(urls)
+
+    def _configured_interval(self) -> int:
+        """
+        Get the poll interval from UserConfig in seconds.
+
+        Returns:
+            Interval in seconds (default: 300 if not configured)
+        """
+        user = self.config.current().user
+        if user and user.poll_interval_minutes:
+            return user.poll_interval_minutes * 60
+        return 300
+
+    def run_daemon(
+        self,
+        interval: Optional[int] = None,
+        use_pipeline: bool = False,
+        adaptive: bool = False,
+        min_interval: int = 60,
+        max_interval: int = 3600
+    ):
         """
         Run monitoring in daemon mode (continuous loop).
 
-        Checks subreddits at regular intervals until interrupted.
+        Checks subreddits at regular intervals until interrupted. In adaptive
+        mode each subreddit gets its own schedule based on its post rate.
 
         Args:
-            interval: Check interval in seconds (default: 300 = 5 minutes)
+            interval: Check interval in seconds (default: UserConfig poll_interval)
+            use_pipeline: Use the staged asyncio pipeline for each cycle
+            adaptive: Schedule each subreddit by its observed post rate
+            min_interval: Shortest per-subreddit interval in adaptive mode (seconds)
+            max_interval: Longest per-subreddit interval in adaptive mode (seconds)
         """
-        logger.info(f"Starting daemon mode with {interval}s interval...")
+        # Without an explicit interval, follow poll_interval changes made with `config set`
+        follow_config = interval is None
+        if follow_config:
+            interval = self._configured_interval()
+
+        mode = "pipeline" if use_pipeline else "sequential"
+        if adaptive:
+            logger.info(
+                f"Starting daemon mode with adaptive scheduling "
+                f"({min_interval}-{max_interval}s, base {interval}s, {mode})..."
+            )
+        else:
+            logger.info(f"Starting daemon mode with {interval}s interval ({mode})...")
+
+        try:
+            self.preload_seen_ids()
+        except Exception as e:
+            logger.warning(f"Could not preload seen post IDs: {e}")
+
+        self.warm_up_webhooks()
+        self.recover_deliveries()
+        self.outbox.start()
+        self.compactor.start()
 
         try:
-            while True:
+            if adaptive:
+                scheduler = PollScheduler(interval, min_interval, max_interval)
+                self._run_adaptive_loop(scheduler, use_pipeline)
+            else:
+                while True:
+                    try:
+                        logger.info("Running monitoring cycle...")
+                        stats = self._run_cycle(use_pipeline)
+                        logger.info(
+                            f"Cycle complete: {stats['total_posts']} posts, "
+                            f"{stats['errors']} errors"
+                        )
+                    except Exception as e:
+                        logger.error(f"Error in monitoring cycle: {e}")
+
+                    if follow_config:
+                        interval = self._configured_interval()
+                    logger.info(f"Sleeping for {interval} seconds...")
+                    time.sleep(interval)
+
+        except KeyboardInterrupt:
+            logger.info("Daemon stopped by user")
+            raise
+        finally:
+            # Undelivered entries stay in the outbox for the next start
+            self.outbox.stop(timeout=5)
+            self.compactor.stop(timeout=5)
+
+    def _run_adaptive_loop(self, scheduler: PollScheduler, use_pipeline: bool):
+        """
+        Poll subreddits as they come due on the scheduler (runs until interrupted).
+
+        Each tick picks up newly enabled subreddits, checks the due ones (most
+        overdue first, at most one rate-limiter window's worth), and reschedules
+        them from their updated post velocity.
+
+        Args:
+            scheduler: Poll scheduler
+            use_pipeline: Use the staged asyncio pipeline for each batch
+        """
+        while True:
+            session = get_session()
+            try:
+                scheduler.sync(session.query(Subreddit).filter_by(enabled=1).all())
+            finally:
+                session.close()
+
+            # One minute of requests at the rate limiter's current rate, which
+            # follows the budget Reddit reports
+            budget = max(1, int(self.reddit_client.rate_limiter.requests_per_minute))
+            due = scheduler.pop_due(limit=budget)
+            if due:
                 try:
-                    logger.info("Running monitoring cycle...")
-                    stats = self.check_all_enabled()
+                    logger.info(f"Checking {len(due)} due subreddit(s)...")
+                    stats = self._run_cycle(use_pipeline, due)
                     logger.info(
-                        f"Cycle complete: {stats['total_posts']} posts, "
+                        f"Batch complete: {stats['total_posts']} posts, "
                         f"{stats['errors']} errors"
                     )
                 except Exception as e:
                     logger.error(f"Error in monitoring cycle: {e}")
 
-                logger.info(f"Sleeping for {interval} seconds...")
-                time.sleep(interval)
+                session = get_session()
+                try:
+                    for subreddit in session.query(Subreddit).filter(Subreddit.id.in_(due)).all():
+                        scheduler.reschedule(subreddit)
+                finally:
+                    session.close()
 
-        except KeyboardInterrupt:
-            logger.info("Daemon stopped by user")
-            raise
+            wait = scheduler.next_due_in()
+            # Wake up periodically to pick up newly added subreddits
+            wait = ADAPTIVE_MAX_SLEEP if wait is None else min(wait, ADAPTIVE_MAX_SLEEP)
+            if wait > 0:
+                logger.debug("Next subreddit due in %.0fs", wait)
+                time.sleep(wait)
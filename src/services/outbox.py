@@ -0,0 +1,396 @@
+"""
+Durable webhook delivery outbox.
+
+Deliveries are recorded as outbox rows in the same transaction as the post's
+translation (the monitor's write buffer inserts all three together). A
+background worker drains due rows through the delivery scheduler
+independently of polling, retries failed deliveries with exponential
+backoff, and deliveries interrupted by a crash are resumed at startup.
+"""
+
+from datetime import datetime, timedelta
+from functools import partial
+from threading import Event, Thread
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from models import OutboxEntry, Post
+from services.config_cache import ConfigCache, WebhookTarget
+from services.delivery_scheduler import DeliveryJob, DeliveryScheduler
+from storage.database import get_session
+from lib.logger import get_logger
+from lib.metrics import LATENCY_BUCKETS, counter, histogram
+
+logger = get_logger("outbox")
+
+OUTCOMES = counter('outbox_outcomes_total', 'Outbox delivery outcomes', ('outcome',))
+QUEUED_SECONDS = histogram(
+    'outbox_delivery_seconds', 'Time from queueing a delivery to its acceptance by the webhook',
+    buckets=LATENCY_BUCKETS
+)
+END_TO_END_SECONDS = histogram(
+    'post_end_to_end_seconds', 'Time from post creation on Reddit until delivered to every webhook',
+    buckets=LATENCY_BUCKETS
+)
+
+
+class DeliveryOutbox:
+    """
+    Outbox table of webhook deliveries plus the worker that drains it.
+
+    An entry is 'pending' until the worker claims it ('sending') and hands it
+    to the delivery scheduler. The scheduler's outcome marks it 'delivered',
+    or puts it back to 'pending' with a later next_attempt_at. After
+    max_attempts failures it is 'failed'.
+    """
+
+    def __init__(
+        self,
+        delivery: DeliveryScheduler,
+        config: ConfigCache,
+        batch_size: int = 100,
+        poll_interval: float = 5.0,
+        max_attempts: int = 8,
+        base_backoff: float = 30,
+        max_backoff: float = 3600,
+        recover_failed_days: int = 7
+    ):
+        """
+        Initialize outbox.
+
+        Args:
+            delivery: Delivery scheduler that sends the messages
+            config: Configuration snapshot providing the enabled webhooks
+            batch_size: Entries claimed per worker pass
+            poll_interval: Longest worker sleep between passes (seconds)
+            max_attempts: Failed deliveries before an entry is given up
+            base_backoff: Delay before the first retry (seconds, doubles per attempt)
+            max_backoff: Longest delay between retries (seconds)
+            recover_failed_days: Given-up entries and never-queued posts younger than this
+                                 are retried at startup
+        """
+        self.delivery = delivery
+        self.config = config
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.recover_failed_days = recover_failed_days
+
+        self._wakeup = Event()
+        self._stopping = Event()
+        self._thread: Optional[Thread] = None
+
+    def enqueue(self, session: Session, post_id: str, webhooks: List[WebhookTarget]):
+        """
+        Add deliveries of a post to the outbox (committed by the caller).
+
+        Args:
+            session: Database session holding the post's transaction
+            post_id: Reddit post ID
+            webhooks: Destinations to deliver to
+        """
+        for row in self.entry_rows(post_id, webhooks):
+            session.add(OutboxEntry(**row))
+
+    @staticmethod
+    def entry_rows(post_id: str, webhooks: List[WebhookTarget]) -> List[dict]:
+        """
+        Build the outbox rows for delivering a post, for bulk insertion.
+
+        Args:
+            post_id: Reddit post ID
+            webhooks: Destinations to deliver to
+
+        Returns:
+            List of OutboxEntry column dictionaries
+        """
+        now = datetime.utcnow()
+        return [
+            {'post_id': post_id, 'webhook_id': webhook.id, 'status': 'pending', 'next_attempt_at': now}
+            for webhook in webhooks
+        ]
+
+    def wake(self):
+        """Make the worker check for due entries now."""
+        self._wakeup.set()
+
+    def start(self):
+        """Start the background worker thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="delivery-outbox", daemon=True)
+        self._thread.start()
+        logger.info("Delivery outbox worker started")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background worker thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the worker to exit
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain_due(self) -> int:
+        """
+        Hand every currently due entry to the delivery scheduler.
+
+        Returns:
+            Number of entries dispatched
+        """
+        total = 0
+        while True:
+            dispatched = self.drain_once()
+            total += dispatched
+            if dispatched < self.batch_size:
+                return total
+
+    def drain_once(self) -> int:
+        """
+        Claim up to batch_size due entries and hand them to the delivery scheduler.
+
+        Entries fan out to their destinations concurrently; each post's payload
+        is built once per platform and shared by all destinations of that type.
+
+        Returns:
+            Number of entries dispatched
+        """
+        session = get_session()
+        try:
+            entries = (
+                session.query(OutboxEntry)
+                .options(
+                    joinedload(OutboxEntry.post).selectinload(Post.translations),
+                    joinedload(OutboxEntry.webhook)
+                )
+                .filter(
+                    OutboxEntry.status == 'pending',
+                    OutboxEntry.next_attempt_at <= datetime.utcnow()
+                )
+                .order_by(OutboxEntry.next_attempt_at, OutboxEntry.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            if not entries:
+                return 0
+
+            jobs = []
+            payloads = {}  # (post_id, webhook type) -> payload
+            for entry in entries:
+                job = self._build_job(entry, payloads)
+                if job is None:
+                    entry.status = 'failed'
+                    continue
+                entry.status = 'sending'
+                jobs.append(job)
+            session.commit()
+        except Exception as e:
+            logger.error(f"Failed to claim outbox entries: {e}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
+        self.delivery.submit_all(jobs)
+        return len(entries)
+
+    def recover(self) -> dict:
+        """
+        Resume deliveries interrupted by a crash and retry recently given-up ones.
+
+        Also enqueues translated posts that never reached the outbox (for
+        example, posts stored before it existed) and are not yet delivered.
+        Both look back recover_failed_days only, so old posts are not sent
+        long after the fact.
+
+        Returns:
+            Dictionary with interrupted, revived and enqueued counts
+        """
+        session = get_session()
+        try:
+            now = datetime.utcnow()
+            cutoff = now - timedelta(days=self.recover_failed_days)
+            interrupted = (
+                session.query(OutboxEntry)
+                .filter(OutboxEntry.status == 'sending')
+                .update({'status': 'pending'}, synchronize_session=False)
+            )
+            revived = (
+                session.query(OutboxEntry)
+                .filter(
+                    OutboxEntry.status == 'failed',
+                    OutboxEntry.created_at >= cutoff
+                )
+                .update({'status': 'pending', 'attempts': 0, 'next_attempt_at': now}, synchronize_session=False)
+            )
+
+            enqueued = 0
+            webhooks = self.config.current().webhooks
+            if webhooks:
+                orphans = (
+                    session.query(Post.id)
+                    .filter(
+                        Post.processed != 1,
+                        Post.created_utc >= cutoff,
+                        Post.translations.any(),
+                        ~Post.id.in_(session.query(OutboxEntry.post_id))
+                    )
+                    .all()
+                )
+                for (post_id,) in orphans:
+                    self.enqueue(session, post_id, webhooks)
+                enqueued = len(orphans)
+
+            session.commit()
+        finally:
+            session.close()
+
+        if interrupted or revived or enqueued:
+            logger.info(
+                f"Recovered deliveries: {interrupted} interrupted, {revived} previously failed, "
+                f"{enqueued} never queued"
+            )
+            self.wake()
+        return {'interrupted': interrupted, 'revived': revived, 'enqueued': enqueued}
+
+    def stats(self) -> dict:
+        """
+        Count outbox entries by status.
+
+        Returns:
+            Dictionary mapping status to entry count
+        """
+        session = get_session()
+        try:
+            rows = session.query(OutboxEntry.status, func.count(OutboxEntry.id)).group_by(OutboxEntry.status).all()
+            return {status: count for status, count in rows}
+        finally:
+            session.close()
+
+    def _run(self):
+        """Worker loop: drain due entries, then sleep until woken or the poll interval passes."""
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                dispatched = self.drain_due()
+                if dispatched:
+                    logger.debug(f"Dispatched {dispatched} outbox entries")
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+            self._wakeup.wait(self.poll_interval)
+
+    def _build_job(self, entry: OutboxEntry, payloads: dict) -> Optional[DeliveryJob]:
+        """
+        Build the delivery job for an entry, or None if it can no longer be delivered.
+
+        Args:
+            entry: Outbox entry with its post and webhook loaded
+            payloads: Payloads built so far in this pass, keyed by (post_id, webhook type)
+        """
+        webhook = entry.webhook
+        if webhook is None or not webhook.enabled:
+            entry.last_error = "Webhook removed or disabled"
+            return None
+
+        translation = entry.post.translations[-1] if entry.post.translations else None
+        if translation is None:
+            entry.last_error = "Post has no translation"
+            return None
+
+        key = (entry.post_id, webhook.type)
+        payload = payloads.get(key)
+        if payload is None:
+            payload = self.delivery.sender.build_payload(
+                webhook.type,
+                translation.translated_title,
+                translation.translated_content or '',
+                entry.post.url,
+                entry.post.author
+            )
+            payloads[key] = payload
+
+        return DeliveryJob(
+            webhook.webhook_url,
+            webhook.type,
+            payload,
+            on_complete=partial(self._on_complete, entry.id),
+            description=f"post {entry.post_id} → {webhook.type} #{webhook.id}"
+        )
+
+    def _on_complete(self, entry_id: int, success: bool, error: Optional[str] = None):
+        """
+        Record the outcome of an entry's delivery (called by the delivery scheduler).
+
+        Args:
+            entry_id: Outbox entry ID
+            success: Whether the webhook accepted the message
+            error: Failure description
+        """
+        session = get_session()
+        try:
+            entry = session.get(OutboxEntry, entry_id)
+            if entry is None:
+                return
+            post = entry.post
+            now = datetime.utcnow()
+
+            if success:
+                entry.status = 'delivered'
+                entry.delivered_at = now
+                entry.last_error = None
+                session.flush()
+                OUTCOMES.inc(outcome='delivered')
+                QUEUED_SECONDS.observe((now - entry.created_at).total_seconds())
+
+                undelivered = (
+                    session.query(OutboxEntry)
+                    .filter(OutboxEntry.post_id == post.id, OutboxEntry.status != 'delivered')
+                    .count()
+                )
+                if not undelivered:
+                    post.processed = 1
+                    post.processed_at = now
+                    post.error_message = None
+                    END_TO_END_SECONDS.observe((now - post.created_utc).total_seconds())
+                    logger.info(f"✓ Post {post.id} processed successfully", extra={'post_id': post.id})
+            else:
+                destination = entry.webhook.type if entry.webhook else 'webhook'
+                message = f"{destination} delivery failed: {error}" if error else f"{destination} delivery failed"
+                entry.attempts += 1
+                entry.last_error = message[:1000]
+                post.processed = -1
+                post.retry_count += 1
+                post.error_message = message[:1000]
+
+                if entry.attempts >= self.max_attempts:
+                    entry.status = 'failed'
+                    OUTCOMES.inc(outcome='failed')
+                    logger.error(
+                        f"✗ Post {post.id} {destination} delivery failed after {entry.attempts} attempts, giving up",
+                        extra={'post_id': post.id}
+                    )
+                else:
+                    delay = min(self.max_backoff, self.base_backoff * 2 ** (entry.attempts - 1))
+                    entry.status = 'pending'
+                    entry.next_attempt_at = now + timedelta(seconds=delay)
+                    OUTCOMES.inc(outcome='retry')
+                    logger.warning(
+                        f"✗ Post {post.id} {destination} delivery failed, retrying in {delay:.0f}s",
+                        extra={'post_id': post.id}
+                    )
+
+            session.commit()
+        except Exception as e:
+            logger.error(f"Failed to record delivery of outbox entry {entry_id}: {e}")
+            session.rollback()
+        finally:
+            session.close()
@@ -0,0 +1,310 @@
+"""
+Staged asyncio pipeline for the monitoring cycle.
+
+Runs fetching, translation, and delivery as independent stages connected by
+bounded queues, so a slow translator no longer stalls Reddit polling and vice versa.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from models import Subreddit
+from storage.database import get_session, reserve_connections
+from lib.logger import get_logger, log_context
+from lib.metrics import gauge
+
+logger = get_logger("pipeline")
+
+QUEUE_DEPTH = gauge('pipeline_queue_depth', 'Items waiting between pipeline stages', ('queue',))
+
+# Marks the end of a stage's input
+_DONE = None
+
+# Default stage concurrency of the translate and deliver stages
+TRANSLATE_CONCURRENCY = 4
+DELIVER_CONCURRENCY = 4
+
+
+class PipelineEngine:
+    """
+    Asyncio engine running fetch → translate → deliver stages.
+
+    Each stage has its own worker count; the queues between stages are bounded,
+    so a slow downstream stage applies back-pressure to the stages feeding it.
+    The blocking service calls (PRAW, translators, webhooks, SQLAlchemy) run in
+    a dedicated thread pool sized to the total stage concurrency.
+    """
+
+    def __init__(
+        self,
+        monitor,
+        fetch_concurrency: int = 2,
+        translate_concurrency: int = TRANSLATE_CONCURRENCY,
+        deliver_concurrency: int = DELIVER_CONCURRENCY,
+        queue_size: int = 100
+    ):
+        """
+        Initialize pipeline engine.
+
+        Args:
+            monitor: Monitor instance providing the service clients and stage logic
+            fetch_concurrency: Number of concurrent subreddit fetches
+            translate_concurrency: Number of concurrent translations
+            deliver_concurrency: Number of concurrent store-and-deliver workers
+            queue_size: Capacity of each inter-stage queue
+        """
+        self.monitor = monitor
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.translate_concurrency = max(1, translate_concurrency)
+        self.deliver_concurrency = max(1, deliver_concurrency)
+        self.queue_size = max(1, queue_size)
+        reserve_connections(self.fetch_concurrency + self.translate_concurrency + self.deliver_concurrency)
+
+    def run_once(self, subreddit_ids: Optional[List[int]] = None) -> dict:
+        """
+        Run one monitoring cycle through the pipeline.
+
+        Args:
+            subreddit_ids: Restrict the cycle to these subreddits (default: all enabled)
+
+        Returns:
+            Statistics dictionary (same keys as Monitor.check_all_enabled)
+        """
+        return asyncio.run(self._run(subreddit_ids))
+
+    async def _run(self, only_ids: Optional[List[int]] = None) -> dict:
+        """Set up queues and stage workers, then wait for the cycle to drain."""
+        stats = {
+            'total_checked': 0,
+            'total_posts': 0,
+            'errors': 0
+        }
+        cursor_updates = []
+
+        subreddit_ids, target_lang = self._load_cycle_inputs(only_ids)
+        if not subreddit_ids:
+            logger.warning("No enabled subreddits found")
+            return stats
+        if target_lang is None:
+            logger.error("No user config found")
+            stats['errors'] += 1
+            return stats
+
+        logger.info(
+            f"Pipeline checking {len(subreddit_ids)} subreddit(s) "
+            f"(fetch={self.fetch_concurrency}, translate={self.translate_concurrency}, "
+            f"deliver={self.deliver_concurrency})"
+        )
+
+        fetch_queue: asyncio.Queue = asyncio.Queue()
+        translate_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        deliver_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        queues = {'fetch': fetch_queue, 'translate': translate_queue, 'deliver': deliver_queue}
+        for name, queue in queues.items():
+            QUEUE_DEPTH.set_function(queue.qsize, queue=name)
+
+        # Fetch work is chunked so each chunk can use one combined listing request
+        chunk_size = self.monitor.fetch_batch_size
+        for start in range(0, len(subreddit_ids), chunk_size):
+            fetch_queue.put_nowait(subreddit_ids[start:start + chunk_size])
+
+        total_workers = self.fetch_concurrency + self.translate_concurrency + self.deliver_concurrency
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=total_workers, thread_name_prefix="pipeline") as executor:
+            def run_blocking(func, *args):
+                return loop.run_in_executor(executor, func, *args)
+
+            fetchers = [
+                asyncio.create_task(self._fetch_worker(fetch_queue, translate_queue, stats, cursor_updates, run_blocking))
+                for _ in range(self.fetch_concurrency)
+            ]
+            translators = [
+                asyncio.create_task(self._translate_worker(translate_queue, deliver_queue, target_lang, run_blocking))
+                for _ in range(self.translate_concurrency)
+            ]
+            deliverers = [
+                asyncio.create_task(self._deliver_worker(deliver_queue, stats, run_blocking))
+                for _ in range(self.deliver_concurrency)
+            ]
+
+            # Drain stage by stage, signalling the end of input downstream
+            await asyncio.gather(*fetchers)
+            for _ in translators:
+                await translate_queue.put(_DONE)
+            await asyncio.gather(*translators)
+            for _ in deliverers:
+                await deliver_queue.put(_DONE)
+            await asyncio.gather(*deliverers)
+
+        for name in queues:
+            QUEUE_DEPTH.set_function(None, queue=name)
+            QUEUE_DEPTH.set(0, queue=name)
+
+        # Advance the fetch cursors only once every fetched post is queued for storage
+        for values in cursor_updates:
+            self.monitor.writes.update(Subreddit, values)
+
+        logger.info(
+            f"Pipeline complete: {stats['total_posts']} posts processed, "
+            f"{stats['errors']} errors"
+        )
+        return stats
+
+    def _load_cycle_inputs(self, only_ids: Optional[List[int]] = None) -> Tuple[List[int], Optional[str]]:
+        """
+        Load enabled subreddit IDs and target language for this cycle.
+
+        Args:
+            only_ids: Restrict to these subreddit IDs (default: all enabled)
+
+        Returns:
+            Tuple of (subreddit_ids, target_lang or None if not configured)
+        """
+        session = get_session()
+        try:
+            query = session.query(Subreddit.id).filter_by(enabled=1)
+            if only_ids is not None:
+                query = query.filter(Subreddit.id.in_(only_ids))
+            subreddit_ids = [row[0] for row in query.all()]
+            user = self.monitor.config.current().user
+            return subreddit_ids, (user.language if user else None)
+        finally:
+            session.close()
+
+    async def _fetch_worker(self, fetch_queue, translate_queue, stats, cursor_updates, run_blocking):
+        """Fetch stage: poll subreddits, push unseen posts downstream and collect cursor updates."""
+        while True:
+            try:
+                subreddit_ids = fetch_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            stats['total_checked'] += len(subreddit_ids)
+            try:
+                results, updates, failed = await run_blocking(self._fetch_subreddits, subreddit_ids)
+            except Exception as e:
+                logger.error(f"Fetch stage failed for {len(subreddit_ids)} subreddit(s): {e}")
+                stats['errors'] += len(subreddit_ids)
+                continue
+
+            stats['errors'] += failed
+            cursor_updates.extend(updates)
+            for subreddit_id, posts in results:
+                if posts:
+                    await translate_queue.put((subreddit_id, posts))
+
+    async def _translate_worker(self, translate_queue, deliver_queue, target_lang, run_blocking):
+        """Translate stage: batch-translate each subreddit's posts and pass results (or errors) on."""
+        translator = None
+        while True:
+            item = await translate_queue.get()
+            if item is _DONE:
+                return
+
+            subreddit_id, posts = item
+            try:
+                if translator is None:
+                    translator = await run_blocking(self.monitor._get_translator)
+                translations = await run_blocking(
+                    self.monitor._translate_many, translator, posts, target_lang
+                )
+            except Exception as e:
+                translations = await self._translate_individually(
+                    translator, posts, target_lang, e, run_blocking
+                )
+
+            for post_data, translated in zip(posts, translations):
+                await deliver_queue.put((subreddit_id, post_data, translated))
+
+    async def _translate_individually(self, translator, posts, target_lang, batch_error, run_blocking):
+        """Fallback after a failed batch: translate posts one by one, keeping per-post errors."""
+        if translator is None:
+            logger.error(f"Translate stage failed for {len(posts)} posts: {batch_error}")
+            return [batch_error] * len(posts)
+
+        logger.warning(f"Batch translation failed, translating {len(posts)} posts individually: {batch_error}")
+        translations = []
+        for post_data in posts:
+            try:
+                translations.append(await run_blocking(
+                    self.monitor._translate_one, translator, post_data, target_lang
+                ))
+            except Exception as e:
+                logger.error(f"Translate stage failed for post {post_data['id']}: {e}", extra={'post_id': post_data['id']})
+                translations.append(e)
+        return translations
+
+    async def _deliver_worker(self, deliver_queue, stats, run_blocking):
+        """Deliver stage: queue the post for storage and webhook delivery."""
+        while True:
+            item = await deliver_queue.get()
+            if item is _DONE:
+                return
+
+            subreddit_id, post_data, translated = item
+            try:
+                if await run_blocking(self._store_and_deliver, subreddit_id, post_data, translated):
+                    stats['total_posts'] += 1
+            except Exception as e:
+                logger.error(f"Deliver stage failed for post {post_data['id']}: {e}", extra={'post_id': post_data['id']})
+                stats['errors'] += 1
+
+    def _fetch_subreddits(self, subreddit_ids: List[int]) -> Tuple[List[Tuple[int, List[dict]]], List[dict], int]:
+        """
+        Fetch unseen posts for a chunk of subreddits (runs in a worker thread).
+
+        The chunk is fetched with combined listing requests where possible. The
+        cursor updates are returned rather than written, so they can be queued
+        after the subreddits' posts.
+
+        Args:
+            subreddit_ids: Subreddit primary keys
+
+        Returns:
+            Tuple of (list of (subreddit_id, unseen posts), Subreddit cursor
+            updates, number of failed subreddits)
+        """
+        session = get_session()
+        try:
+            subreddits = session.query(Subreddit).filter(Subreddit.id.in_(subreddit_ids)).all()
+            prefetched = self.monitor.prefetch_posts(subreddits)
+
+            results = []
+            updates = []
+            failed = 0
+            for subreddit in subreddits:
+                with log_context(subreddit=subreddit.name):
+                    try:
+                        posts = self.monitor._fetch_new_posts(
+                            subreddit, session, prefetched.get(subreddit.id)
+                        )
+                    except Exception as e:
+                        logger.error(f"Error fetching r/{subreddit.name}: {e}")
+                        session.rollback()
+                        failed += 1
+                        continue
+
+                    updates.append(self.monitor._cursor_update(subreddit, posts))
+
+                    logger.info(f"r/{subreddit.name}: {len(posts)} new posts queued")
+                    results.append((subreddit.id, posts))
+
+            return results, updates, failed
+        finally:
+            session.close()
+
+    def _store_and_deliver(self, subreddit_id: int, post_data: dict, translated) -> bool:
+        """
+        Queue a translated post for storage and delivery (runs in a worker thread).
+
+        Args:
+            subreddit_id: Subreddit primary key
+            post_data: Post dictionary from the fetch stage
+            translated: translate_post result or the exception it raised
+
+        Returns:
+            True if processed successfully, False otherwise
+        """
+        return self.monitor._process_post(post_data, subreddit_id, translated=translated)
@@ -5,14 +5,23 @@ Handles authentication, rate limiting, and fetching new posts from subreddits.
 """
 
 import os
-import praw
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from lib.logger import get_logger
+from lib.metrics import counter, histogram
 from lib.rate_limiter import RateLimiter
 
+if TYPE_CHECKING:
+    import praw
+
 logger = get_logger("reddit_client")
 
+REQUESTS = counter('reddit_requests_total', 'Reddit listing requests', ('kind', 'outcome'))
+REQUEST_SECONDS = histogram('reddit_request_seconds', 'Reddit listing request latency', ('kind',))
+POSTS_FETCHED = counter('reddit_posts_fetched_total', 'Posts returned by Reddit listings newer than the cursor')
+
 
 class RedditClient:
     """
@@ -32,28 +41,80 @@ class RedditClient:
                 "Please set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET environment variables."
             )
 
-        self.reddit = praw.Reddit(
-            client_id=client_id,
-            client_secret=client_secret,
-            user_agent='reddit-deliver/0.1.0 (monitoring bot)'
-        )
+        self._client_id = client_id
+        self._client_secret = client_secret
+
+        # PRAW instances are not thread-safe, so each worker thread gets its own
+        self._local = threading.local()
 
-        # Rate limiter: Reddit allows 60 requests per minute with OAuth
-        self.rate_limiter = RateLimiter(requests_per_minute=60)
+        # Rate limiter: starts at 60 requests per minute, then follows the
+        # budget Reddit reports in the X-Ratelimit headers of each response.
+        # Shared by all threads so concurrent workers stay within the quota.
+        self.rate_limiter = RateLimiter(requests_per_minute=60, name='reddit')
 
         logger.info("Reddit client initialized")
 
-    def get_new_posts(self, subreddit_name: str, limit: int = 25, since: Optional[datetime] = None) -> List[dict]:
+    @property
+    def reddit(self) -> 'praw.Reddit':
+        """PRAW instance for the calling thread (created on first use)."""
+        reddit = getattr(self._local, 'reddit', None)
+        if reddit is None:
+            # PRAW is slow to import, so it is loaded on first use
+            import praw
+            import requests
+            session = requests.Session()
+            session.hooks['response'].append(self._sync_rate_limit)
+            reddit = praw.Reddit(
+                client_id=self._client_id,
+                client_secret=self._client_secret,
+                user_agent='reddit-deliver/0.1.0 (monitoring bot)',
+                requestor_kwargs={'session': session}
+            )
+            self._local.reddit = reddit
+        return reddit
+
+    def _sync_rate_limit(self, response, *args, **kwargs):
+        """Response hook: sync the rate limiter from Reddit's X-Ratelimit headers."""
+        remaining = response.headers.get('x-ratelimit-remaining')
+        reset = response.headers.get('x-ratelimit-reset')
+        if remaining is None or reset is None:
+            # Token requests don't count against the quota and carry no headers
+            return
+        try:
+            self.rate_limiter.sync(float(remaining), float(reset))
+        except ValueError:
+            logger.debug("Ignoring malformed rate limit headers (remaining=%r, reset=%r)", remaining, reset)
+
+    def get_new_posts(
+        self,
+        subreddit_name: str,
+        limit: int = 25,
+        since: Optional[datetime] = None,
+        before: Optional[str] = None,
+        max_pages: int = 10
+    ) -> List[dict]:
         """
         Fetch new posts from a subreddit.
 
+        Without a cursor, a single listing of ``limit`` posts is fetched and
+        filtered by ``since``. With a ``before`` cursor, listing pages of
+        ``limit`` posts are walked newest first until the cursor post is
+        reached, so busy subreddits don't drop posts between checks.
+
         Args:
             subreddit_name: Name of subreddit (e.g., 'ClaudeAI')
-            limit: Maximum number of posts to fetch (default: 25)
-            since: Only return posts newer than this timestamp (optional)
+            limit: Listing page size (default: 25)
+            since: Only return posts not older than this timestamp (optional).
+                   With a cursor, this should be the cursor post's Reddit
+                   creation time; it stops paging if the cursor post was deleted.
+                   Posts from the cutoff's own second are kept, since Reddit
+                   timestamps have one-second resolution; the caller drops
+                   the ones it has already seen.
+            before: Fullname of the newest post already seen (e.g. 't3_abc123')
+            max_pages: Maximum pages to walk when following a cursor (default: 10)
 
         Returns:
-            List of post dictionaries with keys:
+            List of post dictionaries (newest first) with keys:
                 - id: Reddit post ID
                 - title: Post title
                 - content: Post selftext (may be empty)
@@ -64,47 +125,268 @@ class RedditClient:
         Raises:
             Exception: If subreddit doesn't exist or API error occurs
         """
-        self.rate_limiter.wait_if_needed()
-
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
             posts = []
 
-            if since:
-                logger.debug(f"Fetching posts from r/{subreddit_name} since {since} (limit={limit})")
+            if before:
+                logger.debug("Fetching posts from r/%s before cursor %s (page size=%d)", subreddit_name, before, limit)
+            elif since:
+                logger.debug("Fetching posts from r/%s since %s (limit=%d)", subreddit_name, since, limit)
             else:
-                logger.debug(f"Fetching new posts from r/{subreddit_name} (limit={limit})")
+                logger.debug("Fetching new posts from r/%s (limit=%d)", subreddit_name, limit)
 
             total_checked = 0
-            for submission in subreddit.new(limit=limit):
-                total_checked += 1
-                # Convert timestamp
-                created_utc = datetime.utcfromtimestamp(submission.created_utc)
+            pages = 0
+            after = None
+            reached_cursor = False
 
-                # Filter by timestamp if provided
-                if since and created_utc <= since:
-                    logger.debug(f"Skipping post {submission.id} (created {created_utc}, cutoff {since})")
-                    continue
+            while pages < (max_pages if before else 1):
+                page = self._fetch_page(subreddit, 'subreddit', limit, after)
+                pages += 1
+
+                for submission in page:
+                    total_checked += 1
+                    if before and submission.fullname == before:
+                        reached_cursor = True
+                        break
+
+                    # Convert timestamp
+                    created_utc = datetime.utcfromtimestamp(submission.created_utc)
+
+                    # Filter by timestamp if provided
+                    if since and created_utc < since:
+                        if before:
+                            reached_cursor = True
+                            break
+                        logger.debug(
+                            "Skipping post %s (created %s, cutoff %s)", submission.id, created_utc, since,
+                            extra={'subreddit': subreddit_name, 'post_id': submission.id}
+                        )
+                        continue
 
-                post_data = {
-                    'id': submission.id,
-                    'title': submission.title,
-                    'content': submission.selftext or '',  # Empty string for link posts
-                    'author': str(submission.author) if submission.author else '[deleted]',
-                    'url': f"https://www.reddit.com{submission.permalink}",
-                    'created_utc': created_utc
-                }
+                    posts.append(self._to_post_data(submission, created_utc))
+                    logger.debug(
+                        "Found new post: %s - %.50s", submission.id, submission.title,
+                        extra={'subreddit': subreddit_name, 'post_id': submission.id}
+                    )
 
-                posts.append(post_data)
-                logger.debug(f"Found new post: {submission.id} - {submission.title[:50]}")
+                if reached_cursor or len(page) < limit:
+                    break
+                after = page[-1].fullname
 
-            logger.info(f"Fetched {len(posts)} new posts from r/{subreddit_name} (checked {total_checked} total)")
+            if before and not reached_cursor and pages >= max_pages:
+                logger.warning(
+                    f"r/{subreddit_name}: cursor not reached after {pages} pages, "
+                    f"older posts may have been missed"
+                )
+
+            POSTS_FETCHED.inc(len(posts))
+            logger.info(
+                f"Fetched {len(posts)} new posts from r/{subreddit_name} "
+                f"(checked {total_checked} total in {pages} request(s))",
+                extra={'subreddit': subreddit_name}
+            )
             return posts
 
         except Exception as e:
             logger.error(f"Error fetching posts from r/{subreddit_name}: {e}")
             raise
 
+    def get_new_posts_batch(
+        self,
+        subreddit_names: List[str],
+        since: Optional[Dict[str, Optional[datetime]]] = None,
+        before: Optional[Dict[str, Optional[str]]] = None,
+        page_sizes: Optional[Dict[str, int]] = None,
+        batch_size: int = 25,
+        max_pages: int = 5
+    ) -> Dict[str, List[dict]]:
+        """
+        Fetch new posts for many subreddits using combined listings (r/a+b+c/new).
+
+        Subreddits are grouped into multireddit requests of ``batch_size`` names;
+        results are split back out per subreddit. Subreddits without a ``since``
+        cutoff (first check) are fetched individually, since a combined listing
+        has no natural stopping point for them. If a combined request fails, its
+        subreddits are retried one by one, as are subreddits whose cursor the
+        combined listing didn't reach within ``max_pages``.
+
+        Args:
+            subreddit_names: Names of subreddits to fetch
+            since: Per-subreddit cutoff timestamps (name -> datetime or None)
+            before: Per-subreddit cursor fullnames (name -> fullname or None)
+            page_sizes: Per-subreddit listing sizes (name -> size, default 25).
+                        A combined request uses the sum for its chunk, capped at 100.
+            batch_size: Subreddits per combined listing request (default: 25)
+            max_pages: Maximum listing pages per combined request (default: 5)
+
+        Returns:
+            Dictionary mapping subreddit name to list of post dictionaries
+            (same keys as get_new_posts). Subreddits that could not be fetched
+            are omitted.
+        """
+        since = since or {}
+        before = before or {}
+        page_sizes = page_sizes or {}
+        results: Dict[str, List[dict]] = {}
+
+        batched = [name for name in subreddit_names if since.get(name)]
+        individual = [name for name in subreddit_names if not since.get(name)]
+
+        for start in range(0, len(batched), batch_size):
+            chunk = batched[start:start + batch_size]
+            page_size = min(100, sum(page_sizes.get(name, 25) for name in chunk))
+            try:
+                posts, behind = self._fetch_multireddit(chunk, since, before, page_size, max_pages)
+            except Exception as e:
+                logger.warning(f"Combined listing failed for {len(chunk)} subreddits ({e}), fetching individually")
+                individual.extend(chunk)
+                continue
+            results.update(posts)
+            individual.extend(behind)
+
+        for name in individual:
+            try:
+                results[name] = self.get_new_posts(
+                    name,
+                    limit=page_sizes.get(name, 25),
+                    since=since.get(name),
+                    before=before.get(name)
+                )
+            except Exception:
+                # Already logged by get_new_posts; caller handles the missing entry
+                continue
+
+        return results
+
+    def _fetch_multireddit(
+        self,
+        subreddit_names: List[str],
+        since: Dict[str, Optional[datetime]],
+        before: Dict[str, Optional[str]],
+        page_size: int,
+        max_pages: int
+    ) -> Tuple[Dict[str, List[dict]], List[str]]:
+        """
+        Page through one combined listing until every subreddit reaches its cursor.
+
+        The listing is ordered newest first across all subreddits, so once a page
+        ends before a subreddit's cutoff that subreddit is complete. Subreddits
+        still short of their cutoff after ``max_pages`` are returned separately
+        without posts, so the caller can page down to their cursor individually
+        instead of advancing it past posts that were never fetched.
+
+        Args:
+            subreddit_names: Names in this combined request (all with cutoffs)
+            since: Per-subreddit cutoff timestamps
+            before: Per-subreddit cursor fullnames
+            page_size: Listing page size
+            max_pages: Maximum listing pages to request
+
+        Returns:
+            Tuple of (subreddit name -> list of post dictionaries for the
+            subreddits that were caught up, names of those that weren't)
+        """
+        names_by_key = {name.lower(): name for name in subreddit_names}
+        posts: Dict[str, List[dict]] = {name: [] for name in subreddit_names}
+        pending = set(names_by_key)
+        multireddit = self.reddit.subreddit('+'.join(subreddit_names))
+
+        after = None
+        pages = 0
+        while pending and pages < max_pages:
+            page = self._fetch_page(multireddit, 'multireddit', page_size, after)
+            pages += 1
+            if not page:
+                pending.clear()
+                break
+
+            for submission in page:
+                key = submission.subreddit.display_name.lower()
+                if key not in pending:
+                    continue
+
+                name = names_by_key[key]
+                created_utc = datetime.utcfromtimestamp(submission.created_utc)
+                if submission.fullname == before.get(name) or created_utc < since[name]:
+                    pending.discard(key)
+                    continue
+
+                posts[name].append(self._to_post_data(submission, created_utc))
+
+            # Every pending subreddit whose cutoff is newer than this page's
+            # oldest post has been fully covered (posts from the cutoff's own
+            # second may still follow on the next page)
+            oldest = datetime.utcfromtimestamp(page[-1].created_utc)
+            pending = {key for key in pending if since[names_by_key[key]] <= oldest}
+
+            if len(page) < page_size:
+                # End of the listing: there is nothing older left to fetch
+                pending.clear()
+                break
+            after = page[-1].fullname
+
+        behind = [names_by_key[key] for key in sorted(pending)]
+        if behind:
+            logger.warning(
+                f"Combined listing stopped after {pages} pages with {len(behind)} "
+                f"subreddit(s) not caught up, fetching them individually"
+            )
+            for name in behind:
+                del posts[name]
+
+        total = sum(len(p) for p in posts.values())
+        POSTS_FETCHED.inc(total)
+        logger.info(
+            f"Fetched {total} new posts from {len(posts)} subreddits "
+            f"in {pages} combined request(s)"
+        )
+        return posts, behind
+
+    def _fetch_page(self, listing, kind: str, limit: int, after: Optional[str]) -> list:
+        """
+        Fetch one page of a /new listing within the rate limit.
+
+        Args:
+            listing: PRAW subreddit (or multireddit) to list
+            kind: Listing kind for metrics ('subreddit' or 'multireddit')
+            limit: Page size
+            after: Fullname to continue after (None for the first page)
+
+        Returns:
+            List of PRAW submissions
+        """
+        self.rate_limiter.wait_if_needed()
+        params = {'after': after} if after else None
+        start = time.perf_counter()
+        try:
+            page = list(listing.new(limit=limit, params=params))
+        except Exception:
+            REQUESTS.inc(kind=kind, outcome='error')
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            REQUEST_SECONDS.observe(duration, kind=kind)
+        REQUESTS.inc(kind=kind, outcome='ok')
+        logger.debug(
+            "Fetched %s page of %d posts in %.0fms", kind, len(page), duration * 1000,
+            extra={'stage': 'fetch', 'duration': duration}
+        )
+        return page
+
+    @staticmethod
+    def _to_post_data(submission, created_utc: datetime) -> dict:
+        """Convert a PRAW submission into a post dictionary."""
+        return {
+            'id': submission.id,
+            'title': submission.title,
+            'content': submission.selftext or '',  # Empty string for link posts
+            'author': str(submission.author) if submission.author else '[deleted]',
+            'url': f"https://www.reddit.com{submission.permalink}",
+            'created_utc': created_utc
+        }
+
     def test_connection(self) -> bool:
         """
         Test Reddit API connection.
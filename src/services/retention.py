@@ -0,0 +1,276 @@
+"""
+Retention policy enforcement for stored posts.
+
+Posts older than the configured age, or beyond the configured number of
+posts per subreddit, are compacted: the post, its translations and its
+finished outbox entries are deleted and replaced by a SeenPost record, so
+duplicate detection keeps working. Freed pages are returned to the file
+system with incremental vacuum.
+"""
+
+from datetime import datetime, timedelta
+from threading import Event, Thread
+from typing import List, Optional
+
+from sqlalchemy import delete, exists, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from models import OutboxEntry, Post, SeenPost, Subreddit, Translation
+from services.config_cache import ConfigCache
+from storage.database import get_session
+from lib.logger import get_logger
+
+logger = get_logger("retention")
+
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_MODES = {0: 'none', 1: 'full', 2: 'incremental'}
+
+
+class Compactor:
+    """
+    Periodic compaction job enforcing the retention policy.
+
+    Posts that are still being processed (pending, or with an undelivered
+    outbox entry) are never compacted.
+    """
+
+    def __init__(self, config: ConfigCache, interval: float = 3600, batch_size: int = 500):
+        """
+        Initialize compactor.
+
+        Args:
+            config: Configuration snapshot providing the retention settings
+            interval: Seconds between background compaction runs
+            batch_size: Posts compacted per transaction
+        """
+        self.config = config
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self._stopping = Event()
+        self._thread: Optional[Thread] = None
+        self._vacuum_warned = False
+
+    def start(self):
+        """Start the background compaction thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="retention", daemon=True)
+        self._thread.start()
+        logger.info(f"Retention compaction scheduled every {self.interval:.0f}s")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background compaction thread.
+
+        Args:
+            timeout: Maximum seconds to wait for a running compaction to finish its batch
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self, retention_days: Optional[int] = None, max_posts: Optional[int] = None) -> dict:
+        """
+        Compact posts outside the retention policy and reclaim the freed space.
+
+        Args:
+            retention_days: Override the configured maximum post age (days, 0 = no limit)
+            max_posts: Override the configured full posts kept per subreddit (0 = no limit)
+
+        Returns:
+            Dictionary with compacted post count and reclaimed bytes
+        """
+        user = self.config.current().user
+        if retention_days is None:
+            retention_days = user.retention_days if user else 0
+        if max_posts is None:
+            max_posts = user.retention_max_posts if user else 0
+
+        result = {'compacted': 0, 'reclaimed_bytes': 0}
+        if retention_days <= 0 and max_posts <= 0:
+            return result
+
+        age_cutoff = datetime.utcnow() - timedelta(days=retention_days) if retention_days > 0 else None
+
+        session = get_session()
+        try:
+            subreddit_ids = [row[0] for row in session.query(Subreddit.id).all()]
+            for subreddit_id in subreddit_ids:
+                if self._stopping.is_set():
+                    break
+                cutoff = self._cutoff(session, subreddit_id, age_cutoff, max_posts)
+                if cutoff is not None:
+                    result['compacted'] += self._compact_subreddit(session, subreddit_id, cutoff)
+
+            if result['compacted']:
+                result['reclaimed_bytes'] = self._reclaim_space(session)
+        finally:
+            session.close()
+
+        if result['compacted']:
+            logger.info(
+                f"Compacted {result['compacted']} posts, "
+                f"reclaimed {result['reclaimed_bytes'] / 1024 / 1024:.1f} MiB"
+            )
+        return result
+
+    def _run(self):
+        """Compaction loop: compact, then sleep until the next run or stop()."""
+        while not self._stopping.is_set():
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"Retention compaction failed: {e}")
+            self._stopping.wait(self.interval)
+
+    @staticmethod
+    def _cutoff(
+        session: Session,
+        subreddit_id: int,
+        age_cutoff: Optional[datetime],
+        max_posts: int
+    ) -> Optional[datetime]:
+        """
+        Get the creation time before which a subreddit's posts are compacted.
+
+        Args:
+            session: Database session
+            subreddit_id: Subreddit primary key
+            age_cutoff: Oldest creation time kept by the age limit (None = no limit)
+            max_posts: Full posts kept per subreddit (0 = no limit)
+
+        Returns:
+            Cutoff creation time, or None if nothing is outside the policy
+        """
+        cutoffs: List[datetime] = [age_cutoff] if age_cutoff else []
+        if max_posts > 0:
+            # Creation time of the oldest post still within the newest max_posts
+            oldest_kept = session.execute(
+                select(Post.created_utc)
+                .where(Post.subreddit_id == subreddit_id)
+                .order_by(Post.created_utc.desc())
+                .offset(max_posts - 1)
+                .limit(1)
+            ).scalar()
+            if oldest_kept is not None:
+                cutoffs.append(oldest_kept)
+        return max(cutoffs) if cutoffs else None
+
+    def _compact_subreddit(self, session: Session, subreddit_id: int, cutoff: datetime) -> int:
+        """
+        Compact a subreddit's finished posts created before the cutoff.
+
+        Args:
+            session: Database session
+            subreddit_id: Subreddit primary key
+            cutoff: Posts created before this are compacted
+
+        Returns:
+            Number of posts compacted
+        """
+        undelivered = exists().where(
+            OutboxEntry.post_id == Post.id,
+            OutboxEntry.status.in_(('pending', 'sending'))
+        )
+        query = (
+            select(Post.id, Post.subreddit_id, Post.created_utc)
+            .where(
+                Post.subreddit_id == subreddit_id,
+                Post.created_utc < cutoff,
+                Post.processed != 0,
+                ~undelivered
+            )
+            .order_by(Post.created_utc)
+            .limit(self.batch_size)
+        )
+
+        compacted = 0
+        while not self._stopping.is_set():
+            rows = session.execute(query).all()
+            if not rows:
+                break
+
+            post_ids = [row.id for row in rows]
+            try:
+                session.execute(
+                    insert(SeenPost).prefix_with('OR IGNORE'),
+                    [{'id': row.id, 'subreddit_id': row.subreddit_id, 'created_utc': row.created_utc} for row in rows]
+                )
+                session.execute(delete(Translation).where(Translation.post_id.in_(post_ids)))
+                session.execute(delete(OutboxEntry).where(OutboxEntry.post_id.in_(post_ids)))
+                session.execute(delete(Post).where(Post.id.in_(post_ids)))
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            compacted += len(rows)
+        return compacted
+
+    def _reclaim_space(self, session: Session) -> int:
+        """
+        Return free pages to the file system with incremental vacuum.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Bytes reclaimed
+        """
+        mode = session.execute(text("PRAGMA auto_vacuum")).scalar()
+        if AUTO_VACUUM_MODES.get(mode) != 'incremental':
+            if not self._vacuum_warned:
+                logger.info(
+                    "Database does not use incremental auto-vacuum, so freed pages are reused "
+                    "but the file does not shrink; run storage/migrations/add_retention.py to enable it"
+                )
+                self._vacuum_warned = True
+            return 0
+
+        page_size = session.execute(text("PRAGMA page_size")).scalar()
+        before = session.execute(text("PRAGMA freelist_count")).scalar()
+        session.commit()
+        # The sqlite3 module steps a statement without result columns only
+        # once, which frees a single page; executescript runs it to completion
+        session.connection().connection.driver_connection.executescript("PRAGMA incremental_vacuum;")
+        session.commit()
+        after = session.execute(text("PRAGMA freelist_count")).scalar()
+        return (before - after) * page_size
+
+
+def storage_stats() -> dict:
+    """
+    Report database size, row counts and retention settings.
+
+    Returns:
+        Dictionary of storage statistics
+    """
+    session = get_session()
+    try:
+        page_size = session.execute(text("PRAGMA page_size")).scalar()
+        page_count = session.execute(text("PRAGMA page_count")).scalar()
+        free_pages = session.execute(text("PRAGMA freelist_count")).scalar()
+        auto_vacuum = session.execute(text("PRAGMA auto_vacuum")).scalar()
+
+        counts = session.execute(select(
+            select(func.count(Post.id)).scalar_subquery(),
+            select(func.count(Translation.id)).scalar_subquery(),
+            select(func.count(SeenPost.id)).scalar_subquery(),
+            select(func.count(OutboxEntry.id)).scalar_subquery(),
+            select(func.min(Post.created_utc)).scalar_subquery()
+        )).one()
+
+        return {
+            'size_bytes': page_size * page_count,
+            'free_bytes': page_size * free_pages,
+            'auto_vacuum': AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+            'posts': counts[0],
+            'translations': counts[1],
+            'seen_posts': counts[2],
+            'outbox_entries': counts[3],
+            'oldest_post': counts[4].isoformat() if counts[4] else None
+        }
+    finally:
+        session.close()
@@ -0,0 +1,167 @@
+"""
+Adaptive per-subreddit polling scheduler.
+
+Gives each subreddit its own next-due time derived from its observed post
+arrival rate, so busy subreddits are polled often and quiet ones rarely.
+"""
+
+import heapq
+import time
+from calendar import timegm
+from typing import Dict, List, Optional, Tuple
+
+from models import Subreddit
+from lib.logger import get_logger
+
+logger = get_logger("scheduler")
+
+
+class PollScheduler:
+    """
+    Min-heap of subreddit due times.
+
+    The poll interval for a subreddit is the time in which about
+    ``posts_per_poll`` new posts are expected, clamped to [min_interval,
+    max_interval]. Subreddits without velocity data use the base interval.
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 300,
+        min_interval: float = 60,
+        max_interval: float = 3600,
+        posts_per_poll: float = 1.0
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            base_interval: Interval in seconds for subreddits without velocity data
+            min_interval: Shortest allowed poll interval in seconds
+            max_interval: Longest allowed poll interval in seconds
+            posts_per_poll: Expected new posts per poll the schedule aims for
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.posts_per_poll = posts_per_poll
+
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}  # subreddit_id -> current due time
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def interval_for(self, subreddit: Subreddit) -> float:
+        """
+        Compute the poll interval for a subreddit.
+
+        Args:
+            subreddit: Subreddit model instance
+
+        Returns:
+            Interval in seconds
+        """
+        if subreddit.last_checked_at is None:
+            interval = self.base_interval
+        elif not subreddit.post_velocity:
+            interval = self.max_interval
+        else:
+            interval = 3600 * self.posts_per_poll / subreddit.post_velocity
+
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def sync(self, subreddits: List[Subreddit], now: Optional[float] = None):
+        """
+        Track newly enabled subreddits and drop ones no longer enabled.
+
+        New subreddits are due one interval after their last check (or now if
+        never checked).
+
+        Args:
+            subreddits: Currently enabled subreddits
+            now: Current time (default: time.time())
+        """
+        now = time.time() if now is None else now
+        enabled_ids = {subreddit.id for subreddit in subreddits}
+
+        for subreddit_id in list(self._due):
+            if subreddit_id not in enabled_ids:
+                del self._due[subreddit_id]
+
+        for subreddit in subreddits:
+            if subreddit.id in self._due:
+                continue
+            due_at = now
+            if subreddit.last_checked_at is not None:
+                checked_ago = max(0.0, now - _to_epoch(subreddit.last_checked_at))
+                due_at = now + max(0.0, self.interval_for(subreddit) - checked_ago)
+            self._push(subreddit.id, due_at)
+
+    def reschedule(self, subreddit: Subreddit, now: Optional[float] = None) -> float:
+        """
+        Schedule the next poll for a subreddit that was just checked.
+
+        Args:
+            subreddit: Subreddit model instance (with updated velocity)
+            now: Current time (default: time.time())
+
+        Returns:
+            Next due time (epoch seconds)
+        """
+        now = time.time() if now is None else now
+        due_at = now + self.interval_for(subreddit)
+        self._push(subreddit.id, due_at)
+        return due_at
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Remove and return subreddits whose due time has passed, most overdue first.
+
+        Args:
+            now: Current time (default: time.time())
+            limit: Maximum subreddits to return (the rest stay due)
+
+        Returns:
+            List of subreddit IDs
+        """
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and (limit is None or len(due) < limit):
+            due_at, subreddit_id = self._heap[0]
+            if self._due.get(subreddit_id) != due_at:
+                heapq.heappop(self._heap)  # Stale entry
+                continue
+            if due_at > now:
+                break
+            heapq.heappop(self._heap)
+            del self._due[subreddit_id]
+            due.append(subreddit_id)
+        return due
+
+    def next_due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until the next subreddit is due.
+
+        Args:
+            now: Current time (default: time.time())
+
+        Returns:
+            Seconds (0 if overdue), or None if nothing is scheduled
+        """
+        now = time.time() if now is None else now
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - now)
+
+    def _push(self, subreddit_id: int, due_at: float):
+        """Set a subreddit's due time (older heap entries become stale)."""
+        self._due[subreddit_id] = due_at
+        heapq.heappush(self._heap, (due_at, subreddit_id))
+
+
+def _to_epoch(naive_utc) -> float:
+    """Convert a naive UTC datetime (as stored in the database) to epoch seconds."""
+    return timegm(naive_utc.timetuple()) + naive_utc.microsecond / 1e6
@@ -0,0 +1,275 @@
+"""
+Content-addressed translation cache.
+
+Caches translations by a hash of (text, source_lang, target_lang, translator
+service), so identical titles and bodies (crossposts, reposts, AutoModerator
+templates) are only translated once. Uses an in-process LRU tier in front of
+a persistent SQLite tier with size-based eviction. Lookups in the SQLite tier
+are read-only; the recency used for eviction is written back in batches.
+"""
+
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, update
+
+from models import TranslationCacheEntry
+from storage.database import get_session
+from lib.logger import get_logger
+
+logger = get_logger("translation_cache")
+
+
+def make_cache_key(
+    text: str,
+    source_lang: Optional[str],
+    target_lang: str,
+    service: str
+) -> str:
+    """
+    Build the content-addressed cache key for a translation.
+
+    Args:
+        text: Original text
+        source_lang: Source language code (None = auto-detect)
+        target_lang: Target language code
+        service: Translator service name (e.g., 'deepl', 'gemini')
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    parts = [service.lower(), (source_lang or 'auto').lower(), target_lang.lower(), text]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache (memory LRU + SQLite).
+
+    Memory hits never touch the database; database hits are promoted into
+    memory. The SQLite tier is trimmed by least-recent use once its total
+    size exceeds ``max_db_bytes``. Database hits record their use in memory;
+    it is written in one batch by flush_usage(), which runs once
+    USAGE_FLUSH_EVERY hits are pending and before each eviction check.
+    """
+
+    # How many stores between checks of the persistent tier's total size
+    EVICTION_CHECK_EVERY = 100
+
+    # Pending database hits that trigger writing their recency
+    USAGE_FLUSH_EVERY = 100
+
+    def __init__(self, memory_entries: int = 2048, max_db_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize translation cache.
+
+        Args:
+            memory_entries: Maximum entries in the in-process LRU tier
+            max_db_bytes: Maximum total size of the SQLite tier in bytes
+        """
+        self.memory_entries = memory_entries
+        self.max_db_bytes = max_db_bytes
+        self._memory: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        # Database hits not yet written: key -> (hits, last used)
+        self._usage: Dict[str, Tuple[int, datetime]] = {}
+        self.lock = Lock()
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self._stores_since_check = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached translation.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            Tuple of (translated_text, detected_source_lang), or None on a miss
+        """
+        with self.lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return cached
+
+        cached = self._get_persistent(key)
+
+        with self.lock:
+            if cached is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+            self._remember(key, cached)
+            hits, _ = self._usage.get(key, (0, None))
+            self._usage[key] = (hits + 1, datetime.utcnow())
+            flush_usage = len(self._usage) >= self.USAGE_FLUSH_EVERY
+
+        if flush_usage:
+            self.flush_usage()
+        return cached
+
+    def put(self, key: str, translated_text: str, source_lang: str):
+        """
+        Store a translation in both tiers.
+
+        Args:
+            key: Cache key from make_cache_key()
+            translated_text: Translated text
+            source_lang: Detected source language
+        """
+        self.put_many([(key, translated_text, source_lang)])
+
+    def put_many(self, entries: List[Tuple[str, str, str]]):
+        """
+        Store translations in both tiers, writing the SQLite tier in one transaction.
+
+        Args:
+            entries: (key, translated_text, source_lang) tuples, as for put()
+        """
+        if not entries:
+            return
+
+        with self.lock:
+            for key, translated_text, source_lang in entries:
+                self._remember(key, (translated_text, source_lang))
+            self._stores_since_check += len(entries)
+            check_size = self._stores_since_check >= self.EVICTION_CHECK_EVERY
+            if check_size:
+                self._stores_since_check = 0
+
+        session = get_session()
+        try:
+            now = datetime.utcnow()
+            for key, translated_text, source_lang in entries:
+                session.merge(TranslationCacheEntry(
+                    key=key,
+                    source_lang=source_lang,
+                    translated_text=translated_text,
+                    size_bytes=len(key) + len(translated_text.encode('utf-8')),
+                    created_at=now,
+                    last_used_at=now
+                ))
+            session.commit()
+
+            if check_size:
+                # Eviction goes by recency, so write the pending hits first
+                self._write_usage(session)
+                session.commit()
+                self._evict(session)
+        except Exception as e:
+            # The cache must never break translation
+            logger.warning(f"Failed to persist {len(entries)} translation cache entries: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def flush_usage(self):
+        """Write the hit counts and last-use times of pending database hits in one transaction."""
+        session = get_session()
+        try:
+            self._write_usage(session)
+            session.commit()
+        except Exception as e:
+            # Recency only steers eviction; losing some of it is harmless
+            logger.warning(f"Failed to record translation cache usage: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def stats(self) -> dict:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary with memory_hits, db_hits, misses, hit_rate, memory_entries
+        """
+        with self.lock:
+            hits = self.memory_hits + self.db_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+                'hit_rate': (hits / lookups) if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
+
+    def _remember(self, key: str, value: Tuple[str, str]):
+        """Insert into the memory tier (caller holds the lock)."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _get_persistent(self, key: str) -> Optional[Tuple[str, str]]:
+        """Look up the SQLite tier (read-only)."""
+        session = get_session()
+        try:
+            entry = session.get(TranslationCacheEntry, key)
+            if entry is None:
+                return None
+            return (entry.translated_text, entry.source_lang)
+        except Exception as e:
+            logger.warning(f"Translation cache lookup failed: {e}")
+            return None
+        finally:
+            session.close()
+
+    def _write_usage(self, session):
+        """Queue the pending database hits as one batched UPDATE in the session's transaction."""
+        with self.lock:
+            usage, self._usage = self._usage, {}
+        if not usage:
+            return
+
+        entries = TranslationCacheEntry.__table__
+        statement = (
+            update(entries)
+            .where(entries.c.key == bindparam('entry_key'))
+            .values(hit_count=entries.c.hit_count + bindparam('hits'), last_used_at=bindparam('used_at'))
+        )
+        session.connection().execute(
+            statement,
+            [{'entry_key': key, 'hits': hits, 'used_at': used_at} for key, (hits, used_at) in usage.items()]
+        )
+        logger.debug("Recorded usage of %d translation cache entries", len(usage))
+
+    def _evict(self, session):
+        """Trim the SQLite tier to 90% of max_db_bytes, least recently used first."""
+        total = session.query(func.coalesce(func.sum(TranslationCacheEntry.size_bytes), 0)).scalar()
+        if total <= self.max_db_bytes:
+            return
+
+        target = int(self.max_db_bytes * 0.9)
+        removed = 0
+        while total > target:
+            oldest = (
+                session.query(TranslationCacheEntry.key, TranslationCacheEntry.size_bytes)
+                .order_by(TranslationCacheEntry.last_used_at.asc())
+                .limit(200)
+                .all()
+            )
+            if not oldest:
+                break
+
+            keys = []
+            for key, size in oldest:
+                if total <= target:
+                    break
+                keys.append(key)
+                total -= size
+
+            session.query(TranslationCacheEntry).filter(
+                TranslationCacheEntry.key.in_(keys)
+            ).delete(synchronize_session=False)
+            session.commit()
+            removed += len(keys)
+
+        logger.info(f"Evicted {removed} translation cache entries (size now ~{total} bytes)")
@@ -6,7 +6,7 @@ Handles translation of post titles and content with caching support.
 
 import os
 import deepl
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from lib.logger import get_logger
 from services.base_translator import BaseTranslator
 
@@ -20,6 +20,21 @@ class Translator(BaseTranslator):
     Provides translation with language detection and caching support.
     """
 
+    service_name = 'deepl'
+
+    # Truncate very long text to avoid quota issues (DeepL free tier: 500k chars/month)
+    MAX_TEXT_LENGTH = 10000
+
+    # DeepL request limits: texts per request and total request size
+    MAX_BATCH_TEXTS = 50
+    MAX_BATCH_BYTES = 120 * 1024  # Below the 128 KiB request limit
+
+    # Source languages DeepL accepts on all API versions
+    SOURCE_LANGUAGES = frozenset({
+        'ar', 'bg', 'cs', 'da', 'de', 'el', 'en', 'es', 'et', 'fi', 'fr', 'hu', 'id', 'it', 'ja',
+        'ko', 'lt', 'lv', 'nb', 'nl', 'pl', 'pt', 'ro', 'ru', 'sk', 'sl', 'sv', 'tr', 'uk', 'zh'
+    })
+
     def __init__(self):
         """Initialize DeepL translator with API key from environment."""
         api_key = os.environ.get('DEEPL_API_KEY')
@@ -33,7 +48,7 @@ class Translator(BaseTranslator):
         self.translator = deepl.Translator(api_key)
         logger.info("DeepL translator initialized")
 
-    def translate(
+    def _translate(
         self,
         text: str,
         target_lang: str,
@@ -57,24 +72,20 @@ class Translator(BaseTranslator):
             return "", "unknown"
 
         try:
-            # Truncate very long text to avoid quota issues
-            # DeepL free tier: 500k chars/month
-            max_length = 10000
-            if len(text) > max_length:
-                logger.warning(f"Text truncated from {len(text)} to {max_length} chars")
-                text = text[:max_length] + "..."
+            text = self._truncate(text)
 
             # Translate
-            result = self.translator.translate_text(
-                text,
-                target_lang=target_lang.upper(),
-                source_lang=source_lang.upper() if source_lang else None
-            )
+            with self._request(len(text)):
+                result = self.translator.translate_text(
+                    text,
+                    target_lang=target_lang.upper(),
+                    source_lang=source_lang.upper() if source_lang else None
+                )
 
             translated_text = result.text
             detected_lang = result.detected_source_lang.lower()
 
-            logger.debug(f"Translated {len(text)} chars ({detected_lang} → {target_lang})")
+            logger.debug("Translated %d chars (%s → %s)", len(text), detected_lang, target_lang)
 
             return translated_text, detected_lang
 
@@ -82,11 +93,81 @@ class Translator(BaseTranslator):
             logger.error(f"Translation failed: {e}")
             raise
 
+    def _translate_batch(
+        self,
+        texts: List[str],
+        target_lang: str,
+        source_lang: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Translate many texts with as few DeepL requests as possible.
+
+        Texts are packed into requests of at most MAX_BATCH_TEXTS texts and
+        MAX_BATCH_BYTES bytes.
+
+        Args:
+            texts: Non-empty texts to translate
+            target_lang: Target language code
+            source_lang: Source language code (optional)
+
+        Returns:
+            List of (translated_text, detected_source_lang), aligned to texts
+        """
+        texts = [self._truncate(text) for text in texts]
+        results = []
+        requests_made = 0
+
+        for chunk in self._pack(texts):
+            requests_made += 1
+            try:
+                with self._request(sum(len(text) for text in chunk)):
+                    translated = self.translator.translate_text(
+                        chunk,
+                        target_lang=target_lang.upper(),
+                        source_lang=source_lang.upper() if source_lang else None
+                    )
+            except Exception as e:
+                logger.error(f"Batch translation failed: {e}")
+                raise
+
+            results.extend(
+                (result.text, result.detected_source_lang.lower()) for result in translated
+            )
+
+        logger.debug(
+            f"Translated {len(texts)} texts ({sum(len(t) for t in texts)} chars) "
+            f"in {requests_made} request(s)"
+        )
+        return results
+
+    def _pack(self, texts: List[str]):
+        """Yield consecutive chunks of texts within DeepL's per-request limits."""
+        chunk = []
+        chunk_bytes = 0
+        for text in texts:
+            size = len(text.encode('utf-8'))
+            if chunk and (len(chunk) >= self.MAX_BATCH_TEXTS or chunk_bytes + size > self.MAX_BATCH_BYTES):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(text)
+            chunk_bytes += size
+        if chunk:
+            yield chunk
+
+    def _truncate(self, text: str) -> str:
+        """Truncate text to MAX_TEXT_LENGTH characters."""
+        if len(text) > self.MAX_TEXT_LENGTH:
+            logger.warning(f"Text truncated from {len(text)} to {self.MAX_TEXT_LENGTH} chars")
+            return text[:self.MAX_TEXT_LENGTH] + "..."
+        return text
+
     def translate_post(
         self,
         title: str,
         content: Optional[str],
-        target_lang: str
+        target_lang: str,
+        source_lang: Optional[str] = None
     ) -> Tuple[str, Optional[str], str]:
         """
         Translate post title and content.
@@ -95,12 +176,13 @@ class Translator(BaseTranslator):
             title: Post title
             content: Post content (may be None or empty)
             target_lang: Target language code
+            source_lang: Source language code (optional, auto-detected if not provided)
 
         Returns:
             Tuple of (translated_title, translated_content, detected_source_lang)
         """
         # Translate title
-        translated_title, source_lang = self.translate(title, target_lang)
+        translated_title, source_lang = self.translate(title, target_lang, source_lang)
 
         # Translate content if present
         translated_content = None
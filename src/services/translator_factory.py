@@ -7,6 +7,7 @@ Provides a unified interface for creating translators based on configuration.
 from typing import Optional
 from lib.logger import get_logger
 from services.base_translator import BaseTranslator
+from services.translation_cache import TranslationCache
 
 logger = get_logger("translator_factory")
 
@@ -21,6 +22,7 @@ class TranslatorFactory:
     @staticmethod
     def create_translator(
         service_type: str,
+        cache: Optional[TranslationCache] = None,
         **kwargs
     ) -> BaseTranslator:
         """
@@ -28,6 +30,7 @@ class TranslatorFactory:
 
         Args:
             service_type: Type of translator ('deepl' or 'gemini')
+            cache: Translation cache to attach (optional)
             **kwargs: Additional arguments passed to translator constructor
 
         Returns:
@@ -42,13 +45,16 @@ class TranslatorFactory:
         if service_type == 'deepl':
             from services.translator import Translator
             logger.info("Creating DeepL translator")
-            return Translator()
+            translator = Translator()
 
         elif service_type == 'gemini':
             from services.gemini_translator import GeminiTranslator
             model_name = kwargs.get('model_name', 'gemini-2.5-flash-lite')
             logger.info(f"Creating Gemini translator with model: {model_name}")
-            return GeminiTranslator(model_name=model_name)
+            translator = GeminiTranslator(
+                model_name=model_name,
+                structured_output=kwargs.get('structured_output', True)
+            )
 
         else:
             raise ValueError(
@@ -56,6 +62,9 @@ class TranslatorFactory:
                 f"Supported services: 'deepl', 'gemini'"
             )
 
+        translator.cache = cache
+        return translator
+
     @staticmethod
     def get_available_services() -> list:
         """
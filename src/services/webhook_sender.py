@@ -2,27 +2,258 @@
 Webhook sender service for Discord and Slack.
 
 Handles formatting and delivery of webhook notifications with retry logic.
+Deliveries reuse pooled keep-alive connections per destination host.
 """
 
+import re
 import requests
 import time
-from typing import Optional
+from threading import Lock
+from typing import Dict, Iterable, List, Mapping, Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from lib.logger import get_logger
+from lib.metrics import counter, histogram
 
 logger = get_logger("webhook_sender")
 
+REQUESTS = counter('webhook_requests_total', 'Webhook requests by response status', ('platform', 'status'))
+REQUEST_SECONDS = histogram('webhook_request_seconds', 'Webhook request latency', ('platform',))
+CONNECT_SECONDS = histogram(
+    'webhook_connect_seconds', 'Setup time (TCP and TLS) of new webhook connections',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+
+class DeliveryTimings:
+    """
+    Thread-safe counters for connection setup and request latency.
+
+    Connection setup covers TCP connect plus TLS handshake of each new pooled
+    connection; request latency covers the whole POST including any setup.
+    """
+
+    def __init__(self):
+        """Initialize timing counters."""
+        self.lock = Lock()
+        self.connections = 0
+        self.connect_seconds = 0.0
+        self.requests = 0
+        self.request_seconds = 0.0
+        self.max_request_seconds = 0.0
+
+    def record_connect(self, host: str, seconds: float):
+        """Record a newly established connection."""
+        with self.lock:
+            self.connections += 1
+            self.connect_seconds += seconds
+        CONNECT_SECONDS.observe(seconds)
+        logger.debug("Opened connection to %s in %.0fms", host, seconds * 1000)
+
+    def record_request(self, seconds: float):
+        """Record a completed webhook request."""
+        with self.lock:
+            self.requests += 1
+            self.request_seconds += seconds
+            self.max_request_seconds = max(self.max_request_seconds, seconds)
+
+    def stats(self) -> dict:
+        """
+        Get timing statistics.
+
+        Returns:
+            Dictionary with connections, requests, avg_connect_ms, avg_request_ms,
+            max_request_ms and connect_share (fraction of request time spent on
+            connection setup)
+        """
+        with self.lock:
+            return {
+                'connections': self.connections,
+                'requests': self.requests,
+                'avg_connect_ms': (self.connect_seconds / self.connections * 1000) if self.connections else 0.0,
+                'avg_request_ms': (self.request_seconds / self.requests * 1000) if self.requests else 0.0,
+                'max_request_ms': self.max_request_seconds * 1000,
+                'connect_share': (self.connect_seconds / self.request_seconds) if self.request_seconds else 0.0
+            }
+
+
+class SendResult:
+    """Outcome of a single webhook request."""
+
+    def __init__(
+        self,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        body: str = '',
+        error: Optional[str] = None
+    ):
+        """
+        Initialize send result.
+
+        Args:
+            status_code: HTTP status code (None if the request failed)
+            headers: Response headers
+            body: Response body text
+            error: Error description for failed requests
+        """
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the webhook accepted the message."""
+        return self.status_code in (200, 204)
+
+    @property
+    def rate_limited(self) -> bool:
+        """Whether the request was rejected by a rate limit."""
+        return self.status_code == 429
+
+    def describe(self) -> str:
+        """Short description of a failed result for logs and error messages."""
+        if self.error:
+            return self.error
+        return f"HTTP {self.status_code} - {self.body[:200]}"
+
+
+class _TimedConnectionMixin:
+    """Reports how long each new connection takes to establish."""
+
+    timings: Optional[DeliveryTimings] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        if self.timings is not None:
+            self.timings.record_connect(self.host, time.perf_counter() - start)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools record connection setup time."""
+
+    def __init__(self, timings: DeliveryTimings, **kwargs):
+        # Set before super().__init__(), which builds the pool manager
+        self.timings = timings
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {'timings': self.timings}
+        http_conn = type('TimedHTTPConnection', (_TimedConnectionMixin, HTTPConnection), attrs)
+        https_conn = type('TimedHTTPSConnection', (_TimedConnectionMixin, HTTPSConnection), attrs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {'ConnectionCls': http_conn}),
+            'https': type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {'ConnectionCls': https_conn}),
+        }
+
 
 class WebhookSender:
     """
     Webhook notification sender for Discord and Slack.
 
     Formats messages according to platform specifications and handles delivery.
+    Each destination host gets its own keep-alive session, so repeated
+    deliveries skip the TCP and TLS handshake.
     """
 
-    def __init__(self):
-        """Initialize webhook sender."""
+    # Connections kept open per destination host (one per concurrent sender)
+    POOL_MAXSIZE = 10
+
+    # Seconds to wait for a connection or response
+    REQUEST_TIMEOUT = 10
+
+    # Limits for packing several posts into one message
+    DISCORD_MAX_EMBEDS = 10
+    DISCORD_MAX_EMBED_CHARS = 6000  # Total across all embeds in a message
+    SLACK_MAX_BLOCKS = 50
+    SLACK_MAX_TEXT_CHARS = 30000
+
+    def __init__(self, pool_maxsize: Optional[int] = None):
+        """
+        Initialize webhook sender.
+
+        Args:
+            pool_maxsize: Connections kept open per destination host
+                          (default: POOL_MAXSIZE)
+        """
+        self.pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+        self.timings = DeliveryTimings()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = Lock()
         logger.info("Webhook sender initialized")
 
+    def _get_session(self, url: str) -> requests.Session:
+        """
+        Get the pooled session for a URL's host, creating it on first use.
+
+        Args:
+            url: Destination URL
+
+        Returns:
+            requests.Session with keep-alive connection pooling
+        """
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._sessions_lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                # Retries are handled by _send_webhook
+                adapter = _PooledAdapter(
+                    self.timings,
+                    pool_connections=1,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=0
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[origin] = session
+                logger.debug(f"Created pooled session for {origin}")
+            return session
+
+    def warm_up(self, webhook_urls: Iterable[str]):
+        """
+        Open a connection to each destination host ahead of the first delivery.
+
+        Failures are logged and ignored; the connection is opened again on send.
+
+        Args:
+            webhook_urls: Webhook URLs that will receive deliveries
+        """
+        origins = {}
+        for url in webhook_urls:
+            parts = urlsplit(url)
+            origins.setdefault(f"{parts.scheme}://{parts.netloc}", url)
+
+        for origin, url in origins.items():
+            start = time.perf_counter()
+            try:
+                # Any response leaves an open connection in the pool
+                self._get_session(url).head(origin + '/', timeout=self.REQUEST_TIMEOUT)
+                logger.info(f"Warmed up connection to {origin} in {(time.perf_counter() - start) * 1000:.0f}ms")
+            except Exception as e:
+                logger.warning(f"Could not warm up connection to {origin}: {e}")
+
+    def get_timing_stats(self) -> dict:
+        """
+        Get connection setup and request timing statistics.
+
+        Returns:
+            Dictionary from DeliveryTimings.stats()
+        """
+        return self.timings.stats()
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
     def send_discord(
         self,
         webhook_url: str,
@@ -46,10 +277,26 @@ class WebhookSender:
         Returns:
             True if sent successfully, False otherwise
         """
+        payload = self.build_discord_payload(title, content, url, author)
+        return self._send_webhook(webhook_url, payload, "Discord", max_retries)
+
+    def build_discord_payload(self, title: str, content: str, url: str, author: str) -> dict:
+        """
+        Build a Discord webhook payload for a post.
+
+        Args:
+            title: Post title (translated)
+            content: Post content (translated, may be empty)
+            url: Original Reddit post URL
+            author: Post author username
+
+        Returns:
+            JSON payload
+        """
         # Truncate content to Discord's limit (2048 chars in embed description)
         content_preview = content[:2000] + "..." if len(content) > 2000 else content
 
-        payload = {
+        return {
             "content": f"**New post in r/{self._extract_subreddit(url)}**",
             "embeds": [{
                 "title": title[:256],  # Discord title limit
@@ -62,8 +309,6 @@ class WebhookSender:
             }]
         }
 
-        return self._send_webhook(webhook_url, payload, "Discord", max_retries)
-
     def send_slack(
         self,
         webhook_url: str,
@@ -87,10 +332,26 @@ class WebhookSender:
         Returns:
             True if sent successfully, False otherwise
         """
+        payload = self.build_slack_payload(title, content, url, author)
+        return self._send_webhook(webhook_url, payload, "Slack", max_retries)
+
+    def build_slack_payload(self, title: str, content: str, url: str, author: str) -> dict:
+        """
+        Build a Slack webhook payload for a post.
+
+        Args:
+            title: Post title (translated)
+            content: Post content (translated, may be empty)
+            url: Original Reddit post URL
+            author: Post author username
+
+        Returns:
+            JSON payload
+        """
         # Truncate content to reasonable length for Slack
         content_preview = content[:3000] + "..." if len(content) > 3000 else content
 
-        payload = {
+        return {
             "text": f"*New post in r/{self._extract_subreddit(url)}*",
             "blocks": [
                 {
@@ -103,7 +364,149 @@ class WebhookSender:
             ]
         }
 
-        return self._send_webhook(webhook_url, payload, "Slack", max_retries)
+    def build_payload(self, webhook_type: str, title: str, content: str, url: str, author: str) -> dict:
+        """
+        Build the webhook payload for a post on the given platform.
+
+        Args:
+            webhook_type: 'discord' or 'slack'
+            title: Post title (translated)
+            content: Post content (translated, may be empty)
+            url: Original Reddit post URL
+            author: Post author username
+
+        Returns:
+            JSON payload
+
+        Raises:
+            ValueError: If the webhook type is unknown
+        """
+        if webhook_type == 'discord':
+            return self.build_discord_payload(title, content, url, author)
+        if webhook_type == 'slack':
+            return self.build_slack_payload(title, content, url, author)
+        raise ValueError(f"Unknown webhook type: {webhook_type}")
+
+    def can_merge(self, webhook_type: str, payloads: List[dict]) -> bool:
+        """
+        Check whether single-post payloads fit together in one message.
+
+        Args:
+            webhook_type: 'discord' or 'slack'
+            payloads: Payloads from build_payload()
+
+        Returns:
+            True if the merged message stays within the platform's limits
+        """
+        if webhook_type == 'discord':
+            embeds = [embed for payload in payloads for embed in payload.get('embeds', [])]
+            chars = sum(
+                len(embed.get('title', '')) + len(embed.get('description', ''))
+                + len(embed.get('footer', {}).get('text', ''))
+                for embed in embeds
+            )
+            return len(embeds) <= self.DISCORD_MAX_EMBEDS and chars <= self.DISCORD_MAX_EMBED_CHARS
+
+        if webhook_type == 'slack':
+            # Posts are separated by a divider block
+            blocks = sum(len(payload.get('blocks', [])) for payload in payloads) + len(payloads) - 1
+            chars = sum(
+                len(block.get('text', {}).get('text', ''))
+                for payload in payloads for block in payload.get('blocks', [])
+            )
+            return blocks <= self.SLACK_MAX_BLOCKS and chars <= self.SLACK_MAX_TEXT_CHARS
+
+        return len(payloads) == 1
+
+    def merge_payloads(self, webhook_type: str, payloads: List[dict]) -> dict:
+        """
+        Pack several single-post payloads into one message.
+
+        Args:
+            webhook_type: 'discord' or 'slack'
+            payloads: Payloads from build_payload() that pass can_merge()
+
+        Returns:
+            JSON payload carrying all posts
+        """
+        if len(payloads) == 1:
+            return payloads[0]
+
+        if webhook_type == 'discord':
+            embeds = [embed for payload in payloads for embed in payload['embeds']]
+            subreddits = self._subreddit_list(embed.get('url', '') for embed in embeds)
+            return {
+                "content": f"**{len(embeds)} new posts in {subreddits}**"[:2000],
+                "embeds": embeds
+            }
+
+        blocks = []
+        urls = []
+        for payload in payloads:
+            if blocks:
+                blocks.append({"type": "divider"})
+            blocks.extend(payload['blocks'])
+            urls.extend(re.findall(r'<(https?://[^|>]+)\|', payload['blocks'][0]['text']['text']))
+        return {
+            "text": f"*{len(payloads)} new posts in {self._subreddit_list(urls)}*",
+            "blocks": blocks
+        }
+
+    def _subreddit_list(self, urls: Iterable[str]) -> str:
+        """Format the distinct subreddits of post URLs, e.g. 'r/python, r/rust'."""
+        names = []
+        for url in urls:
+            name = self._extract_subreddit(url)
+            if name not in names:
+                names.append(name)
+        return ', '.join(f"r/{name}" for name in names)
+
+    def send_once(self, url: str, payload: dict, platform: str) -> SendResult:
+        """
+        Make a single delivery attempt without retrying or sleeping.
+
+        Used by the delivery scheduler, which handles pacing and retries.
+
+        Args:
+            url: Webhook URL
+            payload: JSON payload
+            platform: Platform name (for logging)
+
+        Returns:
+            SendResult with the status code and response headers
+        """
+        start = time.perf_counter()
+        try:
+            response = self._get_session(url).post(
+                url,
+                json=payload,
+                timeout=self.REQUEST_TIMEOUT
+            )
+        except requests.exceptions.Timeout:
+            logger.error(f"{platform} webhook timeout")
+            REQUESTS.inc(platform=platform.lower(), status='timeout')
+            return SendResult(error="Request timed out")
+        except Exception as e:
+            logger.error(f"{platform} webhook error: {e}")
+            REQUESTS.inc(platform=platform.lower(), status='error')
+            return SendResult(error=str(e))
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.record_request(elapsed)
+            REQUEST_SECONDS.observe(elapsed, platform=platform.lower())
+
+        REQUESTS.inc(platform=platform.lower(), status=str(response.status_code))
+
+        result = SendResult(
+            response.status_code,
+            response.headers,
+            '' if response.status_code in (200, 204) else response.text
+        )
+        if result.ok:
+            logger.info(f"✓ {platform} webhook delivered successfully")
+        elif not result.rate_limited:
+            logger.warning(f"{platform} webhook failed: {result.describe()}")
+        return result
 
     def _send_webhook(
         self,
@@ -128,11 +531,13 @@ class WebhookSender:
             try:
                 logger.debug(f"Sending {platform} webhook (attempt {attempt + 1}/{max_retries})")
 
-                response = requests.post(
+                start = time.perf_counter()
+                response = self._get_session(url).post(
                     url,
                     json=payload,
-                    timeout=10
+                    timeout=self.REQUEST_TIMEOUT
                 )
+                self.timings.record_request(time.perf_counter() - start)
 
                 if response.status_code in (200, 204):
                     logger.info(f"✓ {platform} webhook delivered successfully")
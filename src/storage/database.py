@@ -5,16 +5,67 @@ Provides engine creation, session management, and database initialization.
 """
 
 import os
-from sqlalchemy import create_engine
+import time
+import zlib
+from threading import Lock
+from sqlalchemy import create_engine, event, insert, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from models import Base
 from lib.logger import get_logger
+from lib.metrics import counter, gauge, histogram
 
 logger = get_logger("database")
 
+FLUSH_SECONDS = histogram('db_flush_seconds', 'Duration of write buffer transactions')
+ROWS_WRITTEN = counter('db_rows_written_total', 'Rows written by the write buffer', ('table',))
+ROWS_DROPPED = counter('db_rows_dropped_total', 'Buffered rows dropped because they could not be written', ('table',))
+PENDING_ROWS = gauge('write_buffer_pending', 'Rows waiting in the write buffer')
+
+# Pragmas applied to every connection by the tuned storage profile. WAL lets
+# the CLI read while the daemon writes; NORMAL sync is crash-safe in WAL mode
+# (a power loss may only drop the last transactions). Incremental auto-vacuum
+# lets retention compaction return freed pages to the file system; it only
+# takes effect on new databases (existing ones need the add_retention migration),
+# so it is only set while the file is still empty.
+TUNED_PRAGMAS = [
+    ('auto_vacuum', 'INCREMENTAL'),
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 256 * 1024 * 1024),  # 256 MiB memory-mapped I/O
+    ('cache_size', -64000),  # 64 MB page cache (negative = KiB)
+    ('temp_store', 'MEMORY'),
+]
+
+# Connection pool: DEFAULT_POOL_SIZE connections are kept open and up to
+# POOL_OVERFLOW more are opened under load. reserve_connections() grows the
+# pool for the configured worker concurrency, keeping BACKGROUND_CONNECTIONS
+# for the monitor's other threads (main thread, outbox worker, retention
+# compactor, delivery scheduler and its send workers).
+DEFAULT_POOL_SIZE = 10
+POOL_OVERFLOW = 10
+BACKGROUND_CONNECTIONS = 8
+
+
+def schema_version() -> int:
+    """
+    Fingerprint of the schema defined by the models.
+
+    Stored in PRAGMA user_version once the tables are created, so later
+    startups can skip create_all while the models are unchanged.
+
+    Returns:
+        Positive 31-bit checksum of the table, column and index names
+    """
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        columns = ','.join(column.name for column in table.columns)
+        indexes = ','.join(sorted(index.name or '' for index in table.indexes))
+        parts.append(f"{table.name}({columns})[{indexes}]")
+    return zlib.crc32(';'.join(parts).encode()) & 0x7FFFFFFF
+
 
 class Database:
     """
@@ -23,12 +74,14 @@ class Database:
     Handles SQLite database initialization and provides session management.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, tuned: Optional[bool] = None):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file (default: data/reddit-deliver.db)
+            tuned: Apply the tuned storage profile (TUNED_PRAGMAS). Default: on,
+                   unless REDDIT_DELIVER_DB_PROFILE is set to 'default'
         """
         if db_path is None:
             db_path = os.environ.get('REDDIT_DELIVER_DB', 'data/reddit-deliver.db')
@@ -36,7 +89,12 @@ class Database:
         # Ensure data directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
+        if tuned is None:
+            tuned = os.environ.get('REDDIT_DELIVER_DB_PROFILE', 'tuned').lower() != 'default'
+
         self.db_path = db_path
+        self.tuned = tuned
+        self.pool_size = DEFAULT_POOL_SIZE
         self.engine = None
         self.Session = None
 
@@ -44,24 +102,65 @@ class Database:
         """
         Create database engine and initialize schema.
 
-        Creates all tables if they don't exist.
+        Creates all tables if they don't exist. Skipped when the database's
+        user_version already matches schema_version().
         """
         logger.info(f"Initializing database at {self.db_path}")
 
-        # Create engine with SQLite
-        self.engine = create_engine(
+        self.engine = self._create_engine()
+
+        # Create session factory
+        self.Session = sessionmaker(bind=self.engine)
+
+        # Create all tables, unless they were created by the current models
+        version = schema_version()
+        with self.engine.connect() as connection:
+            if connection.exec_driver_sql("PRAGMA user_version").scalar() == version:
+                logger.debug("Database schema is current (version %d)", version)
+                return
+            Base.metadata.create_all(connection)
+            connection.exec_driver_sql(f"PRAGMA user_version = {version}")
+            connection.commit()
+        logger.info(f"Database schema initialized ({'tuned' if self.tuned else 'default'} profile)")
+
+    def _create_engine(self):
+        """Create the SQLite engine with a pool of pool_size connections."""
+        # Each session checks out its own pooled connection so concurrent
+        # monitor workers don't share a transaction.
+        engine = create_engine(
             f'sqlite:///{self.db_path}',
-            connect_args={'check_same_thread': False},  # Allow multi-threading
-            poolclass=StaticPool,  # Use static pool for SQLite
+            connect_args={
+                'check_same_thread': False,  # Allow multi-threading
+                'timeout': 30,  # Wait for competing writers instead of failing
+            },
+            pool_size=self.pool_size,
+            max_overflow=POOL_OVERFLOW,
             echo=False  # Set to True for SQL query logging
         )
 
-        # Create session factory
-        self.Session = sessionmaker(bind=self.engine)
+        if self.tuned:
+            event.listen(engine, 'connect', _apply_pragmas)
+        return engine
+
+    def ensure_pool_size(self, connections: int):
+        """
+        Grow the connection pool to keep at least this many connections.
 
-        # Create all tables
-        Base.metadata.create_all(self.engine)
-        logger.info("Database schema initialized")
+        An initialized engine is replaced by one with the larger pool; sessions
+        opened before keep their connection until they are closed.
+
+        Args:
+            connections: Number of pooled connections
+        """
+        if connections <= self.pool_size:
+            return
+        logger.info(f"Growing database connection pool from {self.pool_size} to {connections}")
+        self.pool_size = connections
+        if self.engine is not None:
+            previous = self.engine
+            self.engine = self._create_engine()
+            self.Session.configure(bind=self.engine)
+            previous.dispose()
 
     def get_session(self) -> Session:
         """
@@ -81,6 +180,314 @@ class Database:
             logger.info("Database connection closed")
 
 
+def _apply_pragmas(dbapi_connection, connection_record):
+    """Apply TUNED_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in TUNED_PRAGMAS:
+            # Setting auto_vacuum takes a write lock, which would stall every
+            # connection opened while another one is writing
+            if name == 'auto_vacuum' and cursor.execute("PRAGMA page_count").fetchone()[0]:
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+class WriteBuffer:
+    """
+    Accumulates row inserts and primary-key updates and writes them in one
+    transaction with bulk statements.
+
+    Pending writes are flushed once max_rows are queued, once the oldest one
+    is older than max_age seconds (checked as rows are added), or by an
+    explicit flush(). Tables are written parents first, and flushes never
+    overlap, so an update queued after an insert is never committed before it.
+
+    A failed flush keeps its rows for the next one. Once the rows have failed
+    max_failures times in a row, the batch is written in halves until the
+    rows that can't be written are isolated; those are dropped with an error
+    log so they no longer hold back everything queued after them.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = 500,
+        max_age: float = 5.0,
+        on_flush: Optional[Callable[[], None]] = None,
+        max_failures: int = 3
+    ):
+        """
+        Initialize write buffer.
+
+        Args:
+            max_rows: Pending rows that trigger a flush
+            max_age: Seconds a row may wait before triggering a flush
+            on_flush: Called after each successful flush that wrote rows
+            max_failures: Failed flushes before the failing rows are isolated and dropped
+        """
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.on_flush = on_flush
+        self.max_failures = max(1, max_failures)
+
+        self._inserts: Dict[type, List[dict]] = {}
+        self._ignore_conflicts = set()
+        self._updates: Dict[type, Dict[object, dict]] = {}
+        self._pending = 0
+        self._oldest: Optional[float] = None
+        self._lock = Lock()
+        self._flush_lock = Lock()
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.failures = 0
+        PENDING_ROWS.set_function(self.pending)
+
+    def insert(self, model, rows: List[dict], ignore_conflicts: bool = False):
+        """
+        Queue rows for insertion.
+
+        Args:
+            model: Mapped model class
+            rows: Column values per row (every row of a model needs the same keys)
+            ignore_conflicts: Skip rows violating a unique constraint (INSERT OR IGNORE)
+        """
+        with self._lock:
+            self._inserts.setdefault(model, []).extend(rows)
+            if ignore_conflicts:
+                self._ignore_conflicts.add(model)
+            self._queued(len(rows))
+        self._flush_if_due()
+
+    def update(self, model, values: dict):
+        """
+        Queue an update of one row by primary key.
+
+        Later updates of the same row are merged into the pending one.
+
+        Args:
+            model: Mapped model class
+            values: New column values, including the 'id' primary key
+        """
+        with self._lock:
+            pending = self._updates.setdefault(model, {})
+            if values['id'] in pending:
+                pending[values['id']].update(values)
+            else:
+                pending[values['id']] = dict(values)
+                self._queued(1)
+        self._flush_if_due()
+
+    def pending(self) -> int:
+        """
+        Get the number of queued rows.
+
+        Returns:
+            Rows waiting for the next flush
+        """
+        with self._lock:
+            return self._pending
+
+    def flush(self) -> int:
+        """
+        Write all queued rows in one transaction.
+
+        On failure the rows are put back in the queue for the next flush; the
+        flush that fails for the max_failures-th time in a row writes them in
+        smaller transactions instead and drops the rows that still fail.
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            Exception: The write failed; the rows are kept for the next flush
+        """
+        with self._flush_lock:
+            with self._lock:
+                inserts, self._inserts = self._inserts, {}
+                ignore_conflicts, self._ignore_conflicts = self._ignore_conflicts, set()
+                updates, self._updates = self._updates, {}
+                count, self._pending = self._pending, 0
+                self._oldest = None
+            if not count:
+                return 0
+
+            start = time.perf_counter()
+            dropped: Dict[type, int] = {}
+            isolate = self.failures >= self.max_failures
+            if not isolate:
+                try:
+                    self._write(inserts, ignore_conflicts, updates)
+                except Exception as e:
+                    self.failures += 1
+                    if self.failures < self.max_failures:
+                        logger.error(
+                            f"Failed to write {count} buffered rows (attempt {self.failures} of "
+                            f"{self.max_failures}), keeping them for the next flush: {e}"
+                        )
+                        self._requeue(inserts, ignore_conflicts, updates)
+                        raise
+                    logger.error(
+                        f"Failed to write {count} buffered rows {self.failures} times, "
+                        f"writing them in smaller transactions to isolate the failing rows: {e}"
+                    )
+                    isolate = True
+            if isolate:
+                dropped = self._write_isolated(inserts, ignore_conflicts, updates)
+            self.failures = 0
+
+            FLUSH_SECONDS.observe(time.perf_counter() - start)
+            for model in set(inserts) | set(updates):
+                ROWS_WRITTEN.inc(
+                    len(inserts.get(model, ())) + len(updates.get(model, ())) - dropped.get(model, 0),
+                    table=model.__tablename__
+                )
+            self.flushes += 1
+            self.rows_written += count - sum(dropped.values())
+            self.rows_dropped += sum(dropped.values())
+
+        logger.debug("Flushed %d buffered rows", count)
+        if self.on_flush:
+            self.on_flush()
+        return count - sum(dropped.values())
+
+    def stats(self) -> dict:
+        """
+        Get write statistics.
+
+        Returns:
+            Dictionary with flushes, rows_written, rows_dropped and pending
+        """
+        return {
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'rows_dropped': self.rows_dropped,
+            'pending': self.pending()
+        }
+
+    def _queued(self, count: int):
+        """Account for newly queued rows (caller holds the lock)."""
+        if count and self._oldest is None:
+            self._oldest = time.monotonic()
+        self._pending += count
+
+    def _flush_if_due(self):
+        """Flush when the size or age bound is reached."""
+        with self._lock:
+            due = self._pending >= self.max_rows or (
+                self._oldest is not None and time.monotonic() - self._oldest >= self.max_age
+            )
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                # Logged by flush() and retried by the next one; a write that
+                # keeps failing even row by row is raised to the caller
+                if self.failures >= self.max_failures:
+                    raise
+
+    def _write(self, inserts: dict, ignore_conflicts: set, updates: dict):
+        """Write inserts and updates in one transaction."""
+        session = get_session()
+        try:
+            for model in _dependency_order(set(inserts) | set(updates)):
+                if inserts.get(model):
+                    statement = insert(model)
+                    if model in ignore_conflicts:
+                        statement = statement.prefix_with('OR IGNORE')
+                    session.execute(statement, inserts[model])
+                if updates.get(model):
+                    session.execute(update(model), list(updates[model].values()))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _write_isolated(self, inserts: dict, ignore_conflicts: set, updates: dict) -> Dict[type, int]:
+        """
+        Write a failing batch in halves, dropping the rows that fail on their own.
+
+        Errors of the database itself (locked, I/O, schema) are not caused by
+        particular rows: they stop the split, the rows not written yet are
+        requeued and the error is raised.
+
+        Returns:
+            Number of dropped rows per model
+        """
+        # Stack of (model, is_insert, rows), next chunk last
+        chunks: List[Tuple[type, bool, List[dict]]] = []
+        for model in _dependency_order(set(inserts) | set(updates)):
+            if inserts.get(model):
+                chunks.append((model, True, inserts[model]))
+            if updates.get(model):
+                chunks.append((model, False, list(updates[model].values())))
+        chunks.reverse()
+
+        dropped: Dict[type, int] = {}
+        while chunks:
+            model, is_insert, rows = chunks.pop()
+            try:
+                if is_insert:
+                    self._write({model: rows}, ignore_conflicts, {})
+                else:
+                    self._write({}, set(), {model: {row['id']: row for row in rows}})
+            except OperationalError as e:
+                chunks.append((model, is_insert, rows))
+                remaining_inserts: Dict[type, List[dict]] = {}
+                remaining_updates: Dict[type, Dict[object, dict]] = {}
+                for chunk_model, chunk_is_insert, chunk_rows in reversed(chunks):
+                    if chunk_is_insert:
+                        remaining_inserts.setdefault(chunk_model, []).extend(chunk_rows)
+                    else:
+                        remaining_updates.setdefault(chunk_model, {}).update(
+                            (row['id'], row) for row in chunk_rows
+                        )
+                logger.error(f"Database error while isolating failing rows, keeping the rest for the next flush: {e}")
+                self._requeue(remaining_inserts, ignore_conflicts, remaining_updates)
+                raise
+            except Exception as e:
+                if len(rows) > 1:
+                    middle = len(rows) // 2
+                    chunks.append((model, is_insert, rows[middle:]))
+                    chunks.append((model, is_insert, rows[:middle]))
+                    continue
+                dropped[model] = dropped.get(model, 0) + 1
+                ROWS_DROPPED.inc(table=model.__tablename__)
+                logger.error(
+                    f"Dropping {model.__tablename__} {'insert' if is_insert else 'update'} "
+                    f"that cannot be written ({e}): {rows[0]}"
+                )
+        return dropped
+
+    def _requeue(self, inserts: dict, ignore_conflicts: set, updates: dict):
+        """Put the rows of a failed flush back ahead of rows queued since."""
+        with self._lock:
+            for model, rows in self._inserts.items():
+                inserts.setdefault(model, []).extend(rows)
+            for model, pending in self._updates.items():
+                merged = updates.setdefault(model, {})
+                for key, values in pending.items():
+                    merged.setdefault(key, {}).update(values)
+            self._inserts = inserts
+            self._ignore_conflicts |= ignore_conflicts
+            self._updates = updates
+            self._pending = (
+                sum(len(rows) for rows in inserts.values()) + sum(len(rows) for rows in updates.values())
+            )
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+
+def _dependency_order(models) -> list:
+    """Sort model classes so that tables come after the tables they reference."""
+    order = {table: index for index, table in enumerate(Base.metadata.sorted_tables)}
+    return sorted(models, key=lambda model: order[model.__table__])
+
+
 # Global database instance
 _db_instance: Optional[Database] = None
 
@@ -110,3 +517,14 @@ def get_session() -> Session:
         SQLAlchemy session
     """
     return get_database().get_session()
+
+
+def reserve_connections(workers: int):
+    """
+    Size the global database's connection pool for concurrent workers.
+
+    Args:
+        workers: Threads that may hold a session at the same time, besides
+                 the monitor's background threads
+    """
+    get_database().ensure_pool_size(workers + BACKGROUND_CONNECTIONS)
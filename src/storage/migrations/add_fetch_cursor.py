@@ -0,0 +1,77 @@
+"""
+Migration to add fetch cursor columns to subreddits table.
+
+This migration adds the newest-seen post cursor and observed post velocity
+used for incremental fetching.
+"""
+
+import os
+import sys
+import sqlite3
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from lib.logger import setup_logger
+
+logger = setup_logger("migration")
+
+COLUMNS = [
+    ('last_seen_fullname', 'VARCHAR(20)'),
+    ('last_seen_created_utc', 'DATETIME'),
+    ('post_velocity', 'FLOAT NOT NULL DEFAULT 0.0'),
+]
+
+
+def run_migration(db_path: str = "data/reddit-deliver.db"):
+    """
+    Add fetch cursor columns to subreddits table.
+
+    Args:
+        db_path: Path to database file
+    """
+    logger.info("Starting migration: add fetch cursor columns...")
+
+    if not os.path.exists(db_path):
+        logger.error(f"Database not found: {db_path}")
+        logger.error("Please run init_schema.py first")
+        sys.exit(1)
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("PRAGMA table_info(subreddits)")
+        existing = {row[1] for row in cursor.fetchall()}
+
+        for name, definition in COLUMNS:
+            if name in existing:
+                logger.info(f"Column '{name}' already exists, skipping")
+                continue
+
+            logger.info(f"Adding column '{name}' to subreddits table...")
+            cursor.execute(f"ALTER TABLE subreddits ADD COLUMN {name} {definition}")
+
+        conn.commit()
+        logger.info("✓ Migration completed successfully")
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add fetch cursor columns migration")
+    parser.add_argument(
+        '--db',
+        default='data/reddit-deliver.db',
+        help='Path to database file (default: data/reddit-deliver.db)'
+    )
+    args = parser.parse_args()
+
+    run_migration(args.db)
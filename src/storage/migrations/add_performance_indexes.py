@@ -0,0 +1,85 @@
+"""
+Migration to apply the tuned storage profile to an existing database.
+
+This migration switches the database to WAL journaling and adds the indexes
+used by per-subreddit and processing-status lookups on posts. Lookups of
+translations by post_id already use the index behind the (post_id,
+target_lang) unique constraint.
+"""
+
+import os
+import sys
+import sqlite3
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from lib.logger import setup_logger
+
+logger = setup_logger("migration")
+
+INDEXES = [
+    ('ix_posts_subreddit_created', 'posts', 'subreddit_id, created_utc'),
+    ('ix_posts_processed', 'posts', 'processed'),
+]
+
+
+def run_migration(db_path: str = "data/reddit-deliver.db"):
+    """
+    Enable WAL mode and create hot-path indexes.
+
+    Args:
+        db_path: Path to database file
+    """
+    logger.info("Starting migration: tuned storage profile...")
+
+    if not os.path.exists(db_path):
+        logger.error(f"Database not found: {db_path}")
+        logger.error("Please run init_schema.py first")
+        sys.exit(1)
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        # Persistent setting: stored in the database file
+        cursor.execute("PRAGMA journal_mode=WAL")
+        logger.info(f"Journal mode: {cursor.fetchone()[0]}")
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for name, table, columns in INDEXES:
+            if name in existing:
+                logger.info(f"Index '{name}' already exists, skipping")
+                continue
+
+            logger.info(f"Creating index '{name}' on {table}({columns})...")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+        # Refresh planner statistics for the new indexes
+        cursor.execute("ANALYZE")
+
+        conn.commit()
+        logger.info("✓ Migration completed successfully")
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tuned storage profile migration")
+    parser.add_argument(
+        '--db',
+        default='data/reddit-deliver.db',
+        help='Path to database file (default: data/reddit-deliver.db)'
+    )
+    args = parser.parse_args()
+
+    run_migration(args.db)
@@ -0,0 +1,90 @@
+"""
+Migration to add post retention settings.
+
+This migration adds the retention columns to user_config and switches the
+database to incremental auto-vacuum, so space freed by retention compaction
+can be returned to the file system. The seen_posts table is created by the
+application on startup.
+"""
+
+import os
+import sys
+import sqlite3
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from lib.logger import setup_logger
+
+logger = setup_logger("migration")
+
+COLUMNS = [
+    ('retention_days', 'INTEGER NOT NULL DEFAULT 0'),
+    ('retention_max_posts', 'INTEGER NOT NULL DEFAULT 0'),
+]
+
+INCREMENTAL_VACUUM = 2  # PRAGMA auto_vacuum value
+
+
+def run_migration(db_path: str = "data/reddit-deliver.db"):
+    """
+    Add retention columns and enable incremental auto-vacuum.
+
+    Args:
+        db_path: Path to database file
+    """
+    logger.info("Starting migration: post retention...")
+
+    if not os.path.exists(db_path):
+        logger.error(f"Database not found: {db_path}")
+        logger.error("Please run init_schema.py first")
+        sys.exit(1)
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("PRAGMA table_info(user_config)")
+        existing = {row[1] for row in cursor.fetchall()}
+
+        for name, definition in COLUMNS:
+            if name in existing:
+                logger.info(f"Column '{name}' already exists, skipping")
+                continue
+
+            logger.info(f"Adding column '{name}' to user_config table...")
+            cursor.execute(f"ALTER TABLE user_config ADD COLUMN {name} {definition}")
+
+        conn.commit()
+
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] == INCREMENTAL_VACUUM:
+            logger.info("Incremental auto-vacuum already enabled, skipping")
+        else:
+            # The new mode only takes effect after rebuilding the file
+            logger.info("Enabling incremental auto-vacuum (rebuilding database, this may take a while)...")
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute("VACUUM")
+
+        logger.info("✓ Migration completed successfully")
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Post retention migration")
+    parser.add_argument(
+        '--db',
+        default='data/reddit-deliver.db',
+        help='Path to database file (default: data/reddit-deliver.db)'
+    )
+    args = parser.parse_args()
+
+    run_migration(args.db)
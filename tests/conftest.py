@@ -0,0 +1,18 @@
+"""
+Shared fixtures for the reddit-deliver tests.
+"""
+
+import pytest
+
+import storage.database
+from storage.database import Database
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Fresh SQLite database installed as the global database instance."""
+    db = Database(str(tmp_path / 'reddit-deliver.db'))
+    db.initialize()
+    monkeypatch.setattr(storage.database, '_db_instance', db)
+    yield db
+    db.close()
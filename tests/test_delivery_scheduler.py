@@ -0,0 +1,49 @@
+"""
+Tests for delivery scheduler outcomes, including sends that raise.
+"""
+
+from services.delivery_scheduler import DeliveryJob, DeliveryScheduler
+from services.webhook_sender import SendResult
+
+
+class FakeSender:
+    """Stands in for WebhookSender; send_once returns the queued results in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    def merge_payloads(self, platform, payloads):
+        return payloads[0]
+
+    def can_merge(self, platform, payloads):
+        return True
+
+    def send_once(self, webhook_url, payload, platform):
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _job(outcomes, url='https://discord.test/hook'):
+    return DeliveryJob(url, 'discord', {}, on_complete=lambda ok, error: outcomes.append((ok, error)))
+
+
+def test_delivered_job_reports_success():
+    scheduler = DeliveryScheduler(FakeSender(SendResult(204)))
+    outcomes = []
+
+    assert scheduler.submit(_job(outcomes)) is True
+    assert outcomes == [(True, None)]
+    assert scheduler.flush(timeout=1)
+
+
+def test_send_that_raises_fails_the_job_and_releases_it():
+    scheduler = DeliveryScheduler(FakeSender(ConnectionError('connection reset')))
+    outcomes = []
+
+    assert scheduler.submit(_job(outcomes)) is False
+    assert outcomes == [(False, 'connection reset')]
+    # Nothing is left in flight for flush() to wait on
+    assert scheduler.flush(timeout=1)
+    assert scheduler.stats()['failed'] == 1
@@ -0,0 +1,136 @@
+"""
+Tests for outbox recovery at startup and delivery outcome bookkeeping.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import OutboxEntry, Post, Subreddit, Translation, WebhookConfig
+from services.config_cache import ConfigCache
+from services.outbox import DeliveryOutbox
+from storage.database import get_session
+
+
+@pytest.fixture
+def session(database):
+    session = get_session()
+    session.add(Subreddit(name='python', url='https://reddit.com/r/python'))
+    session.add(WebhookConfig(type='discord', webhook_url='https://discord.test/hook'))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def outbox(session):
+    return DeliveryOutbox(
+        delivery=None, config=ConfigCache(), max_attempts=3,
+        base_backoff=30, max_backoff=45, recover_failed_days=7
+    )
+
+
+def _post(session, post_id: str, age: timedelta, translated: bool = True, processed: int = 0) -> Post:
+    post = Post(
+        id=post_id, subreddit_id=1, title=f"Post {post_id}", author='someone',
+        url=f"https://reddit.com/{post_id}", created_utc=datetime.utcnow() - age, processed=processed
+    )
+    session.add(post)
+    if translated:
+        session.add(Translation(
+            post_id=post_id, source_lang='en', target_lang='ko', translated_title=f"Translated {post_id}"
+        ))
+    session.commit()
+    return post
+
+
+def _entry(session, post_id: str, status: str = 'pending', age: timedelta = timedelta()) -> OutboxEntry:
+    entry = OutboxEntry(post_id=post_id, webhook_id=1, status=status, created_at=datetime.utcnow() - age)
+    session.add(entry)
+    session.commit()
+    return entry
+
+
+def _statuses(session):
+    session.expire_all()
+    return {
+        entry.post_id: (entry.status, entry.attempts)
+        for entry in session.query(OutboxEntry).order_by(OutboxEntry.id).all()
+    }
+
+
+def test_recover_resumes_recent_deliveries_only(session, outbox):
+    for post_id in ('sending', 'recent_failed', 'old_failed', 'delivered'):
+        _post(session, post_id, timedelta(hours=1))
+    _entry(session, 'sending', status='sending')
+    _entry(session, 'recent_failed', status='failed', age=timedelta(days=2)).attempts = 3
+    _entry(session, 'old_failed', status='failed', age=timedelta(days=30))
+    _entry(session, 'delivered', status='delivered')
+    session.commit()
+
+    # Translated but never queued; only the recent undelivered one is picked up
+    _post(session, 'orphan', timedelta(days=1))
+    _post(session, 'old_orphan', timedelta(days=30))
+    _post(session, 'done_orphan', timedelta(days=1), processed=1)
+    _post(session, 'untranslated', timedelta(days=1), translated=False)
+
+    assert outbox.recover() == {'interrupted': 1, 'revived': 1, 'enqueued': 1}
+    assert _statuses(session) == {
+        'sending': ('pending', 0),
+        'recent_failed': ('pending', 0),
+        'old_failed': ('failed', 0),
+        'delivered': ('delivered', 0),
+        'orphan': ('pending', 0),
+    }
+
+
+def test_recover_without_webhooks_enqueues_nothing(session, outbox):
+    session.query(WebhookConfig).update({'enabled': 0})
+    session.commit()
+    _post(session, 'orphan', timedelta(hours=1))
+
+    assert outbox.recover()['enqueued'] == 0
+    assert _statuses(session) == {}
+
+
+def test_failed_delivery_backs_off_then_gives_up(session, outbox):
+    _post(session, 'p1', timedelta(hours=1))
+    entry_id = _entry(session, 'p1').id
+
+    delays = []
+    for _ in range(outbox.max_attempts - 1):
+        before = datetime.utcnow()
+        outbox._on_complete(entry_id, False, 'HTTP 500')
+        session.expire_all()
+        entry = session.get(OutboxEntry, entry_id)
+        assert entry.status == 'pending'
+        delays.append(round((entry.next_attempt_at - before).total_seconds()))
+    # 30s doubling, capped at max_backoff
+    assert delays == [30, 45]
+
+    outbox._on_complete(entry_id, False, 'HTTP 500')
+    session.expire_all()
+    entry = session.get(OutboxEntry, entry_id)
+    assert (entry.status, entry.attempts) == ('failed', 3)
+    assert entry.last_error == 'discord delivery failed: HTTP 500'
+    assert (entry.post.processed, entry.post.retry_count) == (-1, 3)
+
+
+def test_post_is_processed_once_every_destination_delivered(session, outbox):
+    session.add(WebhookConfig(type='slack', webhook_url='https://slack.test/hook'))
+    _post(session, 'p1', timedelta(hours=1))
+    discord = _entry(session, 'p1')
+    slack = OutboxEntry(post_id='p1', webhook_id=2, status='sending')
+    session.add(slack)
+    session.commit()
+
+    outbox._on_complete(discord.id, True)
+    session.expire_all()
+    assert session.get(OutboxEntry, discord.id).status == 'delivered'
+    assert session.get(Post, 'p1').processed == 0
+
+    outbox._on_complete(slack.id, True)
+    session.expire_all()
+    post = session.get(Post, 'p1')
+    assert post.processed == 1
+    assert post.processed_at is not None
@@ -0,0 +1,154 @@
+"""
+Tests for cursor paging of subreddit and combined (multireddit) listings.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from services.reddit_client import RedditClient
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def _submission(subreddit: str, post_id: str, seconds: int):
+    """Fake PRAW submission created ``seconds`` after EPOCH."""
+    return SimpleNamespace(
+        id=post_id,
+        fullname=f"t3_{post_id}",
+        title=f"Post {post_id}",
+        selftext='',
+        author='someone',
+        permalink=f"/r/{subreddit}/comments/{post_id}/",
+        created_utc=(EPOCH + timedelta(seconds=seconds) - datetime(1970, 1, 1)).total_seconds(),
+        subreddit=SimpleNamespace(display_name=subreddit)
+    )
+
+
+class FakeListing:
+    """/new listing over submissions (newest first) that pages like Reddit."""
+
+    def __init__(self, submissions, requests):
+        self.submissions = submissions
+        self.requests = requests
+
+    def new(self, limit, params=None):
+        self.requests.append(limit)
+        start = 0
+        if params and params.get('after'):
+            start = next(i for i, s in enumerate(self.submissions) if s.fullname == params['after']) + 1
+        return iter(self.submissions[start:start + limit])
+
+
+class FakeReddit:
+    """Stands in for praw.Reddit; subreddit('a+b') lists the union of a and b."""
+
+    def __init__(self, submissions):
+        self.submissions = sorted(submissions, key=lambda s: s.created_utc, reverse=True)
+        self.requests = {}
+
+    def subreddit(self, names):
+        wanted = {name.lower() for name in names.split('+')}
+        listed = [s for s in self.submissions if s.subreddit.display_name.lower() in wanted]
+        return FakeListing(listed, self.requests.setdefault(names, []))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('REDDIT_CLIENT_ID', 'test')
+    monkeypatch.setenv('REDDIT_CLIENT_SECRET', 'test')
+    client = RedditClient()
+    client.rate_limiter.wait_if_needed = lambda: None
+
+    def install(submissions):
+        client._local.reddit = FakeReddit(submissions)
+        return client._local.reddit
+    client.install = install
+    return client
+
+
+def _cursor(submission):
+    return submission.fullname, datetime.utcfromtimestamp(submission.created_utc)
+
+
+def test_multireddit_splits_posts_per_subreddit_down_to_cursors(client):
+    python = [_submission('python', f"p{i}", 100 - i * 10) for i in range(5)]
+    rust = [_submission('rust', f"r{i}", 95 - i * 10) for i in range(5)]
+    client.install(python + rust)
+    before = {'python': python[2].fullname, 'rust': rust[1].fullname}
+    since = {'python': _cursor(python[2])[1], 'rust': _cursor(rust[1])[1]}
+
+    posts, behind = client._fetch_multireddit(['python', 'rust'], since, before, page_size=4, max_pages=5)
+
+    assert behind == []
+    assert [post['id'] for post in posts['python']] == ['p0', 'p1']
+    assert [post['id'] for post in posts['rust']] == ['r0']
+
+
+def test_multireddit_returns_subreddits_short_of_their_cursor(client):
+    # 'busy' has 12 new posts; 'quiet' has one that is older than all of them
+    busy = [_submission('busy', f"b{i}", 1000 - i) for i in range(13)]
+    quiet = [_submission('quiet', 'q0', 500), _submission('quiet', 'q1', 400)]
+    client.install(busy + quiet)
+    before = {'busy': busy[12].fullname, 'quiet': quiet[1].fullname}
+    since = {'busy': _cursor(busy[12])[1], 'quiet': _cursor(quiet[1])[1]}
+
+    posts, behind = client._fetch_multireddit(['busy', 'quiet'], since, before, page_size=4, max_pages=2)
+
+    # Only 8 posts were listed: neither cursor was reached, so neither
+    # subreddit returns partial posts that would advance its cursor
+    assert sorted(behind) == ['busy', 'quiet']
+    assert posts == {}
+
+
+def test_multireddit_end_of_listing_completes_pending_subreddits(client):
+    python = [_submission('python', 'p0', 100), _submission('python', 'p1', 90)]
+    client.install(python)
+    # The cursor post was deleted, so the listing ends before reaching it
+    since = {'python': EPOCH}
+    before = {'python': 't3_deleted'}
+
+    posts, behind = client._fetch_multireddit(['python'], since, before, page_size=4, max_pages=5)
+
+    assert behind == []
+    assert [post['id'] for post in posts['python']] == ['p0', 'p1']
+
+
+def test_batch_fetches_subreddits_behind_individually(client):
+    busy = [_submission('busy', f"b{i}", 1000 - i) for i in range(13)]
+    quiet = [_submission('quiet', 'q0', 500), _submission('quiet', 'q1', 400)]
+    reddit = client.install(busy + quiet)
+    before = {'busy': busy[12].fullname, 'quiet': quiet[1].fullname}
+    since = {'busy': _cursor(busy[12])[1], 'quiet': _cursor(quiet[1])[1]}
+
+    results = client.get_new_posts_batch(
+        ['busy', 'quiet'], since=since, before=before,
+        page_sizes={'busy': 2, 'quiet': 2}, max_pages=2
+    )
+
+    assert [post['id'] for post in results['busy']] == [f"b{i}" for i in range(12)]
+    assert [post['id'] for post in results['quiet']] == ['q0']
+    assert reddit.requests['busy+quiet'] == [4, 4]
+    assert 'busy' in reddit.requests and 'quiet' in reddit.requests
+
+
+def test_posts_sharing_the_cursor_second_are_not_dropped(client):
+    # 'p2' is the cursor; 'p1' was created in the same second but not seen yet
+    python = [
+        _submission('python', 'p0', 120),
+        _submission('python', 'p1', 100),
+        _submission('python', 'p2', 100),
+        _submission('python', 'p3', 90),
+    ]
+    client.install(python)
+    fullname, since = _cursor(python[2])
+
+    posts = client.get_new_posts('python', limit=2, since=since, before=fullname)
+    assert [post['id'] for post in posts] == ['p0', 'p1']
+
+    combined, behind = client._fetch_multireddit(
+        ['python'], {'python': since}, {'python': fullname}, page_size=2, max_pages=5
+    )
+    assert behind == []
+    assert [post['id'] for post in combined['python']] == ['p0', 'p1']
@@ -0,0 +1,63 @@
+"""
+Tests for storing batches of translations in the translation cache.
+"""
+
+from sqlalchemy import event
+
+from models import TranslationCacheEntry
+from services.base_translator import BaseTranslator
+from services.translation_cache import TranslationCache
+from storage.database import get_session
+
+
+class FakeTranslator(BaseTranslator):
+    """Uppercases texts and counts the texts sent to the service."""
+
+    service_name = 'fake'
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.sent = []
+
+    def _translate(self, text, target_lang, source_lang=None):
+        self.sent.append(text)
+        return text.upper(), 'en'
+
+    def translate_post(self, title, content, target_lang, source_lang=None):
+        raise NotImplementedError
+
+    def check_supported_language(self, lang_code):
+        return True
+
+
+def _commits(database):
+    commits = []
+    event.listen(database.engine, 'commit', lambda connection: commits.append(connection))
+    return commits
+
+
+def test_batch_misses_are_stored_in_one_transaction(database):
+    translator = FakeTranslator(TranslationCache())
+    commits = _commits(database)
+
+    texts = [f"text {index}" for index in range(50)]
+    results = translator.translate_batch(texts + ['text 0'], 'ko')
+
+    assert results == [(text.upper(), 'en') for text in texts + ['text 0']]
+    assert len(commits) == 1
+    session = get_session()
+    try:
+        assert session.query(TranslationCacheEntry).count() == 50
+    finally:
+        session.close()
+
+
+def test_stored_batch_is_served_from_the_cache(database):
+    translator = FakeTranslator(TranslationCache())
+    translator.translate_batch(['hello', 'world'], 'ko')
+
+    # A fresh memory tier has to read the entries back from SQLite
+    translator.cache = TranslationCache()
+    translator.sent.clear()
+    assert translator.translate_batch(['hello', 'world'], 'ko') == [('HELLO', 'en'), ('WORLD', 'en')]
+    assert translator.sent == []
@@ -0,0 +1,106 @@
+"""
+Tests for WriteBuffer flushing, requeueing and failing-row isolation.
+"""
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from models import Subreddit
+from storage.database import WriteBuffer, get_session
+
+
+def _subreddit(name: str, url: str = 'https://reddit.com/r/x') -> dict:
+    return {'name': name, 'url': url, 'enabled': 1, 'post_velocity': 0.0}
+
+
+def _rows(model):
+    session = get_session()
+    try:
+        return session.query(model).order_by(model.id).all()
+    finally:
+        session.close()
+
+
+def _locked(*args, **kwargs):
+    raise OperationalError('INSERT', {}, Exception('database is locked'))
+
+
+def test_flush_writes_inserts_and_merged_updates(database):
+    buffer = WriteBuffer(max_rows=100)
+    buffer.insert(Subreddit, [_subreddit('python'), _subreddit('rust')])
+    assert buffer.flush() == 2
+
+    buffer.update(Subreddit, {'id': 1, 'enabled': 0})
+    buffer.update(Subreddit, {'id': 1, 'post_velocity': 2.5})
+    assert buffer.pending() == 1
+    assert buffer.flush() == 1
+
+    python, rust = _rows(Subreddit)
+    assert (python.enabled, python.post_velocity) == (0, 2.5)
+    assert (rust.enabled, rust.post_velocity) == (1, 0.0)
+    assert buffer.stats() == {'flushes': 2, 'rows_written': 3, 'rows_dropped': 0, 'pending': 0}
+
+
+def test_failed_flush_keeps_rows_ahead_of_newer_ones(database, monkeypatch):
+    buffer = WriteBuffer(max_rows=100)
+    buffer.insert(Subreddit, [_subreddit('python')])
+    write = buffer._write
+    monkeypatch.setattr(buffer, '_write', _locked)
+
+    with pytest.raises(OperationalError):
+        buffer.flush()
+    assert buffer.pending() == 1
+    assert buffer.failures == 1
+
+    buffer.insert(Subreddit, [_subreddit('rust')])
+    monkeypatch.setattr(buffer, '_write', write)
+    assert buffer.flush() == 2
+    assert buffer.failures == 0
+    assert [row.name for row in _rows(Subreddit)] == ['python', 'rust']
+
+
+def test_row_that_always_fails_is_dropped_after_max_failures(database):
+    buffer = WriteBuffer(max_rows=100, max_failures=3)
+    rows = [_subreddit(f"sub{index}") for index in range(7)]
+    rows[4]['url'] = None  # NOT NULL violation
+    buffer.insert(Subreddit, rows)
+
+    for attempt in (1, 2):
+        with pytest.raises(IntegrityError):
+            buffer.flush()
+        assert buffer.failures == attempt
+        assert buffer.pending() == 7
+
+    # The third failure isolates the bad row; everything else is written
+    assert buffer.flush() == 6
+    assert buffer.failures == 0
+    assert buffer.pending() == 0
+    assert buffer.stats()['rows_dropped'] == 1
+    assert [row.name for row in _rows(Subreddit)] == ['sub0', 'sub1', 'sub2', 'sub3', 'sub5', 'sub6']
+
+    # Later flushes are no longer held back
+    buffer.insert(Subreddit, [_subreddit('python')])
+    assert buffer.flush() == 1
+
+
+def test_database_error_while_isolating_requeues_unwritten_rows(database, monkeypatch):
+    buffer = WriteBuffer(max_rows=100, max_failures=1)
+    buffer.insert(Subreddit, [_subreddit('python'), _subreddit('rust')])
+    monkeypatch.setattr(buffer, '_write', _locked)
+
+    with pytest.raises(OperationalError):
+        buffer.flush()
+    assert buffer.pending() == 2
+    assert buffer.stats()['rows_dropped'] == 0
+
+
+def test_flush_if_due_raises_persistent_failures(database, monkeypatch):
+    buffer = WriteBuffer(max_rows=1, max_failures=3)
+    monkeypatch.setattr(buffer, '_write', _locked)
+
+    # Transient failures stay in the buffer without reaching the caller
+    buffer.insert(Subreddit, [_subreddit('a')])
+    buffer.insert(Subreddit, [_subreddit('b')])
+    with pytest.raises(OperationalError):
+        buffer.insert(Subreddit, [_subreddit('c')])
+    assert buffer.pending() == 3